@@ -1,5 +1,12 @@
 
-from .zeepClient import get_client_and_factory, retry_when_unauthorized
+import base64
+import re
+import zipfile
+import xml.sax
+from xml.sax.handler import ContentHandler, feature_namespaces
+
+from .zeepClient import get_client_and_factory, retry_when_unauthorized, post_soap_stream
+from .queryCatalog import invalidate_query_catalog
 
 relative_web_interface_url = "/cxwebinterface/Audit/CxAuditWebService.asmx?wsdl"
 
@@ -49,6 +56,106 @@ def get_source_code_for_scan(scan_id):
     }
 
 
+class _SourceCodeHandler(ContentHandler):
+    """
+    SAX handler of the GetSourceCodeForScan response, decodes the base64 ZippedFile into a file as it arrives.
+    The file is only opened when the ZippedFile starts, so that a failed response leaves it as it is.
+    """
+
+    def __init__(self, zip_file_path):
+        ContentHandler.__init__(self)
+        self.zip_file_path = zip_file_path
+        self.zip_file = None
+        self.element = None
+        self.texts = {"IsSuccesfull": [], "ErrorMessage": [], "FileName": []}
+        self.base64_remainder = b""
+
+    def close(self):
+        if self.zip_file is not None:
+            self.zip_file.close()
+
+    def startElementNS(self, name, qname, attrs):
+        self.element = name[1]
+        if self.element == "ZippedFile" and self.zip_file is None:
+            self.zip_file = open(self.zip_file_path, "wb")
+
+    def endElementNS(self, name, qname):
+        if name[1] == "ZippedFile" and self.base64_remainder:
+            self.zip_file.write(base64.b64decode(self.base64_remainder))
+            self.base64_remainder = b""
+        self.element = None
+
+    def characters(self, content):
+        if self.element == "ZippedFile":
+            data = self.base64_remainder + re.sub(r"\s", "", content).encode("ascii")
+            usable_length = len(data) // 4 * 4
+            self.zip_file.write(base64.b64decode(data[:usable_length]))
+            self.base64_remainder = data[usable_length:]
+        elif self.element in self.texts:
+            self.texts[self.element].append(content)
+
+    def get_text(self, element):
+        return "".join(self.texts[element])
+
+
+@retry_when_unauthorized
+def _stream_source_code_for_scan(scan_id, zip_file_path):
+    handler = _SourceCodeHandler(zip_file_path)
+    try:
+        with post_soap_stream(relative_web_interface_url, "GetSourceCodeForScan", sessionID="0",
+                              scanId=scan_id) as response_body:
+            parser = xml.sax.make_parser()
+            parser.setFeature(feature_namespaces, True)
+            parser.setContentHandler(handler)
+            parser.parse(response_body)
+    finally:
+        handler.close()
+
+    return {
+        "IsSuccesfull": handler.get_text("IsSuccesfull") == "true",
+        "ErrorMessage": handler.get_text("ErrorMessage") or None,
+        "FileName": handler.get_text("FileName") or None,
+    }
+
+
+def _is_selected(member_name, paths):
+    member_name = member_name.replace("\\", "/")
+    return any(member_name == path or member_name.endswith("/" + path) for path in paths)
+
+
+def download_source_code_for_scan(scan_id, zip_file_path, extract_to=None, paths=None):
+    """
+    like get_source_code_for_scan, but the response is parsed as a stream and the zip file is decoded
+    into zip_file_path piece by piece, so the memory used does not depend on the size of the source code
+
+    Args:
+        scan_id (int):
+        zip_file_path (str): where to write the zip file
+        extract_to (str, optional): a folder to extract the zip file into
+        paths (list of str, optional): extract only these files, e.g. the files of the findings of a scan,
+            a path selects every member that is equal to it or ends with "/" + path
+
+    Returns:
+        dict: {"IsSuccesfull": bool, "ErrorMessage": str, "FileName": str, "ZipFilePath": str,
+               "ExtractedFiles": list of str}
+
+    Raises:
+        ValueError: when the HTTP status of the response is not OK, zip_file_path is not touched
+    """
+    result = _stream_source_code_for_scan(scan_id, zip_file_path)
+    result["ZipFilePath"] = zip_file_path
+    result["ExtractedFiles"] = []
+    if not result.get("IsSuccesfull") or extract_to is None:
+        return result
+
+    normalized_paths = [path.replace("\\", "/").lstrip("/") for path in paths] if paths else None
+    with zipfile.ZipFile(zip_file_path) as source_zip:
+        for member in source_zip.infolist():
+            if normalized_paths is None or _is_selected(member.filename, normalized_paths):
+                result["ExtractedFiles"].append(source_zip.extract(member, path=extract_to))
+    return result
+
+
 def upload_queries(query_groups):
 
     @retry_when_unauthorized
@@ -107,6 +214,8 @@ def upload_queries(query_groups):
         return client.service.UploadQueries(sessionId="0", queries=qgs)
 
     response = execute()
+    if response.IsSuccesfull:
+        invalidate_query_catalog()
 
     return {
         "IsSuccesfull": response.IsSuccesfull,
@@ -5,12 +5,77 @@
     Start from 9.0, Portal SOAP API needs Bear Token for authentication
 """
 import base64
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from os.path import exists
 
-from .zeepClient import get_client_and_factory, retry_when_unauthorized
+from zeep.helpers import serialize_object
+
+from .zeepClient import get_client_and_factory, get_cached_client_and_factory, retry_when_unauthorized
+from ..directoryCache import directory_cache
+from .queryCatalog import get_query_catalog, invalidate_query_catalog
+from .rawXml import get_records, to_bool, to_datetime
 
 relative_web_interface_url = "/CxWebInterface/Portal/CxWebService.asmx?wsdl"
 
+# one entry of a comments history, e.g.
+# "happy yang jvl_local, [2020年11月12日 16:57]: Changed status to Not Exploitable "
+comment_pattern = re.compile(r"^\s*(?P<author>.*?), \[(?P<timestamp>[^\]]*)\]: (?P<text>.*?)\s*$", re.DOTALL)
+state_change_prefix = "Changed status to "
+
+_comments_history_cache = {}
+_comments_history_cache_lock = threading.Lock()
+
+# the records of the raw xml fast path, see rawXml
+QUERY_GROUP_SPEC = {
+    "Description": None,
+    "Impacts": ("int", int),
+    "IsEncrypted": to_bool,
+    "IsReadOnly": to_bool,
+    "Language": int,
+    "LanguageName": None,
+    "LanguageStateDate": to_datetime,
+    "LanguageStateHash": int,
+    "Name": None,
+    "OwningTeam": int,
+    "PackageFullName": None,
+    "PackageId": int,
+    "PackageType": None,
+    "PackageTypeName": None,
+    "ProjectId": int,
+    "Queries": ("CxWSQuery", {
+        "Categories": ("CxQueryCategory", {
+            "CategoryName": None,
+            "CategoryType": {"Id": int, "Name": None, "Order": int},
+            "Id": int,
+        }),
+        "Cwe": int,
+        "CxDescriptionID": int,
+        "EngineMetadata": None,
+        "IsEncrypted": to_bool,
+        "IsExecutable": to_bool,
+        "Name": None,
+        "PackageId": int,
+        "QueryId": int,
+        "QueryVersionCode": int,
+        "Severity": int,
+        "Source": None,
+        "Status": None,
+        "Type": None,
+    }),
+    "Status": None,
+}
+
+PRESET_SPEC = {
+    "PresetName": None,
+    "ID": int,
+    "owningUser": None,
+    "isUserAllowToUpdate": to_bool,
+    "isUserAllowToDelete": to_bool,
+}
+
 
 def add_license_expiration_notification():
     """
@@ -71,6 +136,8 @@ def create_new_preset(query_ids, name):
         return client.service.CreateNewPreset(sessionId="0", presrt=cx_preset_detail)
 
     response = execute()
+    if response["IsSuccesfull"]:
+        directory_cache.invalidate("presets")
     preset = response.preset
     return {
         "IsSuccesfull": response["IsSuccesfull"],
@@ -89,6 +156,119 @@ def create_new_preset(query_ids, name):
     }
 
 
+def _build_report_display_data(
+        factory, version, queries_all=True, queries_ids=None, results_severity_all=True, results_severity_high=True,
+        results_severity_medium=True, results_severity_low=True, results_severity_info=False,
+        results_state_all=True, results_state_ids=None, display_categories_all=True, display_categories_ids=None,
+        results_assigned_to_all=True, results_assigned_to_ids=None, results_assigned_to_usernames=None,
+        results_per_vulnerability_all=True, results_per_vulnerability_maximum=50,
+        header_options_link_to_online_results=True, header_options_team=True, header_options_checkmarx_version=True,
+        header_options_comments=False, header_options_scan_custom_fields=True, header_options_scan_type=True,
+        header_options_source_origin=True, header_options_density=True,
+        general_options_only_executive_summary=False, general_options_table_of_contents=True,
+        general_options_executive_summary=True, general_options_display_categories=True,
+        general_options_display_language_hash_number=True, general_options_scanned_queries=False,
+        general_options_scanned_files=False, general_options_vulnerabilities_description="Attached2Appendix",
+        results_display_option_assigned_to=False, results_display_option_comments=False,
+        results_display_option_link_to_online=True, results_display_option_result_description=True,
+        results_display_option_snippets_mode="SourceAndDestination"
+):
+    """
+    the CxWSReportDisplayData of a report, see create_scan_report for the arguments
+
+    Args:
+        factory: the type factory of the zeep client
+        version (int): see get_version_number_as_int
+
+    Returns:
+        CxWSReportDisplayData
+    """
+    query_ids = queries_ids
+    if queries_ids:
+        query_ids = factory.ArrayOfLong(queries_ids)
+    queries = factory.CxWSQueriesFilter(All=queries_all, IDs=query_ids)
+
+    results_severity = factory.CxWSResultsSeverityFilter(
+        All=results_severity_all, High=results_severity_high, Medium=results_severity_medium,
+        Low=results_severity_low, Info=results_severity_info
+    )
+
+    results_state_id_list = results_state_ids
+    if results_state_id_list:
+        results_state_id_list = factory.ArrayOfLong(results_state_id_list)
+    results_state = factory.CxWSResultsStateFilter(All=results_state_all, IDs=results_state_id_list)
+
+    display_categories_id_list = display_categories_ids
+    if display_categories_id_list:
+        display_categories_id_list = factory.ArrayOfLong(display_categories_id_list)
+    display_categories = factory.CxWSDisplayCategoriesFilter(
+        All=display_categories_all, IDs=display_categories_id_list
+    )
+
+    results_assigned_to_id_list = results_assigned_to_ids
+    if results_assigned_to_id_list:
+        results_assigned_to_id_list = factory.ArrayOfLong(results_assigned_to_id_list)
+    results_assigned_to_username_list = results_assigned_to_usernames
+    if results_assigned_to_username_list:
+        results_assigned_to_username_list = factory.ArrayOfString(results_assigned_to_username_list)
+
+    results_assigned_to = factory.CxWSResultsAssignedToFilter(
+        All=results_assigned_to_all, IDs=results_assigned_to_id_list, Usernames=results_assigned_to_username_list
+    )
+
+    results_per_vulnerability = factory.CxWSResultsPerVulnerabilityFilter(
+        All=results_per_vulnerability_all, Maximimum=results_per_vulnerability_maximum
+    )
+
+    if version < 940:
+        header_options = factory.CxWSHeaderDisplayOptions(
+            Link2OnlineResults=header_options_link_to_online_results,
+            Team=header_options_team,
+            CheckmarxVersion=header_options_checkmarx_version,
+            ScanComments=header_options_comments,
+            ScanType=header_options_scan_type,
+            SourceOrigin=header_options_source_origin,
+            ScanDensity=header_options_density
+        )
+    else:
+        header_options = factory.CxWSHeaderDisplayOptions(
+            Link2OnlineResults=header_options_link_to_online_results,
+            Team=header_options_team,
+            CheckmarxVersion=header_options_checkmarx_version,
+            ScanComments=header_options_comments,
+            ScanCustomFields=header_options_scan_custom_fields,
+            ScanType=header_options_scan_type,
+            SourceOrigin=header_options_source_origin,
+            ScanDensity=header_options_density
+        )
+
+    general_option = factory.CxWSGeneralDisplayOptions(
+        OnlyExecutiveSummary=general_options_only_executive_summary,
+        TableOfContents=general_options_table_of_contents,
+        ExecutiveSummary=general_options_executive_summary,
+        DisplayCategories=general_options_display_categories,
+        DisplayLanguageHashNumber=general_options_display_language_hash_number,
+        ScannedQueries=general_options_scanned_queries,
+        ScannedFiles=general_options_scanned_files,
+        VulnerabilitiesDescription=general_options_vulnerabilities_description
+    )
+
+    results_display_option = factory.CxWSResultDisplayOptions(
+        AssignedTo=results_display_option_assigned_to,
+        Comments=results_display_option_comments,
+        Link2Online=results_display_option_link_to_online,
+        ResultDescription=results_display_option_result_description,
+        SnippetsMode=results_display_option_snippets_mode
+    )
+
+    return factory.CxWSReportDisplayData(
+        Queries=queries, ResultsSeverity=results_severity, ResultsState=results_state,
+        DisplayCategories=display_categories, ResultsAssigedTo=results_assigned_to,
+        ResultsPerVulnerability=results_per_vulnerability, HeaderOptions=header_options,
+        GeneralOption=general_option, ResultsDisplayOption=results_display_option
+    )
+
+
 def create_scan_report(scan_id, report_type, queries_all=True, queries_ids=None, results_severity_all=True,
                        results_severity_high=True, results_severity_medium=True, results_severity_low=True,
                        results_severity_info=False, results_state_all=True, results_state_ids=None,
@@ -157,91 +337,45 @@ def create_scan_report(scan_id, report_type, queries_all=True, queries_ids=None,
     @retry_when_unauthorized
     def execute():
         client, factory = get_client_and_factory(relative_web_interface_url=relative_web_interface_url)
-        query_ids = queries_ids
-        if queries_ids:
-            query_ids = factory.ArrayOfLong(queries_ids)
-        queries = factory.CxWSQueriesFilter(All=queries_all, IDs=query_ids)
-
-        results_severity = factory.CxWSResultsSeverityFilter(
-            All=results_severity_all, High=results_severity_high, Medium=results_severity_medium,
-            Low=results_severity_low, Info=results_severity_info
-        )
-
-        results_state_id_list = results_state_ids
-        if results_state_id_list:
-            results_state_id_list = factory.ArrayOfLong(results_state_id_list)
-        results_state = factory.CxWSResultsStateFilter(All=results_state_all, IDs=results_state_id_list)
-
-        display_categories_id_list = display_categories_ids
-        if display_categories_id_list:
-            display_categories_id_list = factory.ArrayOfLong(display_categories_id_list)
-        display_categories = factory.CxWSDisplayCategoriesFilter(
-            All=display_categories_all, IDs=display_categories_id_list
-        )
-
-        results_assigned_to_id_list = results_assigned_to_ids
-        if results_assigned_to_id_list:
-            results_assigned_to_id_list = factory.ArrayOfLong(results_assigned_to_id_list)
-        results_assigned_to_username_list = results_assigned_to_usernames
-        if results_assigned_to_username_list:
-            results_assigned_to_username_list = factory.ArrayOfString(results_assigned_to_username_list)
-
-        results_assigned_to = factory.CxWSResultsAssignedToFilter(
-            All=results_assigned_to_all, IDs=results_assigned_to_id_list, Usernames=results_assigned_to_username_list
-        )
-
-        results_per_vulnerability = factory.CxWSResultsPerVulnerabilityFilter(
-            All=results_per_vulnerability_all, Maximimum=results_per_vulnerability_maximum
-        )
-
-        version = get_version_number_as_int()
-
-        if version < 940:
-            header_options = factory.CxWSHeaderDisplayOptions(
-                Link2OnlineResults=header_options_link_to_online_results,
-                Team=header_options_team,
-                CheckmarxVersion=header_options_checkmarx_version,
-                ScanComments=header_options_comments,
-                ScanType=header_options_scan_type,
-                SourceOrigin=header_options_source_origin,
-                ScanDensity=header_options_density
-            )
-        else:
-            header_options = factory.CxWSHeaderDisplayOptions(
-                Link2OnlineResults=header_options_link_to_online_results,
-                Team=header_options_team,
-                CheckmarxVersion=header_options_checkmarx_version,
-                ScanComments=header_options_comments,
-                ScanCustomFields=header_options_scan_custom_fields,
-                ScanType=header_options_scan_type,
-                SourceOrigin=header_options_source_origin,
-                ScanDensity=header_options_density
-            )
-
-        general_option = factory.CxWSGeneralDisplayOptions(
-            OnlyExecutiveSummary=general_options_only_executive_summary,
-            TableOfContents=general_options_table_of_contents,
-            ExecutiveSummary=general_options_executive_summary,
-            DisplayCategories=general_options_display_categories,
-            DisplayLanguageHashNumber=general_options_display_language_hash_number,
-            ScannedQueries=general_options_scanned_queries,
-            ScannedFiles=general_options_scanned_files,
-            VulnerabilitiesDescription=general_options_vulnerabilities_description
-        )
-
-        results_display_option = factory.CxWSResultDisplayOptions(
-            AssignedTo=results_display_option_assigned_to,
-            Comments=results_display_option_comments,
-            Link2Online=results_display_option_link_to_online,
-            ResultDescription=results_display_option_result_description,
-            SnippetsMode=results_display_option_snippets_mode
-        )
-
-        display_data = factory.CxWSReportDisplayData(
-            Queries=queries, ResultsSeverity=results_severity, ResultsState=results_state,
-            DisplayCategories=display_categories, ResultsAssigedTo=results_assigned_to,
-            ResultsPerVulnerability=results_per_vulnerability, HeaderOptions=header_options,
-            GeneralOption=general_option, ResultsDisplayOption=results_display_option
+        display_data = _build_report_display_data(
+            factory, get_version_number_as_int(),
+            queries_all=queries_all,
+            queries_ids=queries_ids,
+            results_severity_all=results_severity_all,
+            results_severity_high=results_severity_high,
+            results_severity_medium=results_severity_medium,
+            results_severity_low=results_severity_low,
+            results_severity_info=results_severity_info,
+            results_state_all=results_state_all,
+            results_state_ids=results_state_ids,
+            display_categories_all=display_categories_all,
+            display_categories_ids=display_categories_ids,
+            results_assigned_to_all=results_assigned_to_all,
+            results_assigned_to_ids=results_assigned_to_ids,
+            results_assigned_to_usernames=results_assigned_to_usernames,
+            results_per_vulnerability_all=results_per_vulnerability_all,
+            results_per_vulnerability_maximum=results_per_vulnerability_maximum,
+            header_options_link_to_online_results=header_options_link_to_online_results,
+            header_options_team=header_options_team,
+            header_options_checkmarx_version=header_options_checkmarx_version,
+            header_options_comments=header_options_comments,
+            header_options_scan_custom_fields=header_options_scan_custom_fields,
+            header_options_scan_type=header_options_scan_type,
+            header_options_source_origin=header_options_source_origin,
+            header_options_density=header_options_density,
+            general_options_only_executive_summary=general_options_only_executive_summary,
+            general_options_table_of_contents=general_options_table_of_contents,
+            general_options_executive_summary=general_options_executive_summary,
+            general_options_display_categories=general_options_display_categories,
+            general_options_display_language_hash_number=general_options_display_language_hash_number,
+            general_options_scanned_queries=general_options_scanned_queries,
+            general_options_scanned_files=general_options_scanned_files,
+            general_options_vulnerabilities_description=general_options_vulnerabilities_description,
+            results_display_option_assigned_to=results_display_option_assigned_to,
+            results_display_option_comments=results_display_option_comments,
+            results_display_option_link_to_online=results_display_option_link_to_online,
+            results_display_option_result_description=results_display_option_result_description,
+            results_display_option_snippets_mode=results_display_option_snippets_mode
         )
         filtered_report_request = factory.CxWSFilteredReportRequest(Type=report_type, ScanID=scan_id,
                                                                     DisplayData=display_data)
@@ -272,6 +406,8 @@ def delete_preset(preset_id):
         return client.service.DeletePreset(sessionId="0", id=preset_id)
 
     response = execute()
+    if response["IsSuccesfull"]:
+        directory_cache.invalidate("presets")
     return {
         "IsSuccesfull": response["IsSuccesfull"],
         "ErrorMessage": response["ErrorMessage"]
@@ -332,6 +468,141 @@ def delete_projects(project_ids, flag="None"):
     }
 
 
+def _get_undeleted_projects_as_list(undeleted_projects):
+    """
+    the UndeletedProjects of a DeleteProjects response, serialized, as a list
+    """
+    undeleted_projects = serialize_object(undeleted_projects)
+    if not undeleted_projects:
+        return []
+    if isinstance(undeleted_projects, dict):
+        # the ArrayOf... wrapper holds the list as its only element
+        values = list(undeleted_projects.values())
+        undeleted_projects = values[0] if len(values) == 1 and isinstance(values[0], list) else [undeleted_projects]
+    return list(undeleted_projects)
+
+
+def _get_undeleted_project_ids(undeleted_projects, batch, num_of_deleted_projects):
+    """
+    the ids of the undeleted projects of a DeleteProjects response, read from the ProjectID of its items
+
+    Returns:
+        set of int, or None when they can not be told apart: an item without a ProjectID of the batch,
+            or a number of undeleted projects that does not match NumOfDeletedProjects
+    """
+    undeleted_ids = set()
+    for undeleted_project in undeleted_projects:
+        project_id = undeleted_project.get("ProjectID") if isinstance(undeleted_project, dict) else None
+        if project_id not in batch:
+            return None
+        undeleted_ids.add(project_id)
+    if num_of_deleted_projects is not None and len(batch) - len(undeleted_ids) != num_of_deleted_projects:
+        return None
+    return undeleted_ids
+
+
+def delete_projects_in_batches(project_ids, batch_size=50, max_workers=4, flag="None", retry_running_scans=False,
+                               progress_callback=None):
+    """
+    delete many projects with DeleteProjects, batch_size project ids per request and max_workers requests at once.
+    The undeleted projects of all the batches are collected, and with retry_running_scans the deletion of those
+    is tried once more with the "RunningScans" flag, which also cancels their running scans.
+
+    Args:
+        project_ids (list of int):
+        batch_size (int, optional):
+        max_workers (int, optional):
+        flag (str, optional): "None", "RunningScans", "OnlyAllowedProjects"
+        retry_running_scans (bool, optional):
+        progress_callback (function, optional): called with (number of processed project ids, number of project ids)
+            after each batch, of the retry too
+
+    Returns:
+        dict: {
+            "NumOfDeletedProjects": int,
+            "UndeletedProjects": list, the serialized UndeletedProjects of the batches,
+            "FailedBatches": list of dict {"ProjectIDs": list of int, "ErrorMessage": str},
+                the batches that failed as a whole, and the batches whose undeleted projects have no ProjectID,
+                their projects are not retried and stay in the directory cache
+            "Seconds": float,
+            "ProjectsPerSecond": float, deleted projects per second
+        }
+    """
+    project_ids = list(dict.fromkeys(project_ids))
+    start_time = time.time()
+    result = {
+        "NumOfDeletedProjects": 0,
+        "UndeletedProjects": [],
+        "FailedBatches": [],
+    }
+
+    def delete_batch(batch, batch_flag):
+        @retry_when_unauthorized
+        def execute():
+            client, factory = get_cached_client_and_factory(relative_web_interface_url=relative_web_interface_url)
+            cx_ws_request_delete_projects = factory.CxWSRequestDeleteProjects(
+                SessionID="0",
+                ProjectIDs=factory.ArrayOfLong(batch),
+                Flags=factory.DeleteFlags([batch_flag])
+            )
+            return client.service.DeleteProjects(request=cx_ws_request_delete_projects)
+
+        return execute()
+
+    def run(ids, run_flag):
+        undeleted_projects = []
+        undeleted_project_ids = []
+        batches = [ids[index:index + batch_size] for index in range(0, len(ids), batch_size)]
+        processed = 0
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(delete_batch, batch, run_flag): batch for batch in batches}
+            for future in as_completed(futures):
+                batch = futures[future]
+                processed += len(batch)
+                try:
+                    response = future.result()
+                except Exception as error:
+                    result["FailedBatches"].append({"ProjectIDs": batch, "ErrorMessage": str(error)})
+                else:
+                    if response["IsSuccesfull"]:
+                        result["NumOfDeletedProjects"] += response["NumOfDeletedProjects"] or 0
+                        batch_undeleted_projects = _get_undeleted_projects_as_list(response["UndeletedProjects"])
+                        undeleted_projects.extend(batch_undeleted_projects)
+                        undeleted_ids = _get_undeleted_project_ids(batch_undeleted_projects, batch,
+                                                                   response["NumOfDeletedProjects"])
+                        if undeleted_ids is None:
+                            # which projects are deleted is unknown, keep them all in the cache and out of the retry
+                            result["FailedBatches"].append({
+                                "ProjectIDs": batch,
+                                "ErrorMessage": "the undeleted projects of the batch can not be identified",
+                            })
+                        else:
+                            undeleted_project_ids.extend(project_id for project_id in batch
+                                                         if project_id in undeleted_ids)
+                            for project_id in batch:
+                                if project_id not in undeleted_ids:
+                                    directory_cache.remove("projects", "id", project_id)
+                    else:
+                        result["FailedBatches"].append({"ProjectIDs": batch, "ErrorMessage": response["ErrorMessage"]})
+                if progress_callback:
+                    progress_callback(processed, len(ids))
+        return undeleted_projects, undeleted_project_ids
+
+    undeleted_projects, undeleted_project_ids = run(project_ids, flag)
+    if retry_running_scans and flag != "RunningScans" and undeleted_project_ids:
+        retried_ids = set(undeleted_project_ids)
+        # the undeleted projects of the retry replace the retried ones
+        undeleted_projects = [undeleted_project for undeleted_project in undeleted_projects
+                              if not isinstance(undeleted_project, dict)
+                              or undeleted_project.get("ProjectID") not in retried_ids]
+        undeleted_projects.extend(run(undeleted_project_ids, "RunningScans")[0])
+
+    result["UndeletedProjects"] = undeleted_projects
+    result["Seconds"] = time.time() - start_time
+    result["ProjectsPerSecond"] = result["NumOfDeletedProjects"] / result["Seconds"] if result["Seconds"] else 0.0
+    return result
+
+
 def export_preset(preset_id):
     """
 
@@ -458,6 +729,102 @@ def get_path_comments_history(scan_id, path_id, label_type):
     }
 
 
+def parse_comments_history(comments_history):
+    """
+    split the comments history of a path (see get_path_comments_history), whose entries end with "ÿ",
+    into records, newest first as in the history
+
+    Args:
+        comments_history (str):
+
+    Returns:
+        list of dict, e.g.
+        [
+            {
+                "author": "happy yang jvl_local",
+                "user": "happy yang",
+                "timestamp": "2020年11月12日 16:57",
+                "text": "Changed status to Not Exploitable",
+                "state_change": "Not Exploitable"
+            }
+        ]
+        author is the user name followed by the project name, user is its first two words.
+        timestamp is kept as formatted by the server, state_change is None for plain comments.
+    """
+    records = []
+    if not comments_history:
+        return records
+
+    for entry in comments_history.split(u"ÿ"):
+        match = comment_pattern.match(entry)
+        if not match:
+            continue
+        author, timestamp, text = match.group("author", "timestamp", "text")
+        records.append({
+            "author": author,
+            "user": " ".join(author.split(" ")[0:2]),
+            "timestamp": timestamp,
+            "text": text,
+            "state_change": text[len(state_change_prefix):] if text.startswith(state_change_prefix) else None,
+        })
+    return records
+
+
+def get_paths_comments_history(scan_path_ids, label_type="Remark", max_workers=8, memoize=False):
+    """
+    get and parse the comments history of many paths concurrently, reusing one SOAP client per worker thread
+
+    Args:
+        scan_path_ids (iterable of tuple): (scan_id, path_id)
+        label_type (str, optional):
+        max_workers (int, optional):
+        memoize (bool, optional): keep the results of this process by (scan_id, path_id, label_type),
+            and return kept results without a request, see clear_comments_history_cache
+
+    Returns:
+        dict: {(scan_id, path_id): {"IsSuccesfull": bool, "ErrorMessage": str, "Comments": list of dict}},
+            see parse_comments_history for the comments. A path whose request fails has IsSuccesfull False,
+            the error in ErrorMessage and no comments
+    """
+
+    def fetch(scan_path_id):
+        scan_id, path_id = scan_path_id
+        key = (scan_id, path_id, label_type)
+        if memoize:
+            with _comments_history_cache_lock:
+                if key in _comments_history_cache:
+                    return scan_path_id, _comments_history_cache[key]
+
+        @retry_when_unauthorized
+        def execute():
+            client, factory = get_cached_client_and_factory(relative_web_interface_url=relative_web_interface_url)
+            return client.service.GetPathCommentsHistory(sessionId="0", scanId=scan_id, pathId=path_id,
+                                                         labelType=label_type)
+
+        try:
+            response = execute()
+        except Exception as error:
+            return scan_path_id, {"IsSuccesfull": False, "ErrorMessage": str(error), "Comments": []}
+        result = {
+            "IsSuccesfull": response["IsSuccesfull"],
+            "ErrorMessage": response["ErrorMessage"],
+            "Comments": parse_comments_history(response.Path["Comment"] if response.Path else None),
+        }
+        if memoize and result.get("IsSuccesfull"):
+            with _comments_history_cache_lock:
+                _comments_history_cache[key] = result
+        return scan_path_id, result
+
+    distinct_scan_path_ids = list(dict.fromkeys(tuple(scan_path_id) for scan_path_id in scan_path_ids))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(executor.map(fetch, distinct_scan_path_ids))
+
+
+def clear_comments_history_cache():
+    with _comments_history_cache_lock:
+        _comments_history_cache.clear()
+
+
 def get_queries_categories():
     """
 
@@ -489,7 +856,26 @@ def get_queries_categories():
     }
 
 
-def get_query_collection():
+def get_query_collection(raw_xml=False):
+    """
+
+    Args:
+        raw_xml (bool, optional): parse the response with the raw xml fast path, see rawXml, which builds the same
+            dicts without the zeep objects in between, except that "Impacts" is a list of int
+
+    Returns:
+        dict: the "Impacts" of a query group is a zeep ArrayOfInt, with the ints in its "int",
+            or a list of int for raw_xml
+    """
+    if raw_xml:
+        result = get_records(relative_web_interface_url, "GetQueryCollection", "CxWSQueryGroup", QUERY_GROUP_SPEC,
+                             sessionId="0")
+        return {
+            "IsSuccesfull": result.get("IsSuccesfull"),
+            "ErrorMessage": result.get("ErrorMessage"),
+            "QueryGroups": result.get("Records")
+        }
+
     @retry_when_unauthorized
     def execute():
         client, factory = get_client_and_factory(relative_web_interface_url=relative_web_interface_url)
@@ -563,36 +949,20 @@ def get_query_id_by_language_group_and_query_name(
 
     Returns:
         int, list of int, None
+        the query catalog is loaded once per process and cached locally, see get_query_catalog
     """
-    query_id_list = []
-    response = get_query_collection()
-    if not response.get("IsSuccesfull"):
-        return None
-
-    query_collection = response.get("QueryGroups")
-
-    if isinstance(language, str):
-        query_collection = [item for item in query_collection if item.get("LanguageName") == language]
-    elif isinstance(language, (list, tuple)):
-        query_collection = [item for item in query_collection if item.get("LanguageName") in language]
-
     if isinstance(package_type_name, str):
         assert package_type_name in ["Cx", "Corp"]
-        query_collection = [item for item in query_collection if item.get("PackageTypeName") == package_type_name]
-    elif isinstance(package_type_name, (list, tuple)):
-        query_collection = [item for item in query_collection if item.get("PackageTypeName") in package_type_name]
-
-    if isinstance(package_name, str):
-        query_collection = [item for item in query_collection if item.get("Name") == package_name]
-    elif isinstance(package_name, (list, tuple)):
-        query_collection = [item for item in query_collection if item.get("Name") in package_name]
-
-    for item in query_collection:
-        for query in item.get("Queries"):
-            if isinstance(query_name, (str, list, tuple)) and query.get("Name") not in [query_name]:
-                continue
-            query_id = query.get("QueryId")
-            query_id_list.append(query_id)
+
+    query_catalog = get_query_catalog()
+    if query_catalog is None:
+        return None
+
+    query_id_list = [
+        query.get("QueryId") for query in query_catalog.find(
+            language=language, package_type_name=package_type_name, package_name=package_name, query_name=query_name
+        )
+    ]
 
     if len(query_id_list) == 1:
         query_id_list = query_id_list[0]
@@ -614,23 +984,28 @@ def get_name_of_user_who_marked_false_positive_from_comments_history(scan_id, pa
     """
     comments_history = get_path_comments_history(scan_id, path_id, label_type="Remark").get("Path").get("Comment")
 
-    if u"ÿ" not in comments_history:
-        return None
-
-    a_list = comments_history.split(u'ÿ')[0:-1]
-    second_list = [item.split(',')[0] for item in a_list if 'Not Exploitable' in item]
-    name_and_project = second_list[0]
-    d_list = name_and_project.split(" ")
-    e_list = d_list[0:2]
-    return " ".join(e_list)
+    for comment in parse_comments_history(comments_history):
+        if 'Not Exploitable' in comment.get("text"):
+            return comment.get("user")
+    return None
 
 
-def get_preset_list():
+def get_preset_list(raw_xml=False):
     """
 
+    Args:
+        raw_xml (bool, optional): parse the response with the raw xml fast path, see rawXml, the result is the same
+
     Returns:
-        list of dict
+        dict
     """
+    if raw_xml:
+        result = get_records(relative_web_interface_url, "GetPresetList", "Preset", PRESET_SPEC, SessionID="0")
+        return {
+            "IsSuccesfull": result.get("IsSuccesfull"),
+            "ErrorMessage": result.get("ErrorMessage"),
+            "PresetList": result.get("Records") or None
+        }
 
     @retry_when_unauthorized
     def execute():
@@ -805,6 +1180,8 @@ def import_preset(imported_file_path):
         return client.service.ImportPreset(sessionId="0", importedFile=imported_file)
 
     response = execute()
+    if response["IsSuccesfull"]:
+        directory_cache.invalidate("presets")
     return {
         "IsSuccesfull": response["IsSuccesfull"],
         "ErrorMessage": response["ErrorMessage"],
@@ -835,6 +1212,8 @@ def import_queries(imported_file_path):
         return client.service.ImportQueries(sessionId="0", importedFile=imported_file)
 
     response = execute()
+    if response["IsSuccesfull"]:
+        invalidate_query_catalog()
     return {
         "IsSuccesfull": response["IsSuccesfull"],
         "ErrorMessage": response["ErrorMessage"],
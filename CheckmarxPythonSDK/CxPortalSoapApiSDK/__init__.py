@@ -7,6 +7,9 @@ from .CxPortalWebService import (
     export_queries,
     get_import_queries_status,
     get_path_comments_history,
+    get_paths_comments_history,
+    parse_comments_history,
+    clear_comments_history_cache,
     get_user_profile_data,
     get_queries_categories,
     get_query_collection,
@@ -17,6 +20,7 @@ from .CxPortalWebService import (
     get_server_license_summary,
     delete_project,
     delete_projects,
+    delete_projects_in_batches,
     get_version_number,
     get_version_number_as_int,
     import_preset,
@@ -28,5 +32,44 @@ from .CxPortalWebService import (
 from .CxAuditWebService import (
     get_files_extensions,
     get_source_code_for_scan,
+    download_source_code_for_scan,
     upload_queries,
 )
+
+from .rawXml import (
+    get_records,
+    iterparse_records,
+    parse_record,
+)
+
+from .importJobs import (
+    ImportJobManager,
+    import_files,
+    stream_import,
+)
+
+from .scanReports import (
+    create_scan_reports,
+)
+
+from .scanLocks import (
+    get_scan_ids_to_keep_locked,
+    plan_scan_locks,
+    set_scan_locks,
+    reconcile_scan_locks,
+)
+
+from .querySync import (
+    fingerprint_query,
+    get_query_groups_with_sources,
+    save_query_groups,
+    load_query_groups,
+    compute_query_sync_plan,
+    sync_query_groups,
+)
+
+from .queryCatalog import (
+    QueryCatalog,
+    get_query_catalog,
+    invalidate_query_catalog,
+)
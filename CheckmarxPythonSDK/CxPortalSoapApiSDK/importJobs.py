@@ -0,0 +1,284 @@
+# encoding: utf-8
+import base64
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+
+from lxml import etree
+
+from .zeepClient import get_cached_client_and_factory, retry_when_unauthorized, create_soap_envelope, \
+    post_soap_stream
+from .queryCatalog import invalidate_query_catalog
+from ..directoryCache import directory_cache
+from ..poller import Poller, PolledItem
+
+relative_web_interface_url = "/CxWebInterface/Portal/CxWebService.asmx?wsdl"
+
+FINISHED_IMPORT_STATUSES = ("Succeeded", "Failed")
+
+# stands in for the imported file while zeep builds the envelope, its base64 text is replaced by the file
+_FILE_PLACEHOLDER = b"CheckmarxPythonSDK imported file placeholder"
+
+
+class _StreamedEnvelope(object):
+    """
+    a file-like SOAP envelope whose importedFile is read from disk and base64 encoded while the request is sent
+    """
+
+    def __init__(self, prefix, file_path, suffix, chunk_size=3 * 64 * 1024):
+        self._length = len(prefix) + (os.path.getsize(file_path) + 2) // 3 * 4 + len(suffix)
+        self._parts = self.__parts(prefix, file_path, suffix, chunk_size)
+        self._buffer = b""
+
+    @staticmethod
+    def __parts(prefix, file_path, suffix, chunk_size):
+        yield prefix
+        with open(file_path, "rb") as imported_file:
+            while True:
+                # a multiple of 3 bytes encodes without padding, so the encoded chunks join up
+                chunk = imported_file.read(chunk_size)
+                if not chunk:
+                    break
+                yield base64.b64encode(chunk)
+        yield suffix
+
+    def __len__(self):
+        return self._length
+
+    def read(self, size=-1):
+        while size is None or size < 0 or len(self._buffer) < size:
+            part = next(self._parts, None)
+            if part is None:
+                break
+            self._buffer += part
+        if size is None or size < 0:
+            data, self._buffer = self._buffer, b""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+def _get_text(root, name):
+    texts = root.xpath("//*[local-name()=$name]/text()", name=name)
+    return texts[0] if texts else None
+
+
+@retry_when_unauthorized
+def _send_streamed_import(operation_name, imported_file_path):
+    envelope = create_soap_envelope(relative_web_interface_url, operation_name, sessionId="0",
+                                    importedFile=_FILE_PLACEHOLDER)
+    prefix, suffix = envelope.split(base64.b64encode(_FILE_PLACEHOLDER), 1)
+    with post_soap_stream(relative_web_interface_url, operation_name,
+                          body=_StreamedEnvelope(prefix, imported_file_path, suffix)) as response_body:
+        root = etree.parse(response_body).getroot()
+    request_id = _get_text(root, "requestId")
+    return {
+        "IsSuccesfull": _get_text(root, "IsSuccesfull") == "true",
+        "ErrorMessage": _get_text(root, "ErrorMessage"),
+        "requestId": int(request_id) if request_id is not None else None,
+        "importQueryStatus": _get_text(root, "importQueryStatus"),
+    }
+
+
+def stream_import(imported_file_path, operation_name="ImportQueries"):
+    """
+    like import_queries and import_preset, but the file is read and encoded into the request piece by piece,
+    so that large query packs are not held in memory
+
+    Args:
+        imported_file_path (str):
+        operation_name (str, optional): "ImportQueries" or "ImportPreset"
+
+    Returns:
+        dict: {"IsSuccesfull": bool, "ErrorMessage": str, "requestId": int, "importQueryStatus": str}
+
+    Raises:
+        ValueError: when the file does not exist, or the HTTP status of the response is not OK
+    """
+    if not os.path.exists(imported_file_path):
+        raise ValueError("the imported file {} does not exist".format(imported_file_path))
+
+    result = _send_streamed_import(operation_name, imported_file_path)
+    if result.get("IsSuccesfull"):
+        if operation_name == "ImportQueries":
+            invalidate_query_catalog()
+        else:
+            directory_cache.invalidate("presets")
+    return result
+
+
+def _get_import_status(request_id):
+
+    @retry_when_unauthorized
+    def execute():
+        client, factory = get_cached_client_and_factory(relative_web_interface_url=relative_web_interface_url)
+        return client.service.GetImportQueriesStatus(sessionId="0", requestId=request_id)
+
+    response = execute()
+    return {
+        "IsSuccesfull": response["IsSuccesfull"],
+        "ErrorMessage": response["ErrorMessage"],
+        "requestId": response["requestId"],
+        "importQueryStatus": response["importQueryStatus"]
+    }
+
+
+class _ImportJob(PolledItem):
+
+    def __init__(self, imported_file_path, operation_name, future, interval):
+        # the job is its own key, the same file can be imported more than once
+        super(_ImportJob, self).__init__(self, future, None, interval)
+        self.imported_file_path = imported_file_path
+        self.operation_name = operation_name
+        self.request_id = None
+
+
+class ImportJobManager(Poller):
+    """
+    import many query and preset files at once and wait for them with futures.
+
+    The files are sent by a pool of max_workers threads with stream_import. The import status of every sent file is
+    then polled by one background thread with get_import_queries_status, the poll interval of a job doubles from
+    min_interval up to max_interval.
+    """
+
+    def __init__(self, max_workers=4, min_interval=1, max_interval=30, timeout=None, max_errors=3):
+        """
+
+        Args:
+            max_workers (int): number of files sent at once
+            min_interval (int, float): seconds
+            max_interval (int, float): seconds
+            timeout (int, float, optional): seconds to wait for one import after it is sent, None to wait forever
+            max_errors (int): consecutive failed polls of a job before its future fails
+        """
+        super(ImportJobManager, self).__init__(min_interval, max_interval, timeout=timeout, max_errors=max_errors,
+                                               thread_name="ImportJobPoller")
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._sending = set()
+
+    def submit_queries(self, imported_file_path, callback=None):
+        """
+        see submit
+        """
+        return self.submit(imported_file_path, operation_name="ImportQueries", callback=callback)
+
+    def submit_preset(self, imported_file_path, callback=None):
+        """
+        see submit
+        """
+        return self.submit(imported_file_path, operation_name="ImportPreset", callback=callback)
+
+    def submit(self, imported_file_path, operation_name="ImportQueries", callback=None):
+        """
+
+        Args:
+            imported_file_path (str):
+            operation_name (str, optional): "ImportQueries" or "ImportPreset"
+            callback (function, optional): called with the future once the import is finished
+
+        Returns:
+            :obj:`Future`: the result is the last get_import_queries_status of the job, with importQueryStatus
+                "Succeeded" or "Failed", or the result of stream_import if the file is not accepted.
+                The future fails with TimeoutError after timeout seconds
+        """
+        job = _ImportJob(imported_file_path, operation_name, Future(), self.min_interval)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("ImportJobManager is closed")
+            self._sending.add(job)
+        if callback:
+            job.future.add_done_callback(callback)
+        self._executor.submit(self.__send, job)
+        return job.future
+
+    def wait(self, futures):
+        """
+        block until the imports are finished
+
+        Args:
+            futures (list of :obj:`Future`):
+
+        Returns:
+            list of dict: the results of the futures, in the same order
+        """
+        return [future.result() for future in futures]
+
+    def close(self):
+        """
+        stop polling and cancel the futures of the imports that are not finished,
+        the imports already sent go on in the server
+        """
+        with self._condition:
+            sending, self._sending = list(self._sending), set()
+        super(ImportJobManager, self).close()
+        self._executor.shutdown(wait=False)
+        for job in sending:
+            job.future.cancel()
+
+    def __send(self, job):
+        try:
+            if job.future.cancelled():
+                return
+            response = stream_import(job.imported_file_path, operation_name=job.operation_name)
+        except Exception as error:
+            self._finish(job, exception=error)
+            return
+        finally:
+            with self._condition:
+                self._sending.discard(job)
+        if not response.get("IsSuccesfull") or response.get("importQueryStatus") in FINISHED_IMPORT_STATUSES:
+            self._finish(job, result=response)
+            return
+
+        job.request_id = response.get("requestId")
+        job.deadline = self._get_deadline()
+        job.next_poll = time.time() + job.interval
+        try:
+            self._add(job, lambda: job)
+        except RuntimeError:
+            job.future.cancel()
+
+    def _poll(self, due):
+        for job in due:
+            try:
+                status = _get_import_status(job.request_id)
+            except Exception as error:
+                self._failed_polls([job], error)
+                continue
+
+            if not status.get("IsSuccesfull") or status.get("importQueryStatus") in FINISHED_IMPORT_STATUSES:
+                self._finish(job, result=status)
+            elif self._is_expired(job):
+                self._finish(job, exception=TimeoutError("import {} is not finished".format(job.request_id)))
+            else:
+                self._reschedule(job)
+
+
+def import_files(queries_file_paths=None, preset_file_paths=None, max_workers=4, timeout=None):
+    """
+    import query and preset files concurrently and wait until every import is finished
+
+    Args:
+        queries_file_paths (list of str, optional):
+        preset_file_paths (list of str, optional):
+        max_workers (int, optional): number of files sent at once
+        timeout (int, float, optional): seconds to wait for one import after it is sent
+
+    Returns:
+        dict: {file path: the result of the import, see ImportJobManager.submit, or the exception it failed with}
+    """
+    with ImportJobManager(max_workers=max_workers, timeout=timeout) as manager:
+        futures = {}
+        for imported_file_path in queries_file_paths or []:
+            futures[imported_file_path] = manager.submit_queries(imported_file_path)
+        for imported_file_path in preset_file_paths or []:
+            futures[imported_file_path] = manager.submit_preset(imported_file_path)
+
+        results = {}
+        for imported_file_path, future in futures.items():
+            try:
+                results[imported_file_path] = future.result()
+            except Exception as error:
+                results[imported_file_path] = error
+        return results
@@ -0,0 +1,313 @@
+# encoding: utf-8
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from ..config import config
+
+# {base url: QueryCatalog}, the catalog of each server this process used
+_catalogs = {}
+_catalog_lock = threading.Lock()
+_cache_dir = None
+
+# seconds after which a catalog is checked against the language state of the server
+DEFAULT_MAX_AGE = 3600
+
+
+def get_default_cache_dir():
+    return os.path.join(os.path.expanduser("~"), ".Checkmarx", "query_catalog")
+
+
+def get_catalog_db_path(cache_dir=None):
+    """
+    the SQLite file of the catalog of the configured server
+
+    Args:
+        cache_dir (str, optional): default the cache_dir last given to get_query_catalog,
+            or ~/.Checkmarx/query_catalog
+
+    Returns:
+        str
+    """
+    cache_dir = cache_dir or _cache_dir or get_default_cache_dir()
+    return os.path.join(cache_dir, hashlib.sha1(config.get("base_url").encode("utf-8")).hexdigest() + ".sqlite")
+
+
+def get_language_state_key(query_groups):
+    """
+    a hash of the LanguageStateHash of every query group, it changes when the queries of the server change
+
+    Args:
+        query_groups (list of dict):
+
+    Returns:
+        str
+    """
+    states = sorted(
+        json.dumps([query_group.get("LanguageName"), query_group.get("PackageTypeName"), query_group.get("Name"),
+                    query_group.get("LanguageStateHash")])
+        for query_group in query_groups
+    )
+    return hashlib.sha1(json.dumps(states).encode("utf-8")).hexdigest()
+
+
+class QueryCatalog(object):
+    """
+    the query collection of a CxSAST server (see get_query_collection), indexed by
+    (language name, package type name, package name, query name), by QueryId and by QueryVersionCode.
+
+    A loaded catalog is persisted in a SQLite file per server, keyed by the server version and the
+    language state key (see get_language_state_key) of its query groups. The query source texts are kept in that
+    file only, and read when get_source is called.
+    """
+
+    def __init__(self, query_groups, db_path, language_state_key=None):
+        """
+
+        Args:
+            query_groups (list of dict): the "QueryGroups" of get_query_collection, without the "Source" of the queries
+            db_path (str): the SQLite file holding the query sources
+            language_state_key (str, optional): see get_language_state_key, computed from query_groups if not given
+        """
+        self.db_path = db_path
+        self.query_groups = query_groups
+        self.language_state_key = language_state_key or get_language_state_key(query_groups)
+        self.loaded_on = time.time()
+        self._groups_by_package_id = {}
+        self._queries_by_key = {}
+        self._queries_by_id = {}
+        self._queries_by_version_code = {}
+        for query_group in query_groups:
+            self._groups_by_package_id[query_group.get("PackageId")] = query_group
+            for query in query_group.get("Queries") or []:
+                key = (query_group.get("LanguageName"), query_group.get("PackageTypeName"),
+                       query_group.get("Name"), query.get("Name"))
+                self._queries_by_key.setdefault(key, []).append(query)
+                self._queries_by_id[query.get("QueryId")] = query
+                self._queries_by_version_code[query.get("QueryVersionCode")] = query
+
+    @classmethod
+    def load(cls, cache_dir=None, max_age=DEFAULT_MAX_AGE, refresh=False):
+        """
+        load the catalog from the local cache, or from the server if it is not cached for the current server version,
+        if it is older than max_age, or if refresh is True.
+        A catalog downloaded again replaces the cached one only when its language state key differs.
+
+        Args:
+            cache_dir (str, optional): default ~/.Checkmarx/query_catalog
+            max_age (int, float, optional): seconds, None to keep the cached catalog until the server version changes
+            refresh (bool, optional):
+
+        Returns:
+            QueryCatalog, or None if the server fails to return the query collection
+        """
+        from .CxPortalWebService import get_version_number, get_query_collection
+
+        db_path = get_catalog_db_path(cache_dir)
+        if not os.path.exists(os.path.dirname(db_path)):
+            os.makedirs(os.path.dirname(db_path))
+        version = get_version_number().get("Version")
+
+        cached = cls.__read_query_groups(db_path) if os.path.exists(db_path) else None
+        if cached is not None and cached.get("version") != version:
+            cached = None
+        if cached is not None and not refresh and (max_age is None or time.time() - cached.get("saved_on") < max_age):
+            return cls(cached.get("query_groups"), db_path, cached.get("language_state_key"))
+
+        response = get_query_collection(raw_xml=True)
+        if not response.get("IsSuccesfull"):
+            return None
+        query_groups = response.get("QueryGroups")
+        language_state_key = get_language_state_key(query_groups)
+        if cached is not None and cached.get("language_state_key") == language_state_key:
+            # the queries did not change, the cached sources are still valid
+            cls.__touch(db_path)
+            return cls(cached.get("query_groups"), db_path, language_state_key)
+        cls.__write_query_groups(db_path, query_groups, version, language_state_key)
+        return cls(query_groups, db_path, language_state_key)
+
+    @staticmethod
+    def __read_query_groups(db_path):
+        connection = sqlite3.connect(db_path)
+        try:
+            row = connection.execute(
+                "SELECT query_groups, saved_on, version, language_state_key FROM catalog"
+            ).fetchone()
+        except sqlite3.DatabaseError:
+            return None
+        finally:
+            connection.close()
+        if row is None:
+            return None
+        return {"query_groups": json.loads(row[0]), "saved_on": row[1], "version": row[2],
+                "language_state_key": row[3]}
+
+    @staticmethod
+    def __touch(db_path):
+        connection = sqlite3.connect(db_path)
+        try:
+            with connection:
+                connection.execute("UPDATE catalog SET saved_on = ?", (time.time(),))
+        finally:
+            connection.close()
+
+    @staticmethod
+    def __write_query_groups(db_path, query_groups, version, language_state_key):
+        """
+        store the query groups with the sources of the queries moved into their own table,
+        the "Source" of every query is removed from query_groups
+        """
+        sources = []
+        for query_group in query_groups:
+            for query in query_group.get("Queries") or []:
+                sources.append((query.get("QueryId"), query.pop("Source", None)))
+
+        connection = sqlite3.connect(db_path)
+        try:
+            with connection:
+                connection.execute("DROP TABLE IF EXISTS catalog")
+                connection.execute("DROP TABLE IF EXISTS sources")
+                connection.execute("CREATE TABLE catalog (query_groups TEXT NOT NULL, saved_on REAL NOT NULL, "
+                                   "version TEXT, language_state_key TEXT NOT NULL)")
+                connection.execute("CREATE TABLE sources (query_id INTEGER PRIMARY KEY, source TEXT)")
+                connection.execute(
+                    "INSERT INTO catalog (query_groups, saved_on, version, language_state_key) VALUES (?, ?, ?, ?)",
+                    (json.dumps(query_groups, default=str), time.time(), version, language_state_key)
+                )
+                connection.executemany("INSERT OR REPLACE INTO sources (query_id, source) VALUES (?, ?)", sources)
+        finally:
+            connection.close()
+
+    @property
+    def language_state_hashes(self):
+        """
+
+        Returns:
+            dict: {LanguageName: set of LanguageStateHash}
+        """
+        hashes = {}
+        for query_group in self.query_groups:
+            hashes.setdefault(query_group.get("LanguageName"), set()).add(query_group.get("LanguageStateHash"))
+        return hashes
+
+    def find(self, language=None, package_type_name=None, package_name=None, query_name=None):
+        """
+        each filter is a str, a list or tuple of str, or None for any
+
+        Args:
+            language (str, list, tuple, None):
+            package_type_name (str, list, tuple, None): ["Cx", "Corp"]
+            package_name (str, list, tuple, None):
+            query_name (str, list, tuple, None):
+
+        Returns:
+            list of dict: the matching queries
+        """
+        filters = [self.__as_list(value) for value in (language, package_type_name, package_name, query_name)]
+        if all(values is not None for values in filters):
+            # every part of the key is given, look the combinations up directly
+            queries = []
+            for key in self.__combinations(filters):
+                queries.extend(self._queries_by_key.get(key, []))
+            return queries
+
+        return [
+            query for key, queries in self._queries_by_key.items()
+            if all(values is None or part in values for part, values in zip(key, filters))
+            for query in queries
+        ]
+
+    @staticmethod
+    def __as_list(value):
+        if value is None:
+            return None
+        if isinstance(value, (list, tuple, set)):
+            return list(value)
+        return [value]
+
+    @staticmethod
+    def __combinations(filters):
+        keys = [()]
+        for values in filters:
+            keys = [key + (value,) for key in keys for value in values]
+        return keys
+
+    def get_query_by_id(self, query_id):
+        return self._queries_by_id.get(query_id)
+
+    def get_query_by_version_code(self, query_version_code):
+        return self._queries_by_version_code.get(query_version_code)
+
+    def get_query_group(self, query):
+        """
+
+        Args:
+            query (dict):
+
+        Returns:
+            dict: the query group (package) of the query
+        """
+        return self._groups_by_package_id.get(query.get("PackageId"))
+
+    def get_source(self, query_id):
+        """
+        read the source text of a query from the local cache
+
+        Args:
+            query_id (int):
+
+        Returns:
+            str, or None
+        """
+        connection = sqlite3.connect(self.db_path)
+        try:
+            row = connection.execute("SELECT source FROM sources WHERE query_id = ?", (query_id,)).fetchone()
+        finally:
+            connection.close()
+        return row[0] if row else None
+
+
+def get_query_catalog(refresh=False, cache_dir=None, max_age=DEFAULT_MAX_AGE):
+    """
+    the query catalog of the configured server in this process, loaded once
+
+    Args:
+        refresh (bool, optional): download the query collection again
+        cache_dir (str, optional): kept for the next calls and for invalidate_query_catalog
+        max_age (int, float, optional): seconds, after which the query collection is downloaded again
+            to compare its language state key with the cached one, None to keep the catalog until the server version
+            changes
+
+    Returns:
+        QueryCatalog, or None if the server fails to return the query collection
+    """
+    global _cache_dir
+    with _catalog_lock:
+        if cache_dir is not None:
+            _cache_dir = cache_dir
+        base_url = config.get("base_url")
+        query_catalog = _catalogs.get(base_url)
+        is_expired = query_catalog is not None and max_age is not None and \
+            time.time() - query_catalog.loaded_on >= max_age
+        if query_catalog is None or refresh or is_expired or query_catalog.db_path != get_catalog_db_path():
+            query_catalog = QueryCatalog.load(cache_dir=_cache_dir, max_age=max_age, refresh=refresh)
+            _catalogs[base_url] = query_catalog
+        return query_catalog
+
+
+def invalidate_query_catalog(cache_dir=None):
+    """
+    forget the catalog of the configured server, in this process and on disk,
+    e.g. after queries are imported or uploaded. The catalogs of other servers are kept.
+
+    Args:
+        cache_dir (str, optional): default the cache_dir last given to get_query_catalog
+    """
+    with _catalog_lock:
+        _catalogs.pop(config.get("base_url"), None)
+        db_path = get_catalog_db_path(cache_dir)
+        if os.path.exists(db_path):
+            os.remove(db_path)
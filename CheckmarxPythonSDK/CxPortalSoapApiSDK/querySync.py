@@ -0,0 +1,245 @@
+# encoding: utf-8
+import copy
+import hashlib
+import io
+import json
+
+from .queryCatalog import get_query_catalog
+
+
+def fingerprint_query(query):
+    """
+    a hash of what a query does: its Source, Severity, Cwe and Categories
+
+    Args:
+        query (dict): a query of a query group, see get_query_collection
+
+    Returns:
+        str
+    """
+    categories = sorted(
+        json.dumps([(category.get("CategoryType") or {}).get("Name"), category.get("CategoryName")])
+        for category in query.get("Categories") or []
+    )
+    content = json.dumps([query.get("Source"), query.get("Severity"), query.get("Cwe"), categories])
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+# the package types whose groups are not owned by a team or a project of the server
+SERVER_WIDE_PACKAGE_TYPE_NAMES = ("Cx", "Corp")
+
+
+def _get_group_key(query_group):
+    return query_group.get("LanguageName"), query_group.get("PackageTypeName"), query_group.get("Name")
+
+
+def _get_category_key(category):
+    return (category.get("CategoryType") or {}).get("Name"), category.get("CategoryName")
+
+
+def _map_categories(query, target_categories_by_key, unmapped_categories):
+    """
+    replace the categories of a query of the source server with the same categories of the target server,
+    the categories the target does not have are dropped and reported in unmapped_categories
+    """
+    if not query.get("Categories"):
+        return
+    categories = []
+    for category in query.get("Categories"):
+        target_category = target_categories_by_key.get(_get_category_key(category))
+        if target_category is None:
+            unmapped_categories.add(_get_category_key(category))
+        else:
+            categories.append(copy.deepcopy(target_category))
+    query["Categories"] = categories
+
+
+def get_query_groups_with_sources(package_type_names=("Corp",), refresh=True):
+    """
+    the query groups of the server, with the "Source" of every query, see get_query_catalog
+
+    Args:
+        package_type_names (list of str, optional): only these package types, None for all
+        refresh (bool, optional): download the query collection again instead of using the cached catalog
+
+    Returns:
+        list of dict, or None if the server fails to return the query collection
+    """
+    query_catalog = get_query_catalog(refresh=refresh)
+    if query_catalog is None:
+        return None
+    query_groups = []
+    for query_group in query_catalog.query_groups:
+        if package_type_names is not None and query_group.get("PackageTypeName") not in package_type_names:
+            continue
+        query_group = copy.deepcopy(query_group)
+        for query in query_group.get("Queries") or []:
+            query["Source"] = query_catalog.get_source(query.get("QueryId"))
+        query_groups.append(query_group)
+    return query_groups
+
+
+def save_query_groups(file_path, package_type_names=("Corp",)):
+    """
+    save the query groups of the server to a json file, to be synchronized to another server with sync_query_groups
+
+    Args:
+        file_path (str):
+        package_type_names (list of str, optional): only these package types, None for all
+
+    Returns:
+        int: the number of saved query groups, or None if the server fails to return the query collection
+    """
+    query_groups = get_query_groups_with_sources(package_type_names=package_type_names)
+    if query_groups is None:
+        return None
+    with io.open(file_path, "w", encoding="utf-8") as query_groups_file:
+        query_groups_file.write(json.dumps(query_groups, ensure_ascii=False, default=str))
+    return len(query_groups)
+
+
+def load_query_groups(file_path):
+    """
+
+    Args:
+        file_path (str): see save_query_groups
+
+    Returns:
+        list of dict
+    """
+    with io.open(file_path, "r", encoding="utf-8") as query_groups_file:
+        return json.load(query_groups_file)
+
+
+def compute_query_sync_plan(source_query_groups, target_query_groups, package_type_names=("Corp",),
+                            target_categories=None):
+    """
+    compare the queries of two servers by fingerprint, and build the query groups to upload to the target so that
+    its queries are the same as the source. Groups are matched by (LanguageName, PackageTypeName, Name), queries
+    of a group by Name.
+
+    A group with a changed or added query is uploaded as a whole, with the ids of the target and its unchanged
+    queries as they are. Added queries and the groups missing in the target are sent with id 0, new groups without
+    the OwningTeam and ProjectId of the source. New team and project level groups are skipped, as their team or
+    project can not be found on the target. The categories of the queries sent are replaced with the categories of
+    the target that have the same type and name. Queries that are only in the target are kept, and reported as
+    "extra".
+
+    Args:
+        source_query_groups (list of dict): see get_query_groups_with_sources and load_query_groups
+        target_query_groups (list of dict): see get_query_groups_with_sources
+        package_type_names (list of str, optional): only these package types, None for all
+        target_categories (list of dict, optional): the "QueriesCategories" of get_queries_categories on the target,
+            the categories of target_query_groups are used if not given
+
+    Returns:
+        dict: {
+            "query_groups": list of dict, the query groups to upload, see upload_queries,
+            "added": list of tuple (LanguageName, PackageTypeName, group Name, query Name),
+            "changed": list of tuple,
+            "extra": list of tuple,
+            "unchanged": int,
+            "skipped_groups": list of tuple (LanguageName, PackageTypeName, group Name),
+            "unmapped_categories": list of tuple (category type Name, CategoryName), dropped from the queries sent
+        }
+    """
+    target_groups_by_key = {_get_group_key(query_group): query_group for query_group in target_query_groups}
+    target_categories_by_key = {}
+    for query_group in target_query_groups:
+        for query in query_group.get("Queries") or []:
+            for category in query.get("Categories") or []:
+                target_categories_by_key[_get_category_key(category)] = category
+    for category in target_categories or []:
+        target_categories_by_key[_get_category_key(category)] = category
+    unmapped_categories = set()
+    plan = {"query_groups": [], "added": [], "changed": [], "extra": [], "unchanged": 0, "skipped_groups": []}
+
+    for source_group in source_query_groups:
+        if package_type_names is not None and source_group.get("PackageTypeName") not in package_type_names:
+            continue
+        group_key = _get_group_key(source_group)
+        target_group = target_groups_by_key.get(group_key)
+        if target_group is None:
+            if source_group.get("PackageTypeName") not in SERVER_WIDE_PACKAGE_TYPE_NAMES:
+                plan["skipped_groups"].append(group_key)
+                continue
+            new_group = copy.deepcopy(source_group)
+            # the ids of the source server mean nothing on the target
+            new_group["PackageId"] = 0
+            new_group["OwningTeam"] = 0
+            new_group["ProjectId"] = 0
+            for query in new_group.get("Queries") or []:
+                query["PackageId"] = 0
+                query["QueryId"] = 0
+                query["QueryVersionCode"] = 0
+                _map_categories(query, target_categories_by_key, unmapped_categories)
+                plan["added"].append(group_key + (query.get("Name"),))
+            plan["query_groups"].append(new_group)
+            continue
+
+        target_queries_by_name = {query.get("Name"): query for query in target_group.get("Queries") or []}
+        upload_group = copy.deepcopy(target_group)
+        upload_queries_by_name = {query.get("Name"): query for query in upload_group.get("Queries") or []}
+        is_changed = False
+        for source_query in source_group.get("Queries") or []:
+            query_key = group_key + (source_query.get("Name"),)
+            target_query = target_queries_by_name.get(source_query.get("Name"))
+            if target_query is not None and fingerprint_query(source_query) == fingerprint_query(target_query):
+                plan["unchanged"] += 1
+                continue
+
+            is_changed = True
+            if target_query is None:
+                new_query = copy.deepcopy(source_query)
+                new_query["PackageId"] = target_group.get("PackageId")
+                new_query["QueryId"] = 0
+                new_query["QueryVersionCode"] = 0
+                _map_categories(new_query, target_categories_by_key, unmapped_categories)
+                upload_group["Queries"] = (upload_group.get("Queries") or []) + [new_query]
+                plan["added"].append(query_key)
+            else:
+                upload_query = upload_queries_by_name[source_query.get("Name")]
+                for key in ("Source", "Severity", "Cwe", "Categories"):
+                    upload_query[key] = copy.deepcopy(source_query.get(key))
+                _map_categories(upload_query, target_categories_by_key, unmapped_categories)
+                plan["changed"].append(query_key)
+
+        source_query_names = set(query.get("Name") for query in source_group.get("Queries") or [])
+        plan["extra"].extend(group_key + (name,) for name in target_queries_by_name if name not in source_query_names)
+        if is_changed:
+            plan["query_groups"].append(upload_group)
+    plan["unmapped_categories"] = sorted(unmapped_categories, key=str)
+    return plan
+
+
+def sync_query_groups(source_query_groups, package_type_names=("Corp",), dry_run=False):
+    """
+    upload to the server only the query groups that differ from the source query groups,
+    see compute_query_sync_plan
+
+    Args:
+        source_query_groups (list of dict or str): the query groups, or a file saved with save_query_groups
+        package_type_names (list of str, optional): only these package types, None for all
+        dry_run (bool, optional): compute the plan without uploading
+
+    Returns:
+        dict: the plan, see compute_query_sync_plan, with "IsSuccesfull" and "ErrorMessage" of upload_queries,
+            "IsSuccesfull" is True when there is nothing to upload
+    """
+    from .CxAuditWebService import upload_queries
+    from .CxPortalWebService import get_queries_categories
+
+    if not isinstance(source_query_groups, list):
+        source_query_groups = load_query_groups(source_query_groups)
+    target_query_groups = get_query_groups_with_sources(package_type_names=package_type_names)
+    if target_query_groups is None:
+        return {"IsSuccesfull": False, "ErrorMessage": "failed to get the query collection of the server"}
+
+    target_categories = get_queries_categories().get("QueriesCategories")
+    plan = compute_query_sync_plan(source_query_groups, target_query_groups, package_type_names=package_type_names,
+                                   target_categories=target_categories)
+    plan["IsSuccesfull"], plan["ErrorMessage"] = True, None
+    if not dry_run and plan.get("query_groups"):
+        response = upload_queries(plan.get("query_groups"))
+        plan["IsSuccesfull"], plan["ErrorMessage"] = response.get("IsSuccesfull"), response.get("ErrorMessage")
+    return plan
@@ -0,0 +1,116 @@
+# encoding: utf-8
+"""
+    a fast path for large SOAP responses: the response is parsed as it is read, with lxml iterparse,
+    straight into dicts, instead of zeep building its object graph which is then copied into dicts.
+
+    A record spec maps the local name of each child element to how its text is converted:
+    None keeps the text, a function converts it, a dict is a nested record spec,
+    and a tuple (item name, item spec) is a list of items.
+
+    The values have the types zeep gives them, except that an array, e.g. an ArrayOfInt, is a plain list.
+"""
+from lxml import etree
+from zeep.xsd.types.builtins import DateTime
+
+from .zeepClient import post_soap_stream, retry_when_unauthorized
+
+XSI_NIL = "{http://www.w3.org/2001/XMLSchema-instance}nil"
+
+
+def to_bool(text):
+    return text == "true"
+
+
+def to_datetime(text):
+    """
+    an xsd:dateTime, converted as zeep does
+    """
+    return DateTime().pythonvalue(text)
+
+
+def _parse_value(element, spec):
+    if element.get(XSI_NIL) == "true":
+        return None
+    if isinstance(spec, tuple):
+        item_name, item_spec = spec
+        return [_parse_value(child, item_spec) for child in element if etree.QName(child).localname == item_name]
+    if isinstance(spec, dict):
+        return parse_record(element, spec)
+    if spec is None:
+        return element.text
+    return spec(element.text) if element.text is not None else None
+
+
+def parse_record(element, spec):
+    """
+
+    Args:
+        element (:obj:`lxml.etree._Element`):
+        spec (dict): {child name: None, function, dict or tuple}, see the module docstring
+
+    Returns:
+        dict: with a key for every name in spec, None for the missing children
+    """
+    record = dict.fromkeys(spec)
+    for child in element:
+        name = etree.QName(child).localname
+        if name in spec:
+            record[name] = _parse_value(child, spec[name])
+    return record
+
+
+def iterparse_records(stream, record_name, spec, field_names=("IsSuccesfull", "ErrorMessage")):
+    """
+    parse a SOAP response, turning each record_name element into a dict as soon as it is read and freeing it
+
+    Args:
+        stream (file-like): the response body
+        record_name (str): the local name of the record elements, e.g. "CxWSQueryGroup"
+        spec (dict): see parse_record
+        field_names (tuple of str, optional): other elements whose text is returned, they must not occur in records
+
+    Returns:
+        tuple: (list of dict, dict {field name: text})
+    """
+    tags = ["{*}" + record_name] + ["{*}" + name for name in field_names]
+    records = []
+    fields = dict.fromkeys(field_names)
+    for _, element in etree.iterparse(stream, events=("end",), tag=tags, huge_tree=True):
+        name = etree.QName(element).localname
+        if name != record_name:
+            fields[name] = element.text
+            continue
+        records.append(parse_record(element, spec))
+        element.clear()
+        # drop the records already parsed, so that the tree does not grow with the response
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+    return records, fields
+
+
+@retry_when_unauthorized
+def get_records(relative_web_interface_url, operation_name, record_name, spec, **kwargs):
+    """
+    call a SOAP operation and parse the record_name elements of its response with iterparse_records,
+    retrying with a new token when the token is invalid
+
+    Args:
+        relative_web_interface_url (str):
+        operation_name (str): e.g. "GetQueryCollection"
+        record_name (str): e.g. "CxWSQueryGroup"
+        spec (dict): see parse_record
+        **kwargs: the arguments of the operation
+
+    Returns:
+        dict: {"IsSuccesfull": bool, "ErrorMessage": str, "Records": list of dict}
+
+    Raises:
+        ValueError: when the HTTP status of the response is not OK, see post_soap_stream
+    """
+    with post_soap_stream(relative_web_interface_url, operation_name, **kwargs) as response_body:
+        records, fields = iterparse_records(response_body, record_name, spec)
+    return {
+        "IsSuccesfull": to_bool(fields.get("IsSuccesfull")),
+        "ErrorMessage": fields.get("ErrorMessage"),
+        "Records": records,
+    }
@@ -0,0 +1,137 @@
+# encoding: utf-8
+from concurrent.futures import ThreadPoolExecutor
+
+from .zeepClient import get_cached_client_and_factory, retry_when_unauthorized
+
+relative_web_interface_url = "/CxWebInterface/Portal/CxWebService.asmx?wsdl"
+
+LOCK = "LOCK"
+UNLOCK = "UNLOCK"
+
+
+def get_scan_ids_to_keep_locked(scans, keep_last=5, selector=None):
+    """
+    the last keep_last finished scans of a project, e.g. the release scans of a retention policy
+
+    Args:
+        scans (list of :obj:`CxScanDetail`): the scans of one project, see ScansAPI.get_all_scans_for_project
+        keep_last (int, optional):
+        selector (function, optional): takes a CxScanDetail, returns True for the scans to consider,
+            e.g. lambda scan: "release" in (scan.comment or "")
+
+    Returns:
+        set of int
+    """
+    candidates = [
+        scan for scan in scans
+        if scan.status is not None and scan.status.name == "Finished" and (selector is None or selector(scan))
+    ]
+    # scan ids increase with the time the scans are created
+    candidates.sort(key=lambda scan: scan.id, reverse=True)
+    return set(scan.id for scan in candidates[:keep_last])
+
+
+def plan_scan_locks(scans, scan_ids_to_lock, unlock_others=False):
+    """
+    compare the lock state of finished scans with the wanted one, the scans that are not finished are left as they are
+
+    Args:
+        scans (list of :obj:`CxScanDetail`):
+        scan_ids_to_lock (set of int):
+        unlock_others (bool, optional): unlock the locked finished scans that are not in scan_ids_to_lock
+
+    Returns:
+        dict: {"lock": list of int, "unlock": list of int}, only the scans whose lock state changes
+    """
+    finished_scans = [scan for scan in scans if scan.status is not None and scan.status.name == "Finished"]
+    return {
+        "lock": sorted(scan.id for scan in finished_scans if scan.id in scan_ids_to_lock and not scan.is_locked),
+        "unlock": sorted(
+            scan.id for scan in finished_scans if unlock_others and scan.id not in scan_ids_to_lock and scan.is_locked
+        ),
+    }
+
+
+def set_scan_locks(scan_ids_to_lock=None, scan_ids_to_unlock=None, max_workers=8):
+    """
+    lock and unlock many scans concurrently, reusing one SOAP client per worker thread
+
+    Args:
+        scan_ids_to_lock (list of int, optional):
+        scan_ids_to_unlock (list of int, optional):
+        max_workers (int, optional):
+
+    Returns:
+        dict: {scan_id: {"Action": "LOCK" or "UNLOCK", "IsSuccesfull": bool, "ErrorMessage": str}}
+    """
+
+    def apply(scan_id_and_action):
+        scan_id, action = scan_id_and_action
+
+        @retry_when_unauthorized
+        def execute():
+            client, factory = get_cached_client_and_factory(relative_web_interface_url=relative_web_interface_url)
+            if action == LOCK:
+                return client.service.LockScan(i_SessionID="0", i_ScanID=scan_id)
+            return client.service.UnlockScan(i_SessionID="0", i_ScanID=scan_id)
+
+        try:
+            response = execute()
+        except Exception as error:
+            return scan_id, {"Action": action, "IsSuccesfull": False, "ErrorMessage": str(error)}
+        return scan_id, {
+            "Action": action,
+            "IsSuccesfull": response["IsSuccesfull"],
+            "ErrorMessage": response["ErrorMessage"],
+        }
+
+    changes = [(scan_id, LOCK) for scan_id in scan_ids_to_lock or []]
+    changes.extend((scan_id, UNLOCK) for scan_id in scan_ids_to_unlock or [])
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(executor.map(apply, changes))
+
+
+def reconcile_scan_locks(project_ids, keep_last=5, selector=None, unlock_others=False, max_workers=8, dry_run=False):
+    """
+    keep the last keep_last finished scans of every project locked, see get_scan_ids_to_keep_locked.
+    The scans of the projects are read concurrently with ScansAPI.get_all_scans_for_project, and only the scans whose
+    lock state differs are locked or unlocked.
+
+    Args:
+        project_ids (list of int):
+        keep_last (int, optional):
+        selector (function, optional): see get_scan_ids_to_keep_locked
+        unlock_others (bool, optional): also unlock the other locked finished scans of the projects
+        max_workers (int, optional):
+        dry_run (bool, optional): only compute the changes
+
+    Returns:
+        dict: {
+            "lock": list of int,
+            "unlock": list of int,
+            "results": dict, see set_scan_locks, empty for a dry run,
+            "failed_projects": dict {project_id: error message}, the projects whose scans could not be read
+        }
+    """
+    from ..CxRestAPISDK import ScansAPI
+
+    def get_scans(project_id):
+        try:
+            return project_id, ScansAPI().get_all_scans_for_project(project_id=project_id), None
+        except Exception as error:
+            return project_id, None, str(error)
+
+    plan = {"lock": [], "unlock": [], "results": {}, "failed_projects": {}}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for project_id, scans, error in executor.map(get_scans, project_ids):
+            if error is not None:
+                plan["failed_projects"][project_id] = error
+                continue
+            changes = plan_scan_locks(scans or [], get_scan_ids_to_keep_locked(scans or [], keep_last, selector),
+                                      unlock_others=unlock_others)
+            plan["lock"].extend(changes.get("lock"))
+            plan["unlock"].extend(changes.get("unlock"))
+
+    if not dry_run:
+        plan["results"] = set_scan_locks(plan.get("lock"), plan.get("unlock"), max_workers=max_workers)
+    return plan
@@ -0,0 +1,175 @@
+# encoding: utf-8
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from .zeepClient import get_cached_client_and_factory, retry_when_unauthorized
+from .CxPortalWebService import _build_report_display_data, get_version_number_as_int
+from ..compat import OK, UNAUTHORIZED
+from ..config import config
+
+relative_web_interface_url = "/CxWebInterface/Portal/CxWebService.asmx?wsdl"
+
+# the threads that poll the status of the reports, apart from the workers that request and download them
+POLL_WORKERS = 2
+
+
+def create_scan_reports(scan_ids, report_type, report_folder, max_workers=4, poll_interval=2, max_poll_interval=30,
+                        timeout=None, **display_options):
+    """
+    generate the reports of many scans and write them into report_folder as "<scan id>.<report type>".
+
+    The report settings are built once, and the reports are requested concurrently with CreateScanReport over one
+    SOAP client per worker thread. The status of all the requested reports is polled in one loop on a separate small
+    pool, so that polls do not wait behind the queued requests, and every report is streamed to disk as soon as it
+    is created, while the others are still requested or generated.
+
+    Args:
+        scan_ids (list of int):
+        report_type (str): 'PDF', 'RTF', 'CSV', 'XML'
+        report_folder (str):
+        max_workers (int, optional): the maximum number of concurrent requests and downloads
+        poll_interval (int, float, optional): seconds, the interval doubles up to max_poll_interval while no report
+            is created
+        max_poll_interval (int, float, optional): seconds
+        timeout (int, float, optional): seconds to wait for all the reports to be requested, created and written,
+            None to wait forever. At the timeout the queued requests are cancelled, and the reports that are not
+            written get a timeout ErrorMessage
+        **display_options: the report settings, the keyword arguments of create_scan_report
+
+    Returns:
+        dict: {scan_id: {"ReportId": int, "FilePath": str, "ErrorMessage": str}},
+            FilePath is None for the reports that failed, with the reason in ErrorMessage
+    """
+    from ..CxRestAPISDK import authHeaders as rest_auth_headers
+    from ..CxRestAPISDK.pooledSession import get_pooled_session, session_get
+
+    if not os.path.exists(report_folder):
+        os.makedirs(report_folder)
+
+    client, factory = get_cached_client_and_factory(relative_web_interface_url=relative_web_interface_url)
+    display_data = _build_report_display_data(factory, get_version_number_as_int(), **display_options)
+    report_url = config.get("base_url") + "/cxrestapi/reports/sastScan/{id}"
+    session = get_pooled_session(pool_size=max_workers + POLL_WORKERS)
+
+    def request_report(scan_id):
+        @retry_when_unauthorized
+        def execute():
+            thread_client, thread_factory = get_cached_client_and_factory(
+                relative_web_interface_url=relative_web_interface_url
+            )
+            filtered_report_request = thread_factory.CxWSFilteredReportRequest(Type=report_type, ScanID=scan_id,
+                                                                               DisplayData=display_data)
+            return thread_client.service.CreateScanReport(SessionID="0", Report=filtered_report_request)
+
+        return execute()
+
+    def get_report_status(report_id):
+        try:
+            report_status = session_get(session, report_url.format(id=report_id) + "/status").json()
+        except Exception:
+            # polled again in the next round
+            return None
+        return (report_status.get("status") or {}).get("value")
+
+    def download_report(report_id, scan_id):
+        file_path = os.path.join(report_folder, "{}.{}".format(scan_id, report_type.lower()))
+        r = session.get(url=report_url.format(id=report_id), headers=rest_auth_headers.get_headers(), stream=True)
+        retry = 0
+        while r.status_code == UNAUTHORIZED and retry < config.get("max_try"):
+            r.close()
+            rest_auth_headers.update_auth_headers()
+            retry += 1
+            r = session.get(url=report_url.format(id=report_id), headers=rest_auth_headers.get_headers(), stream=True)
+        try:
+            if r.status_code != OK:
+                raise ValueError("HttpStatusCode: {}, ErrorMessage: {}".format(r.status_code, r.text))
+            with open(file_path, "wb") as report_file:
+                for chunk in r.iter_content(chunk_size=64 * 1024):
+                    report_file.write(chunk)
+        finally:
+            r.close()
+        return file_path
+
+    results = {scan_id: {"ReportId": None, "FilePath": None, "ErrorMessage": None} for scan_id in scan_ids}
+    deadline = time.time() + timeout if timeout is not None else None
+    interval = poll_interval
+    next_poll = time.time() + interval
+    is_timed_out = False
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    poll_executor = ThreadPoolExecutor(max_workers=POLL_WORKERS)
+    try:
+        report_requests = {executor.submit(request_report, scan_id): scan_id for scan_id in results}
+        downloads = {}
+        generating = {}
+        while report_requests or generating or downloads:
+            for future in [future for future in report_requests if future.done()]:
+                scan_id = report_requests.pop(future)
+                try:
+                    response = future.result()
+                except Exception as error:
+                    results[scan_id]["ErrorMessage"] = str(error)
+                    continue
+                if not response["IsSuccesfull"]:
+                    results[scan_id]["ErrorMessage"] = response["ErrorMessage"]
+                    continue
+                results[scan_id]["ReportId"] = response["ID"]
+                generating[response["ID"]] = scan_id
+
+            is_timed_out = deadline is not None and time.time() >= deadline
+            # at the deadline the reports are polled once more, so that no report fails without being polled
+            if generating and (is_timed_out or time.time() >= next_poll):
+                is_progress = False
+                report_ids = list(generating)
+                for report_id, status in zip(report_ids, poll_executor.map(get_report_status, report_ids)):
+                    if status == "Created":
+                        scan_id = generating.pop(report_id)
+                        if is_timed_out:
+                            results[scan_id]["ErrorMessage"] = "report {} is created, but not downloaded before " \
+                                                               "the timeout".format(report_id)
+                        else:
+                            downloads[executor.submit(download_report, report_id, scan_id)] = scan_id
+                        is_progress = True
+                    elif status == "Failed":
+                        results[generating.pop(report_id)]["ErrorMessage"] = "report generation failed"
+                        is_progress = True
+                interval = poll_interval if is_progress else min(interval * 2, max_poll_interval)
+                next_poll = time.time() + interval
+
+            for future in [future for future in downloads if future.done()]:
+                scan_id = downloads.pop(future)
+                try:
+                    results[scan_id]["FilePath"] = future.result()
+                except Exception as error:
+                    results[scan_id]["ErrorMessage"] = str(error)
+
+            if is_timed_out:
+                for future, scan_id in report_requests.items():
+                    future.cancel()
+                    results[scan_id]["ErrorMessage"] = "the report is not requested before the timeout"
+                for report_id, scan_id in generating.items():
+                    results[scan_id]["ErrorMessage"] = "report {} is not created before the timeout".format(report_id)
+                for future, scan_id in downloads.items():
+                    future.cancel()
+                    results[scan_id]["ErrorMessage"] = "report {} is not downloaded before the timeout".format(
+                        results[scan_id]["ReportId"]
+                    )
+                break
+
+            # wake up for the next status poll, at the deadline, or as soon as a report is requested or written
+            now = time.time()
+            wait_seconds = max(next_poll - now, 0) if generating else None
+            if deadline is not None:
+                until_deadline = max(deadline - now, 0)
+                wait_seconds = until_deadline if wait_seconds is None else min(wait_seconds, until_deadline)
+            futures = list(report_requests) + list(downloads)
+            if futures:
+                wait(futures, timeout=wait_seconds, return_when=FIRST_COMPLETED)
+            elif wait_seconds:
+                time.sleep(wait_seconds)
+    finally:
+        # after a timeout, the requests and downloads that are still running are not waited for
+        executor.shutdown(wait=not is_timed_out)
+        poll_executor.shutdown(wait=not is_timed_out)
+        session.close()
+    return results
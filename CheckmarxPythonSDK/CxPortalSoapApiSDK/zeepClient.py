@@ -1,8 +1,13 @@
 # encoding: utf-8
+import threading
+from contextlib import contextmanager
+
+from lxml import etree
 from requests import Session
 from zeep import Client, Settings
 from zeep.transports import Transport
 
+from ..compat import OK
 from ..config import config
 from . import authHeaders
 
@@ -32,11 +37,107 @@ def get_client_and_factory(relative_web_interface_url):
     return client, factory
 
 
+_thread_local = threading.local()
+
+
+def get_cached_client_and_factory(relative_web_interface_url):
+    """
+    like get_client_and_factory, but the client is built once per thread and web interface,
+    so that many calls in a row do not download and parse the WSDL again.
+    The client sends the current auth headers, also after they are updated.
+
+    Returns:
+        tuple: (client, factory)
+    """
+    clients = getattr(_thread_local, "clients", None)
+    if clients is None:
+        clients = _thread_local.clients = {}
+    if relative_web_interface_url not in clients:
+        clients[relative_web_interface_url] = get_client_and_factory(relative_web_interface_url)
+    return clients[relative_web_interface_url]
+
+
+def _get_port(client):
+    # the port client.service is bound to: the first port of the first service
+    service = next(iter(client.wsdl.services.values()))
+    return next(iter(service.ports.values()))
+
+
+def create_soap_envelope(relative_web_interface_url, operation_name, **kwargs):
+    """
+    the SOAP envelope zeep sends for an operation
+
+    Args:
+        relative_web_interface_url (str):
+        operation_name (str): e.g. "GetSourceCodeForScan"
+        **kwargs: the arguments of the operation
+
+    Returns:
+        bytes
+    """
+    client, factory = get_cached_client_and_factory(relative_web_interface_url=relative_web_interface_url)
+    return etree.tostring(client.create_message(client.service, operation_name, **kwargs))
+
+
+@contextmanager
+def post_soap_stream(relative_web_interface_url, operation_name, body=None, **kwargs):
+    """
+    send a SOAP request over the session of the zeep client, and read the response as it arrives
+    instead of letting zeep load and parse it at once, for the operations with large requests or responses
+
+    Args:
+        relative_web_interface_url (str):
+        operation_name (str): e.g. "GetSourceCodeForScan"
+        body (bytes or file-like, optional): the SOAP envelope, see create_soap_envelope,
+            built from kwargs if not given
+        **kwargs: the arguments of the operation
+
+    Yields:
+        file-like: the response body
+
+    Raises:
+        ValueError: when the HTTP status of the response is not OK, e.g. a SOAP fault or an error page
+    """
+    client, factory = get_cached_client_and_factory(relative_web_interface_url=relative_web_interface_url)
+    port = _get_port(client)
+    if body is None:
+        body = create_soap_envelope(relative_web_interface_url, operation_name, **kwargs)
+    headers = {
+        "Content-Type": "text/xml; charset=utf-8",
+        "SOAPAction": '"{}"'.format(port.binding.get(operation_name).soapaction),
+    }
+    headers.update(authHeaders.auth_headers)
+    response = client.transport.session.post(url=port.binding_options["address"], data=body, headers=headers,
+                                             stream=True, verify=config.get("verify"))
+    try:
+        if response.status_code != OK:
+            raise ValueError("HttpStatusCode: {}, ErrorMessage: {}".format(response.status_code, response.text))
+        response.raw.decode_content = True
+        yield response.raw
+    finally:
+        response.close()
+
+
+def is_invalid_token(response):
+    """
+
+    Args:
+        response: a zeep response, or a dict with "IsSuccesfull" and "ErrorMessage"
+
+    Returns:
+        bool
+    """
+    error_message = response["ErrorMessage"] or ""
+    # in 9.2 and previous version message id "12563" means invalid token,
+    # from 9.3, it says Invalid_Token in error message
+    return not response["IsSuccesfull"] and ('12563' in error_message or 'Invalid_Token' in error_message)
+
+
 def retry_when_unauthorized(func):
     """
 
     Args:
-        func (function)
+        func (function): returns a zeep response, or a dict with "IsSuccesfull" and "ErrorMessage"
 
     Returns:
         function
@@ -47,13 +148,10 @@ def retry_when_unauthorized(func):
         response = func(*args, **kwargs)
 
         while max_try > 0:
-            if response.IsSuccesfull:
+            if response["IsSuccesfull"]:
                 break
 
-            # in 9.2 and previous version message id "12563" means invalid token,
-            # from 9.3, it says Invalid_Token in error message
-            if not response.IsSuccesfull and \
-                    ('12563' in response.ErrorMessage or 'Invalid_Token' in response.ErrorMessage):
+            if is_invalid_token(response):
                 authHeaders.update_auth_headers()
                 response = func(*args, **kwargs)
             max_try -= 1
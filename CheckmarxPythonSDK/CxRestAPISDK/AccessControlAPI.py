@@ -9,6 +9,7 @@ from requests_toolbelt import MultipartEncoder
 
 from ..compat import OK, BAD_REQUEST, NOT_FOUND, UNAUTHORIZED, FORBIDDEN, NO_CONTENT, CREATED
 from ..config import config
+from ..directoryCache import directory_cache, first_wins
 
 from . import authHeaders
 from .exceptions.CxError import BadRequestError, NotFoundError, CxError
@@ -19,6 +20,12 @@ from .accesscontrol.dto import (
 )
 
 
+# the first team or user with a name is the one found, as in the lookups without the cache
+TEAM_INDEXES = {"full_name": first_wins(lambda team: team.full_name), "id": lambda team: team.id}
+USER_INDEXES = {"username": first_wins(lambda user: user.username), "id": lambda user: user.id}
+ROLE_INDEXES = {"name": lambda role: role.name, "id": lambda role: role.id}
+
+
 class AccessControlAPI(object):
 
     def __init__(self):
@@ -1720,8 +1727,6 @@ class AccessControlAPI(object):
             int, list of int
         """
 
-        all_roles = self.get_all_roles()
-
         if isinstance(name, str):
             names = [name]
         elif isinstance(name, list):
@@ -1729,7 +1734,8 @@ class AccessControlAPI(object):
         else:
             return None
 
-        roles = [item for item in all_roles if item.name in names]
+        roles_by_name = directory_cache.get_index("roles", "name", self.get_all_roles, ROLE_INDEXES)
+        roles = [roles_by_name[item] for item in names if item in roles_by_name]
 
         if not roles:
             return None
@@ -1769,6 +1775,7 @@ class AccessControlAPI(object):
 
         if r.status_code == CREATED:
             is_successful = True
+            directory_cache.invalidate("roles")
         elif r.status_code == FORBIDDEN:
             raise CxError("Forbidden to access", r.status_code)
         elif r.status_code == BAD_REQUEST:
@@ -1858,6 +1865,7 @@ class AccessControlAPI(object):
 
         if r.status_code == NO_CONTENT:
             is_successful = True
+            directory_cache.invalidate("roles")
         elif r.status_code == FORBIDDEN:
             raise CxError("Forbidden to access", r.status_code)
         elif r.status_code == BAD_REQUEST:
@@ -1893,6 +1901,7 @@ class AccessControlAPI(object):
 
         if r.status_code == NO_CONTENT:
             is_successful = True
+            directory_cache.invalidate("roles")
         elif r.status_code == FORBIDDEN:
             raise CxError("Forbidden to access", r.status_code)
         elif r.status_code == BAD_REQUEST:
@@ -2816,6 +2825,7 @@ class AccessControlAPI(object):
 
         if r.status_code == NO_CONTENT:
             is_successful = True
+            directory_cache.invalidate("users")
         elif r.status_code == FORBIDDEN:
             raise CxError("Forbidden to access", r.status_code)
         elif r.status_code == BAD_REQUEST:
@@ -2855,6 +2865,7 @@ class AccessControlAPI(object):
 
         if r.status_code == NO_CONTENT:
             is_successful = True
+            directory_cache.invalidate("users")
         elif r.status_code == FORBIDDEN:
             raise CxError("Forbidden to access", r.status_code)
         elif r.status_code == BAD_REQUEST:
@@ -2892,6 +2903,7 @@ class AccessControlAPI(object):
 
         if r.status_code == NO_CONTENT:
             is_successful = True
+            directory_cache.invalidate("users")
         elif r.status_code == FORBIDDEN:
             raise CxError("Forbidden to access", r.status_code)
         elif r.status_code == BAD_REQUEST:
@@ -2960,11 +2972,9 @@ class AccessControlAPI(object):
         """
         team_id = None
 
-        all_teams = self.get_all_teams()
-
-        team = [item for item in all_teams if item.full_name == full_name]
+        team = directory_cache.lookup("teams", "full_name", full_name, self.get_all_teams, TEAM_INDEXES)
         if team:
-            team_id = team[0].id
+            team_id = team.id
 
         return team_id
 
@@ -2995,6 +3005,7 @@ class AccessControlAPI(object):
 
         if r.status_code == CREATED:
             is_successful = True
+            directory_cache.invalidate("teams", "cx_teams")
         elif r.status_code == FORBIDDEN:
             raise CxError("Forbidden to access", r.status_code)
         elif r.status_code == BAD_REQUEST:
@@ -3082,6 +3093,7 @@ class AccessControlAPI(object):
 
         if r.status_code == NO_CONTENT:
             is_successful = True
+            directory_cache.invalidate("teams", "cx_teams")
         elif r.status_code == FORBIDDEN:
             raise CxError("Forbidden to access", r.status_code)
         elif r.status_code == BAD_REQUEST:
@@ -3118,6 +3130,7 @@ class AccessControlAPI(object):
 
         if r.status_code == NO_CONTENT:
             is_successful = True
+            directory_cache.invalidate("teams", "cx_teams")
         elif r.status_code == FORBIDDEN:
             raise CxError("Forbidden to access", r.status_code)
         elif r.status_code == BAD_REQUEST:
@@ -3278,10 +3291,9 @@ class AccessControlAPI(object):
         """
         user_id = None
 
-        all_users = self.get_all_users()
-        user = [item for item in all_users if item.username == username]
+        user = directory_cache.lookup("users", "username", username, self.get_all_users, USER_INDEXES)
         if user:
-            user_id = user[0].id
+            user_id = user.id
 
         return user_id
 
@@ -3344,6 +3356,7 @@ class AccessControlAPI(object):
 
         if r.status_code == CREATED:
             is_successful = True
+            directory_cache.invalidate("users")
         elif r.status_code == FORBIDDEN:
             raise CxError("Forbidden to access", r.status_code)
         elif r.status_code == BAD_REQUEST:
@@ -3473,6 +3486,7 @@ class AccessControlAPI(object):
 
         if r.status_code == NO_CONTENT:
             is_successful = True
+            directory_cache.invalidate("users")
         elif r.status_code == FORBIDDEN:
             raise CxError("Forbidden to access", r.status_code)
         elif r.status_code == BAD_REQUEST:
@@ -3512,6 +3526,7 @@ class AccessControlAPI(object):
 
         if r.status_code == NO_CONTENT:
             is_successful = True
+            directory_cache.invalidate("users")
         elif r.status_code == FORBIDDEN:
             raise CxError("Forbidden to access", r.status_code)
         elif r.status_code == BAD_REQUEST:
@@ -3566,6 +3581,7 @@ class AccessControlAPI(object):
 
         if r.status_code == CREATED:
             is_successful = True
+            directory_cache.invalidate("users")
         elif r.status_code == FORBIDDEN:
             raise CxError("Forbidden to access", r.status_code)
         elif r.status_code == BAD_REQUEST:
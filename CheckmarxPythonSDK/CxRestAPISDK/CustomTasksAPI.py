@@ -3,12 +3,15 @@ import requests
 
 from ..compat import OK, BAD_REQUEST, NOT_FOUND, UNAUTHORIZED
 from ..config import config
+from ..directoryCache import directory_cache
 
 from . import authHeaders
 from .exceptions.CxError import BadRequestError, NotFoundError, CxError
 from .sast.projects.dto import CxCustomTask
 from .sast.projects.dto import CxLink
 
+CUSTOM_TASK_INDEXES = {"name": lambda task: task.name, "id": lambda task: task.id}
+
 
 class CustomTasksAPI(object):
     """
@@ -80,11 +83,9 @@ class CustomTasksAPI(object):
         Returns:
             int: custom task id
         """
-        custom_tasks = self.get_all_custom_tasks()
-        a_dict = {
-            item.name: item.id for item in custom_tasks
-        }
-        return a_dict.get(task_name)
+        custom_task = directory_cache.lookup("custom_tasks", "name", task_name, self.get_all_custom_tasks,
+                                             CUSTOM_TASK_INDEXES)
+        return custom_task.id if custom_task else None
 
     def get_custom_task_by_id(self, task_id, api_version="1.0"):
         """
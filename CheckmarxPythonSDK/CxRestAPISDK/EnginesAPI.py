@@ -4,12 +4,18 @@ import requests
 
 from ..compat import OK, BAD_REQUEST, NOT_FOUND, UNAUTHORIZED, NO_CONTENT, CREATED
 from ..config import config
+from ..directoryCache import directory_cache
 
 from . import authHeaders
 from .exceptions.CxError import BadRequestError, NotFoundError, CxError
 from .sast.projects.dto import CxLink
 from .sast.engines.dto import (CxRegisterEngineRequestBody, CxEngineServer, CxEngineConfiguration, CxEngineServerStatus)
 
+ENGINE_CONFIGURATION_INDEXES = {
+    "name": lambda engine_configuration: engine_configuration.name,
+    "id": lambda engine_configuration: engine_configuration.id
+}
+
 
 class EnginesAPI(object):
     """
@@ -431,9 +437,10 @@ class EnginesAPI(object):
         Returns:
             int: engine configuration id
         """
-        all_engine_configurations = self.get_all_engine_configurations()
-        a_dict = {item.name: item.id for item in all_engine_configurations}
-        return a_dict.get(engine_configuration_name)
+        engine_configuration = directory_cache.lookup("engine_configurations", "name", engine_configuration_name,
+                                                      self.get_all_engine_configurations,
+                                                      ENGINE_CONFIGURATION_INDEXES)
+        return engine_configuration.id if engine_configuration else None
 
     def get_engine_configuration_by_id(self, configuration_id, api_version="1.0"):
         """
@@ -3,6 +3,8 @@ import os
 import requests
 import copy
 
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from requests_toolbelt import MultipartEncoder
 
 from ..compat import OK, BAD_REQUEST, NOT_FOUND, UNAUTHORIZED, ACCEPTED
@@ -25,6 +27,51 @@ class OsaAPI(object):
     def __init__(self):
         self.retry = 0
 
+    @staticmethod
+    def __iter_pages(get_page, items_per_page, prefetch):
+        """
+        yield the items of page 1, 2, 3 ... until a page has less than items_per_page items.
+
+        The OSA API does not return the total count, so with prefetch the following pages are requested
+        speculatively, the pages beyond the last one come back empty and are discarded.
+
+        Args:
+            get_page (function): page (int) -> list
+            items_per_page (int):
+            prefetch (int): number of pages requested concurrently, 0 or 1 to request one page at a time
+
+        Returns:
+            generator
+        """
+        if not prefetch or prefetch < 2:
+            page = 1
+            while True:
+                items = get_page(page)
+                for item in items:
+                    yield item
+                if len(items) < items_per_page:
+                    return
+                page += 1
+
+        executor = ThreadPoolExecutor(max_workers=prefetch)
+        futures = deque()
+        next_page = 1
+        try:
+            while True:
+                while len(futures) < prefetch:
+                    futures.append(executor.submit(get_page, next_page))
+                    next_page += 1
+                items = futures.popleft().result()
+                for item in items:
+                    yield item
+                if len(items) < items_per_page:
+                    return
+        finally:
+            # stop requesting pages when the last page is reached, or the caller stops iterating
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+
     def get_all_osa_scan_details_for_project(self, project_id=None, page=1, items_per_page=100, api_version="1.0"):
         """
         Get basic scan details for all CxOSA scans associated with a specified project Id.
@@ -83,12 +130,35 @@ class OsaAPI(object):
         elif (r.status_code == UNAUTHORIZED) and (self.retry < config.get("max_try")):
             authHeaders.update_auth_headers()
             self.retry += 1
-            osa_scan_details = self.get_all_osa_scan_details_for_project(project_id, api_version=api_version)
+            osa_scan_details = self.get_all_osa_scan_details_for_project(project_id, page, items_per_page,
+                                                                         api_version=api_version)
         else:
             raise CxError(r.text, r.status_code)
 
+        self.retry = 0
+
         return osa_scan_details
 
+    def iter_all_osa_scan_details_for_project(self, project_id=None, items_per_page=100, prefetch=0,
+                                              api_version="1.0"):
+        """
+        Iterate over the scan details of all CxOSA scans of a project, page by page.
+
+        Args:
+            project_id (int): Unique Id of the project
+            items_per_page (int, optional): Number of items per page (default 100)
+            prefetch (int, optional): number of pages requested concurrently (default 0, one page at a time)
+            api_version (str, optional):
+
+        Returns:
+            generator of :obj:`CxOsaScanDetail`
+        """
+        def get_page(page):
+            return OsaAPI().get_all_osa_scan_details_for_project(project_id, page, items_per_page,
+                                                                 api_version=api_version)
+
+        return self.__iter_pages(get_page, items_per_page, prefetch)
+
     def get_last_osa_scan_id_of_a_project(self, project_id, succeeded=True):
         """
 
@@ -102,7 +172,7 @@ class OsaAPI(object):
         osa_scan_id = None
 
         if project_id:
-            all_osa_scan_details = self.get_all_osa_scan_details_for_project(project_id)
+            all_osa_scan_details = list(self.iter_all_osa_scan_details_for_project(project_id))
 
             if all_osa_scan_details and len(all_osa_scan_details) > 0:
                 if succeeded:
@@ -399,12 +469,33 @@ class OsaAPI(object):
         elif (r.status_code == UNAUTHORIZED) and (self.retry < config.get("max_try")):
             authHeaders.update_auth_headers()
             self.retry += 1
-            libraries = self.get_osa_scan_libraries(scan_id, api_version=api_version)
+            libraries = self.get_osa_scan_libraries(scan_id, page, items_per_page, api_version=api_version)
         else:
             raise CxError(r.text, r.status_code)
 
+        self.retry = 0
+
         return libraries
 
+    def iter_osa_scan_libraries(self, scan_id, items_per_page=100, prefetch=0, api_version="1.0"):
+        """
+        Iterate over all the used libraries of a CxOSA scan, page by page.
+        Stop iterating to stop requesting further pages.
+
+        Args:
+            scan_id (str): Unique Id of the OSA scan
+            items_per_page (int, optional): Number of items per page (default 100)
+            prefetch (int, optional): number of pages requested concurrently (default 0, one page at a time)
+            api_version (str, optional):
+
+        Returns:
+            generator of :obj:`CxOsaLibrary`
+        """
+        def get_page(page):
+            return OsaAPI().get_osa_scan_libraries(scan_id, page, items_per_page, api_version=api_version)
+
+        return self.__iter_pages(get_page, items_per_page, prefetch)
+
     def get_osa_scan_vulnerabilities_by_id(self, scan_id, page=1, items_per_page=100, library_id=None,
                                            state_id=None, comment=None, since=None, until=None, api_version="1.0"):
         """
@@ -494,13 +585,42 @@ class OsaAPI(object):
         elif (r.status_code == UNAUTHORIZED) and (self.retry < config.get("max_try")):
             authHeaders.update_auth_headers()
             self.retry += 1
-            vulnerabilities = self.get_osa_scan_vulnerabilities_by_id(scan_id, library_id, state_id, comment, since,
-                                                                      until, api_version=api_version)
+            vulnerabilities = self.get_osa_scan_vulnerabilities_by_id(scan_id, page, items_per_page, library_id,
+                                                                      state_id, comment, since, until,
+                                                                      api_version=api_version)
         else:
             raise CxError(r.text, r.status_code)
 
+        self.retry = 0
+
         return vulnerabilities
 
+    def iter_osa_scan_vulnerabilities_by_id(self, scan_id, items_per_page=100, library_id=None, state_id=None,
+                                            comment=None, since=None, until=None, prefetch=0, api_version="1.0"):
+        """
+        Iterate over all the vulnerabilities of a CxOSA scan, page by page.
+        Stop iterating to stop requesting further pages.
+
+        Args:
+            scan_id (str): Unique Id of the OSA scan
+            items_per_page (int, optional): Number of items per page (default 100)
+            library_id (str, optional): Filter by Library Id(s)
+            state_id (int, optional):  Filter by State Id(s)
+            comment (str, optional): Filter by Comment text
+            since (long, optional): Filter by start time (not earlier than timestamp value)
+            until (long, optional): Filter by end time (not later than timestamp value)
+            prefetch (int, optional): number of pages requested concurrently (default 0, one page at a time)
+            api_version (str, optional):
+
+        Returns:
+            generator of :obj:`CxOsaVulnerability`
+        """
+        def get_page(page):
+            return OsaAPI().get_osa_scan_vulnerabilities_by_id(scan_id, page, items_per_page, library_id, state_id,
+                                                               comment, since, until, api_version=api_version)
+
+        return self.__iter_pages(get_page, items_per_page, prefetch)
+
     def get_first_vulnerability_id(self, scan_id):
         """
 
@@ -511,7 +631,7 @@ class OsaAPI(object):
             str: vulnerability id
         """
         vulnerability_id = None
-        vulnerabilities = self.get_osa_scan_vulnerabilities_by_id(scan_id)
+        vulnerabilities = self.get_osa_scan_vulnerabilities_by_id(scan_id, page=1, items_per_page=1)
         if vulnerabilities and len(vulnerabilities):
             vulnerability_id = vulnerabilities[0].id
         return vulnerability_id
@@ -9,6 +9,7 @@ from requests_toolbelt import MultipartEncoder
 
 from ..compat import OK, BAD_REQUEST, NOT_FOUND, UNAUTHORIZED, CREATED, ACCEPTED, NO_CONTENT
 from ..config import config
+from ..directoryCache import directory_cache
 
 from . import authHeaders
 from .TeamAPI import TeamAPI
@@ -19,9 +20,16 @@ from .sast.projects.dto import CxUpdateProjectNameTeamIdRequest, CxCreateProject
     CxIssueTrackingSystemType, CxIssueTrackingSystemFieldAllowedValue, \
     CxCreateProjectRequest, CxIssueTrackingSystem, CxLink, CxCustomRemoteSourceSettings, \
     CxUpdateProjectRequest, CxProjectExcludeSettings, CxCredential, CxSVNSettings, CxURI, CxPerforceSettings, \
-    CxTFSSettings, CxIssueTrackingSystemJira, CxPreset
+    CxTFSSettings, CxIssueTrackingSystemJira, CxPreset, CxProject
 from .sast.projects.dto import construct_cx_project
 
+PRESET_INDEXES = {"name": lambda preset: preset.name, "id": lambda preset: preset.id}
+# team ids are str in project details and int in team details
+PROJECT_INDEXES = {
+    "team_id_and_name": lambda project: (str(project.team_id), project.name),
+    "id": lambda project: project.project_id
+}
+
 
 class ProjectsAPI(object):
     """
@@ -82,7 +90,7 @@ class ProjectsAPI(object):
         elif (r.status_code == UNAUTHORIZED) and (self.retry < config.get("max_try")):
             authHeaders.update_auth_headers()
             self.retry += 1
-            all_projects = self.get_all_project_details(api_version=api_version)
+            all_projects = self.get_all_project_details(project_name, team_id, api_version=api_version)
         else:
             raise CxError(r.text, r.status_code)
 
@@ -129,6 +137,11 @@ class ProjectsAPI(object):
                     uri=(d.get("link", {}) or {}).get("uri")
                 )
             )
+            if team_id is None:
+                directory_cache.invalidate("projects")
+            else:
+                directory_cache.put("projects", CxProject(project_id=project.id, team_id=team_id, name=project_name,
+                                                          is_public=is_public))
         elif r.status_code == BAD_REQUEST:
             raise BadRequestError(r.text)
         elif r.status_code == NOT_FOUND:
@@ -158,20 +171,70 @@ class ProjectsAPI(object):
             int: project id， if project not exists, return None
         """
 
-        project_id = None
-
         team_id = TeamAPI().get_team_id_by_team_full_name(team_full_name=team_full_name)
 
+        project = self.__get_project_by_team_id_and_name(team_id, project_name, refresh_missing=True)
+
+        return project.project_id if project else None
+
+    def __get_project_by_team_id_and_name(self, team_id, project_name, refresh_missing):
+        """
+        look up a project in the project index, which is loaded in bulk with one get_all_project_details call
+
+        Args:
+            team_id (int):
+            project_name (str):
+            refresh_missing (bool): True to ask the server for a project missing from the index,
+                                    it may have been created by others after the index was loaded
+
+        Returns:
+            :obj:`CxProject`, None
+        """
+        if team_id is None:
+            refresh_missing = True
+        else:
+            project = directory_cache.lookup("projects", "team_id_and_name", (str(team_id), project_name),
+                                             self.get_all_project_details, PROJECT_INDEXES)
+            if project or not refresh_missing:
+                return project
+
+        project = None
         try:
             all_projects = self.get_all_project_details(project_name=project_name, team_id=team_id)
 
             if all_projects and len(all_projects) == 1:
-                project_id = all_projects[0].project_id
+                project = all_projects[0]
+                directory_cache.put("projects", project)
 
         except CxError:
             pass
 
-        return project_id
+        return project
+
+    def resolve_project_ids(self, team_full_name_and_project_names, refresh_missing=False):
+        """
+        utility provided by SDK: get the project ids of many (team full name, project name) pairs.
+        all projects are loaded once into the project index, the teams are resolved through the team index.
+
+        Args:
+            team_full_name_and_project_names (:obj:`list` of :obj:`tuple`):
+                [("/CxServer/SP/Company/Users", "project_name")]
+            refresh_missing (bool): True to ask the server for each project missing from the index
+
+        Returns:
+            :obj:`list` of int: project ids in the same order, None for projects not found
+        """
+        team_api = TeamAPI()
+        project_ids = []
+        for team_full_name, project_name in team_full_name_and_project_names:
+            team_id = team_api.get_team_id_by_team_full_name(team_full_name=team_full_name)
+            if team_id is None:
+                project_ids.append(None)
+                continue
+            project = self.__get_project_by_team_id_and_name(team_id, project_name, refresh_missing)
+            project_ids.append(project.project_id if project else None)
+
+        return project_ids
 
     def get_project_details_by_id(self, project_id, api_version="2.0"):
         """
@@ -252,6 +315,7 @@ class ProjectsAPI(object):
         # In Python http module, HTTP status ACCEPTED is 202
         if r.status_code == NO_CONTENT:
             is_successful = True
+            directory_cache.invalidate("projects")
         elif r.status_code == BAD_REQUEST:
             raise BadRequestError(r.text)
         elif r.status_code == NOT_FOUND:
@@ -304,6 +368,7 @@ class ProjectsAPI(object):
         # In Python http module, HTTP status ACCEPTED is 202
         if r.status_code == NO_CONTENT:
             is_successful = True
+            directory_cache.invalidate("projects")
         elif r.status_code == BAD_REQUEST:
             raise BadRequestError(r.text)
         elif r.status_code == NOT_FOUND:
@@ -352,6 +417,7 @@ class ProjectsAPI(object):
         # In Python http module, HTTP status ACCEPTED is 202
         if r.status_code == ACCEPTED:
             is_successful = True
+            directory_cache.remove("projects", "id", project_id)
         elif r.status_code == BAD_REQUEST:
             raise BadRequestError(r.text)
         elif r.status_code == NOT_FOUND:
@@ -382,7 +448,8 @@ class ProjectsAPI(object):
         """
         team_id = TeamAPI().get_team_id_by_team_full_name(team_full_name)
 
-        project_id = self.get_project_id_by_project_name_and_team_full_name(project_name, team_full_name)
+        project = self.__get_project_by_team_id_and_name(team_id, project_name, refresh_missing=True)
+        project_id = project.project_id if project else None
 
         if not project_id:
             project = self.create_project_with_default_configuration(project_name, team_id, True)
@@ -451,6 +518,7 @@ class ProjectsAPI(object):
                     uri=(a_dict.get("link", {}) or {}).get("uri")
                 )
             )
+            directory_cache.invalidate("projects")
         elif r.status_code == BAD_REQUEST:
             raise BadRequestError(r.text)
         elif r.status_code == NOT_FOUND:
@@ -1783,9 +1851,9 @@ class ProjectsAPI(object):
         Returns:
             int: preset id
         """
-        all_presets = self.get_all_preset_details()
-        a_dict_preset_name_id = {item.name: item.id for item in all_presets}
-        return a_dict_preset_name_id.get(preset_name)
+        preset = directory_cache.lookup("presets", "name", preset_name, self.get_all_preset_details,
+                                        PRESET_INDEXES)
+        return preset.id if preset else None
 
     def get_preset_details_by_preset_id(self, preset_id, api_version="1.0"):
         """
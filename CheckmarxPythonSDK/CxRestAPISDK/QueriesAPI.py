@@ -2,6 +2,7 @@
 import os
 import json
 import copy
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 
@@ -12,6 +13,8 @@ from ..config import config
 
 from . import authHeaders
 from .TeamAPI import TeamAPI
+from .pooledSession import get_pooled_session, session_get
+from .queryDescriptionCache import get_query_description_cache
 from .exceptions.CxError import BadRequestError, NotFoundError, CxError
 
 
@@ -60,4 +63,109 @@ class QueriesAPI(object):
 
         return description
 
+    def get_cached_full_description_of_the_query(self, query_id, api_version="3.0"):
+        """
+        like get_the_full_description_of_the_query, but the description is kept in the query description cache,
+        see get_query_description_cache, and only requested from the server the first time
+
+        Args:
+            query_id (int):
+            api_version (str, optional):
 
+        Returns:
+            str
+
+        Raises:
+            BadRequestError
+            NotFoundError
+            CxError
+        """
+        query_description_cache = get_query_description_cache()
+        missing = object()
+        description = query_description_cache.get(query_id, default=missing)
+        if description is missing:
+            description = self.get_the_full_description_of_the_query(query_id, api_version=api_version)
+            query_description_cache.put(query_id, description)
+        return description
+
+    @staticmethod
+    def get_full_descriptions_of_queries(query_ids, max_workers=4, api_version="3.0"):
+        """
+        get the full descriptions of many queries, from the query description cache, and concurrently from the
+        server for the queries that are not cached yet, which are then cached. When some of the requests fail,
+        the descriptions that were fetched are still cached before the error of the first failed query is raised
+
+        Args:
+            query_ids (iterable of int):
+            max_workers (int, optional): the maximum number of concurrent requests
+            api_version (str, optional):
+
+        Returns:
+            dict: {query_id: description}
+
+        Raises:
+            BadRequestError
+            NotFoundError
+            CxError
+        """
+        query_description_cache = get_query_description_cache()
+        descriptions = {}
+        missing_query_ids = []
+        missing = object()
+        for query_id in set(query_ids):
+            description = query_description_cache.get(query_id, default=missing)
+            if description is missing:
+                missing_query_ids.append(query_id)
+            else:
+                descriptions[query_id] = description
+        if not missing_query_ids:
+            return descriptions
+
+        url = config.get("base_url") + "/cxrestapi/queries/{queryid}/cxDescription"
+        session = get_pooled_session(pool_size=max_workers)
+
+        def fetch(query_id):
+            try:
+                response = session_get(session, url.format(queryid=query_id), api_version=api_version)
+            except Exception as error:
+                return query_id, None, error
+            return query_id, response.json(), None
+
+        fetched_descriptions = {}
+        errors = []
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for query_id, description, error in executor.map(fetch, missing_query_ids):
+                    if error is None:
+                        fetched_descriptions[query_id] = description
+                    else:
+                        errors.append(error)
+        finally:
+            session.close()
+        query_description_cache.put_many(fetched_descriptions)
+        if errors:
+            raise errors[0]
+        descriptions.update(fetched_descriptions)
+        return descriptions
+
+    def get_full_descriptions_of_queries_of_a_scan(self, scan_id, max_workers=4, api_version="3.0"):
+        """
+        prefetch the full descriptions of all the distinct queries that have results in a scan,
+        see get_full_descriptions_of_queries
+
+        Args:
+            scan_id (int):
+            max_workers (int, optional):
+            api_version (str, optional):
+
+        Returns:
+            dict: {query_id: description}
+        """
+        from ..CxODataApiSDK.HttpRequests import get_request
+
+        results = get_request(relative_url="/Cxwebinterface/odata/v1/Scans({id})/Results?$select=QueryId".format(
+            id=scan_id
+        ))
+        return self.get_full_descriptions_of_queries(
+            (result.get("QueryId") for result in results), max_workers=max_workers, api_version=api_version
+        )
@@ -4,12 +4,15 @@ import copy
 import requests
 import json
 
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
 from requests_toolbelt import MultipartEncoder
 
 from ..compat import OK, BAD_REQUEST, NOT_FOUND, UNAUTHORIZED, CREATED, NO_CONTENT, ACCEPTED
 from ..config import config
 
 from . import authHeaders
+from .pooledSession import get_pooled_session, session_get
 from .exceptions.CxError import BadRequestError, NotFoundError, CxError
 from .sast.projects.dto import CxLink, CxProject, CxPreset
 from .sast.engines.dto import CxEngineServer, CxEngineConfiguration
@@ -1338,6 +1341,53 @@ class ScansAPI(object):
 
         return attack_vectors
 
+    @staticmethod
+    def get_scan_results_of_queries(scan_id, query_version_codes, max_workers=4, deduplicate_nodes=False,
+                                    api_version="1.0"):
+        """
+        Get the scan results of many queries of a scan in Attack Vector format.
+        The queries are fetched concurrently over one pooled session, with at most max_workers requests in flight,
+        and the attack vectors are constructed and yielded as each response arrives.
+
+        Args:
+            scan_id (int):
+            query_version_codes (`list` of int):
+            max_workers (int, optional): the maximum number of concurrent requests
+            deduplicate_nodes (bool, optional): True to share identical nodes between attack vectors to save memory
+            api_version (str, optional):
+
+        Returns:
+            generator of (int, `CxScanResultAttackVector`): (query_version_code, attack_vector)
+
+        Raises:
+            BadRequestError
+            NotFoundError
+            CxError
+        """
+        url = config.get("base_url") + ("/cxrestapi/sast/results/attack-vectors"
+                                        "?scanId={scanId}&queryVersion={queryVersion}")
+        node_cache = {} if deduplicate_nodes else None
+        query_version_codes = iter(query_version_codes)
+        session = get_pooled_session(pool_size=max_workers)
+
+        def fetch(query_version_code):
+            r = session_get(session, url.format(scanId=scan_id, queryVersion=query_version_code),
+                            api_version=api_version)
+            return query_version_code, r.json().get('attackVectors')
+
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                pending = {executor.submit(fetch, code) for code in islice(query_version_codes, max_workers)}
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    pending.update(executor.submit(fetch, code) for code in islice(query_version_codes, len(done)))
+                    for future in done:
+                        query_version_code, vectors = future.result()
+                        for ac in vectors:
+                            yield query_version_code, construct_attack_vector(ac, node_cache=node_cache)
+        finally:
+            session.close()
+
     def get_scan_results_for_a_specific_query_group_by_best_fix_location(self, scan_id, query_version_code,
                                                                          api_version="1.0"):
         """
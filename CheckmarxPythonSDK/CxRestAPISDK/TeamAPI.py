@@ -4,11 +4,14 @@ import requests
 
 from ..compat import OK, BAD_REQUEST, NOT_FOUND, UNAUTHORIZED, CREATED
 from ..config import config
+from ..directoryCache import directory_cache
 
 from . import authHeaders
 from .exceptions.CxError import BadRequestError, NotFoundError, CxError
 from .team.dto import CxTeam, CxCreateTeamRequest
 
+CX_TEAM_INDEXES = {"full_name": lambda team: team.full_name, "id": lambda team: team.team_id}
+
 
 class TeamAPI(object):
     """
@@ -70,14 +73,10 @@ class TeamAPI(object):
         Returns:
             int: the team id for the team full name
         """
-        all_teams = self.get_all_teams()
-
-        # construct a dict of {team_full_name: team_id}
-        team_full_name_id_dict = {item.full_name: item.team_id for item in all_teams}
+        team = directory_cache.lookup("cx_teams", "full_name", team_full_name.replace("\\", "/"),
+                                      self.get_all_teams, CX_TEAM_INDEXES)
 
-        team_id = team_full_name_id_dict.get(team_full_name.replace("\\", "/"))
-
-        return team_id
+        return team.team_id if team else None
 
     def get_team_full_name_by_team_id(self, team_id):
         """
@@ -90,12 +89,9 @@ class TeamAPI(object):
             str: team full name, "/CxServer/SP/Company/Users"
 
         """
-        all_teams = self.get_all_teams()
-
-        # construct a dict of team_id: team_full_name
-        team_id_team_full_name_dict = {item.team_id: item.full_name for item in all_teams}
+        team = directory_cache.lookup("cx_teams", "id", team_id, self.get_all_teams, CX_TEAM_INDEXES)
 
-        return team_id_team_full_name_dict.get(team_id)
+        return team.full_name if team else None
 
     def create_team(self, team_name, parent_id):
         """
@@ -128,6 +124,7 @@ class TeamAPI(object):
             location = r.headers['Location']
             parts = location.split('/')
             team_id = int(parts[-1])
+            directory_cache.invalidate("teams", "cx_teams")
             return team_id
         elif r.status_code == BAD_REQUEST:
             raise BadRequestError(r.text)
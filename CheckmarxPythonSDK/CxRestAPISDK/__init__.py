@@ -20,3 +20,5 @@ from .exceptions.CxError import (BadRequestError, NotFoundError, CxError)
 from .AccessControlAPI import AccessControlAPI
 from .ConfigurationAPI import ConfigurationAPI
 from .QueriesAPI import QueriesAPI
+from .queryDescriptionCache import QueryDescriptionCache, get_query_description_cache
+from ..directoryCache import directory_cache
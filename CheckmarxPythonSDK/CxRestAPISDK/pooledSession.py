@@ -0,0 +1,64 @@
+# encoding: utf-8
+import requests
+
+from requests.adapters import HTTPAdapter
+
+from ..compat import OK, BAD_REQUEST, NOT_FOUND, UNAUTHORIZED
+from ..config import config
+
+from . import authHeaders
+from .exceptions.CxError import BadRequestError, NotFoundError, CxError
+
+
+def get_pooled_session(pool_size=10):
+    """
+    a requests Session that keeps up to pool_size connections alive to the CxSAST server,
+    so that concurrent requests from a thread pool reuse connections instead of opening new ones
+
+    Args:
+        pool_size (int):
+
+    Returns:
+        :obj:`requests.Session`
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.verify = config.get("verify")
+    return session
+
+
+def session_get(session, url, api_version="1.0"):
+    """
+    HTTP GET with a pooled session. Unlike the API classes it keeps no retry state on an instance,
+    so it is safe to call from many threads at once.
+
+    Args:
+        session (:obj:`requests.Session`):
+        url (str):
+        api_version (str, optional):
+
+    Returns:
+        :obj:`requests.Response`
+
+    Raises:
+        BadRequestError
+        NotFoundError
+        CxError
+    """
+    r = session.get(url=url, headers=authHeaders.get_headers(api_version=api_version))
+    retry = 0
+    while (r.status_code == UNAUTHORIZED) and (retry < config.get("max_try")):
+        authHeaders.update_auth_headers()
+        retry += 1
+        r = session.get(url=url, headers=authHeaders.get_headers(api_version=api_version))
+
+    if r.status_code == OK:
+        return r
+    elif r.status_code == BAD_REQUEST:
+        raise BadRequestError(r.text)
+    elif r.status_code == NOT_FOUND:
+        raise NotFoundError()
+    else:
+        raise CxError(r.text, r.status_code)
@@ -0,0 +1,131 @@
+# encoding: utf-8
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from ..config import config
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+class QueryDescriptionCache(object):
+    """
+    the full descriptions of queries (see QueriesAPI.get_the_full_description_of_the_query) of one server version,
+    kept in an in-memory LRU of max_size descriptions in front of a SQLite file.
+
+    Query descriptions only change with the content pack of the server, so the cache is keyed by
+    (server, server version, query id) and shared by all the processes that use the same file.
+    """
+
+    def __init__(self, server_key, db_path=None, max_size=1024):
+        """
+
+        Args:
+            server_key (str): identifies the server and its version, e.g. "https://cxsast|9.3.0.1084"
+            db_path (str, optional): default ~/.Checkmarx/query_descriptions.sqlite
+            max_size (int, optional): number of descriptions kept in memory
+        """
+        if db_path is None:
+            db_path = os.path.join(os.path.expanduser("~"), ".Checkmarx", "query_descriptions.sqlite")
+        directory = os.path.dirname(db_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.server_key = server_key
+        self.db_path = db_path
+        self.max_size = max_size
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS descriptions "
+                "(server_key TEXT NOT NULL, query_id INTEGER NOT NULL, description TEXT, "
+                "PRIMARY KEY (server_key, query_id))"
+            )
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def __remember(self, query_id, description):
+        # re-inserted items move to the end, the least recently used item is the first
+        self._lru.pop(query_id, None)
+        self._lru[query_id] = description
+        while len(self._lru) > self.max_size:
+            self._lru.popitem(last=False)
+
+    def get(self, query_id, default=None):
+        """
+
+        Args:
+            query_id (int):
+            default (optional): returned if the description is not cached, so that a cached None description
+                can be told apart from a missing one
+
+        Returns:
+            the description as returned by the server, or default if it is not cached
+        """
+        with self._lock:
+            if query_id in self._lru:
+                description = self._lru[query_id]
+                self.__remember(query_id, description)
+                return description
+            row = self._connection.execute(
+                "SELECT description FROM descriptions WHERE server_key = ? AND query_id = ?",
+                (self.server_key, query_id)
+            ).fetchone()
+            if row is None:
+                return default
+            description = json.loads(row[0])
+            self.__remember(query_id, description)
+            return description
+
+    def put(self, query_id, description):
+        self.put_many({query_id: description})
+
+    def put_many(self, descriptions):
+        """
+
+        Args:
+            descriptions (dict): {query_id: description}
+        """
+        with self._lock:
+            with self._connection:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO descriptions (server_key, query_id, description) VALUES (?, ?, ?)",
+                    [
+                        (self.server_key, query_id, json.dumps(description))
+                        for query_id, description in descriptions.items()
+                    ]
+                )
+            for query_id, description in descriptions.items():
+                self.__remember(query_id, description)
+
+    def clear(self):
+        """
+        forget the descriptions of this server version, in memory and on disk
+        """
+        with self._lock:
+            self._lru.clear()
+            with self._connection:
+                self._connection.execute("DELETE FROM descriptions WHERE server_key = ?", (self.server_key,))
+
+
+def get_query_description_cache():
+    """
+    the query description cache of this process, for the configured server and its current version
+
+    Returns:
+        QueryDescriptionCache
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            from ..CxPortalSoapApiSDK import get_version_number
+
+            server_key = "{}|{}".format(config.get("base_url"), get_version_number().get("Version"))
+            _cache = QueryDescriptionCache(server_key)
+        return _cache
@@ -0,0 +1,54 @@
+# encoding: utf-8
+
+
+class CxScanReportResultDelta(object):
+    """
+    a result that is new, fixed or recurrent when comparing a scan report against a baseline scan report
+    """
+    NEW = "New"
+    FIXED = "Fixed"
+    RECURRENT = "Recurrent"
+
+    def __init__(self, status, query_id, similarity_id, query_name, severity, file_name, line, node_id, path_id):
+        """
+
+        Args:
+            status (str): "New", "Fixed", "Recurrent"
+            query_id (str):
+            similarity_id (str):
+            query_name (str):
+            severity (str):
+            file_name (str):
+            line (str):
+            node_id (str):
+            path_id (str):
+        """
+        self.status = status
+        self.query_id = query_id
+        self.similarity_id = similarity_id
+        self.query_name = query_name
+        self.severity = severity
+        self.file_name = file_name
+        self.line = line
+        self.node_id = node_id
+        self.path_id = path_id
+
+    def to_dict(self):
+        return {
+            "status": self.status,
+            "queryId": self.query_id,
+            "similarityId": self.similarity_id,
+            "queryName": self.query_name,
+            "severity": self.severity,
+            "fileName": self.file_name,
+            "line": self.line,
+            "nodeId": self.node_id,
+            "pathId": self.path_id,
+        }
+
+    def __str__(self):
+        return """CxScanReportResultDelta(status={}, query_id={}, similarity_id={}, query_name={}, severity={}, 
+        file_name={}, line={}, node_id={}, path_id={})""".format(
+            self.status, self.query_id, self.similarity_id, self.query_name, self.severity,
+            self.file_name, self.line, self.node_id, self.path_id
+        )
@@ -12,6 +12,34 @@ class CxScanReportXmlContent(object):
         self.tree = eT.parse(report_file_path)
         self.root = self.tree.getroot()
 
+    @staticmethod
+    def iter_results(report_file_path):
+        """
+        stream the Result elements of a report without building the whole tree.
+        each Result element is cleared after it has been yielded, so memory stays flat for large reports.
+
+        Args:
+            report_file_path (str):
+
+        Returns:
+            generator of (dict, dict, dict): (Query attributes, Result attributes, Path attributes)
+        """
+        query_attrib = {}
+        context = eT.iterparse(report_file_path, events=("start", "end"))
+        _, root = next(context)
+        for event, element in context:
+            if event == "start":
+                if element.tag == "Query":
+                    query_attrib = dict(element.attrib)
+                continue
+            if element.tag == "Result":
+                path = element.find("Path")
+                path_attrib = dict(path.attrib) if path is not None else {}
+                yield query_attrib, dict(element.attrib), path_attrib
+                element.clear()
+            elif element.tag == "Query":
+                root.remove(element)
+
     def filter_by_severity(self, high=False, medium=False, low=False, info=False):
         """
         filter at Query level
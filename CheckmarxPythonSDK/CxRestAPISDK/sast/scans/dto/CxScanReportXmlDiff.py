@@ -0,0 +1,122 @@
+# encoding: utf-8
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .CxScanReportXmlContent import CxScanReportXmlContent
+from .CxScanReportResultDelta import CxScanReportResultDelta
+
+
+def _iter_keyed_results(report_file_path):
+    """
+    stream a report as ((QueryId, SimilarityId), slim result tuple) pairs
+
+    Args:
+        report_file_path (str):
+
+    Returns:
+        generator of (tuple, tuple)
+    """
+    for query, result, path in CxScanReportXmlContent.iter_results(report_file_path):
+        key = (query.get("id"), path.get("SimilarityId"))
+        yield key, (
+            query.get("name"),
+            result.get("Severity") or query.get("Severity"),
+            result.get("FileName"),
+            result.get("Line"),
+            result.get("NodeId"),
+            path.get("PathId"),
+        )
+
+
+def _construct_delta(status, key, record):
+    query_name, severity, file_name, line, node_id, path_id = record
+    return CxScanReportResultDelta(
+        status=status, query_id=key[0], similarity_id=key[1], query_name=query_name, severity=severity,
+        file_name=file_name, line=line, node_id=node_id, path_id=path_id
+    )
+
+
+def _diff_report_pair(baseline_report_file_path, current_report_file_path, include_recurrent):
+    """
+    module level so that it can be pickled into a worker process
+    """
+    report_diff = CxScanReportXmlDiff(baseline_report_file_path, current_report_file_path)
+    return list(report_diff.iter_deltas(include_recurrent=include_recurrent))
+
+
+class CxScanReportXmlDiff(object):
+    """
+    compare a scan report xml against a baseline scan report xml.
+
+    Results are keyed by (QueryId, SimilarityId). Both reports are streamed, only the slim keyed records of the
+    baseline report are kept in memory.
+    """
+
+    def __init__(self, baseline_report_file_path, current_report_file_path):
+        """
+
+        Args:
+            baseline_report_file_path (str): the xml report of the baseline scan, e.g. the mainline scan
+            current_report_file_path (str): the xml report of the scan to compare, e.g. the branch scan
+        """
+        self.baseline_report_file_path = baseline_report_file_path
+        self.current_report_file_path = current_report_file_path
+
+    def iter_deltas(self, include_recurrent=True):
+        """
+
+        Args:
+            include_recurrent (bool): False means only New and Fixed results are yielded
+
+        Returns:
+            generator of :obj:`CxScanReportResultDelta`
+        """
+        # the same (QueryId, SimilarityId) may appear more than once in a report, keep every occurrence
+        baseline = defaultdict(list)
+        for key, record in _iter_keyed_results(self.baseline_report_file_path):
+            baseline[key].append(record)
+
+        for key, record in _iter_keyed_results(self.current_report_file_path):
+            baseline_records = baseline.get(key)
+            if baseline_records:
+                baseline_records.pop()
+                if include_recurrent:
+                    yield _construct_delta(CxScanReportResultDelta.RECURRENT, key, record)
+            else:
+                yield _construct_delta(CxScanReportResultDelta.NEW, key, record)
+
+        for key, records in baseline.items():
+            for record in records:
+                yield _construct_delta(CxScanReportResultDelta.FIXED, key, record)
+
+    def get_deltas(self, include_recurrent=True):
+        """
+
+        Args:
+            include_recurrent (bool): False means only New and Fixed results are returned
+
+        Returns:
+            :obj:`list` of :obj:`CxScanReportResultDelta`
+        """
+        return list(self.iter_deltas(include_recurrent=include_recurrent))
+
+    @staticmethod
+    def diff_report_pairs(report_pairs, max_workers=None, include_recurrent=True):
+        """
+        diff many (baseline, current) report pairs in a process pool, e.g. branch vs mainline for every project
+
+        Args:
+            report_pairs (:obj:`list` of :obj:`tuple`): [(baseline_report_file_path, current_report_file_path)]
+            max_workers (int, optional): number of worker processes, default to the number of CPUs
+            include_recurrent (bool): False means only New and Fixed results are returned
+
+        Returns:
+            generator of (tuple, :obj:`list` of :obj:`CxScanReportResultDelta`), in the order pairs complete
+        """
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(_diff_report_pair, baseline, current, include_recurrent): (baseline, current)
+                for baseline, current in report_pairs
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result()
@@ -15,6 +15,8 @@ from .CxResultsStatistics import CxResultsStatistics
 from .CxScanQueueDetail import CxScanQueueDetail
 from .CxScanReportStatus import CxScanReportStatus
 from .CxScanReportXmlContent import CxScanReportXmlContent
+from .CxScanReportXmlDiff import CxScanReportXmlDiff
+from .CxScanReportResultDelta import CxScanReportResultDelta
 from .CxScanResultAttackVector import CxScanResultAttackVector
 from .CxScanResultAttackVectorByBFL import CxScanResultAttackVectorByBFL
 from .CxScanResultLabelsFields import CxScanResultLabelsFields
@@ -60,19 +62,42 @@ def construct_scan_result_node(item):
     )
 
 
-def construct_attack_vector(ac):
+def construct_shared_scan_result_node(item, node_cache):
+    """
+    return the node already constructed for an identical node dictionary, construct it otherwise
+
+    Args:
+        item (dict):
+        node_cache (dict): shared by all the attack vectors which should share nodes
+
+    Returns:
+
+    """
+    key = tuple(sorted(item.items()))
+    node = node_cache.get(key)
+    if node is None:
+        node = construct_scan_result_node(item)
+        node_cache[key] = node
+    return node
+
+
+def construct_attack_vector(ac, node_cache=None):
     """
 
     Args:
         ac (dict): attack vector dictionary
+        node_cache (dict, optional): when given, identical nodes are constructed once and shared between vectors
 
     Returns:
 
     """
+    if node_cache is None:
+        nodes = [construct_scan_result_node(item) for item in ac.get("nodes")]
+    else:
+        nodes = [construct_shared_scan_result_node(item, node_cache) for item in ac.get("nodes")]
+
     return CxScanResultAttackVector(
         result_id=ac.get('resultId'),
         best_fix_location_node=ac.get('bestFixLocationNode'),
-        nodes=[
-            construct_scan_result_node(item) for item in ac.get("nodes")
-        ]
+        nodes=nodes
     )
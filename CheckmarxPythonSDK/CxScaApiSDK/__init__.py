@@ -1,6 +1,7 @@
 from .api import (
     get_all_projects,
     check_if_project_already_exists,
+    get_project_by_name_from_cache,
     create_a_new_project,
     get_project_id_by_name,
     get_project_by_id,
@@ -24,3 +25,12 @@ from .api import (
     scan_previously_uploaded_zip,
 
 )
+from .httpRequests import configure_session
+from .scanWatcher import ScanWatcher, wait_for_scan
+from .riskReport import fetch_risk_report, join_risk_report, write_risk_report
+from .portfolioExport import export_portfolio, convert_portfolio_to_parquet
+from .uploader import upload_file_to_upload_link
+from .scanDelta import diff_packages, diff_vulnerabilities, get_scan_delta
+from .bulkTriage import bulk_set_ignore_state
+from .dto import ScaPackage, ScaVulnerability, ScaLicense
+from .vulnerabilityKnowledgeCache import VulnerabilityKnowledgeCache, get_slim_vulnerabilities_of_a_scan
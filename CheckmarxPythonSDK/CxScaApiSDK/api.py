@@ -1,9 +1,13 @@
 
 import json
-import requests
 
 from .httpRequests import get_request, post_request, put_request, delete_request
-from ..compat import NO_CONTENT, OK
+from .uploader import upload_file_to_upload_link
+from ..compat import NO_CONTENT
+from ..directoryCache import directory_cache
+from .dto import construct_sca_package, construct_sca_vulnerability, construct_sca_license
+
+SCA_PROJECT_INDEXES = {"name": lambda project: project.get("name"), "id": lambda project: project.get("id")}
 
 
 def get_all_projects(project_name=None):
@@ -46,23 +50,30 @@ def get_all_projects(project_name=None):
     return get_request(url)
 
 
-def check_if_project_already_exists(project_name):
+def get_project_by_name_from_cache(project_name):
     """
+    look up a project in the cached project index, which is loaded with get_all_projects and kept for the ttl of
+    the "sca_projects" collection of directory_cache
 
     Args:
         project_name (str):
 
     Returns:
-        exists (bool)
+        dict, or None if there is no such project
     """
-    all_projects = get_all_projects()
+    return directory_cache.lookup("sca_projects", "name", project_name, get_all_projects, SCA_PROJECT_INDEXES)
 
-    project_name_list = [project.get("name") for project in all_projects]
 
-    if project_name in project_name_list:
-        return True
+def check_if_project_already_exists(project_name):
+    """
 
-    return False
+    Args:
+        project_name (str):
+
+    Returns:
+        exists (bool)
+    """
+    return get_project_by_name_from_cache(project_name) is not None
 
 
 def create_a_new_project(project_name, assigned_teams=None):
@@ -98,7 +109,9 @@ def create_a_new_project(project_name, assigned_teams=None):
         }
     )
     response = post_request(url, data)
-    return response.json()
+    project = response.json()
+    directory_cache.put("sca_projects", project)
+    return project
 
 
 def get_project_id_by_name(project_name):
@@ -111,11 +124,15 @@ def get_project_id_by_name(project_name):
         project_id (str, list of str)
     """
     if isinstance(project_name, str):
-        project = get_all_projects(project_name=project_name)
+        project = get_project_by_name_from_cache(project_name)
+        if project is None:
+            # may be created by others after the project index was loaded
+            project = get_all_projects(project_name=project_name)
+            directory_cache.put("sca_projects", project)
         return project.get("id")
     elif isinstance(project_name, list):
-        projects = get_all_projects()
-        return [project.get("id") for project in projects if project.get("name") in project_name]
+        projects = directory_cache.get_index("sca_projects", "name", get_all_projects, SCA_PROJECT_INDEXES)
+        return [projects.get(name).get("id") for name in project_name if name in projects]
 
 
 def get_project_by_id(project_id):
@@ -154,6 +171,15 @@ def update_project(project_id, project_name=None, assigned_teams=None):
     response = put_request(relative_url=url, data=data)
     if response.status_code == NO_CONTENT:
         is_successful = True
+        project = directory_cache.peek("sca_projects", "id", project_id)
+        if project is not None:
+            updated_project = dict(project)
+            if project_name:
+                updated_project["name"] = project_name
+            if assigned_teams:
+                updated_project["assignedTeams"] = assigned_teams
+            directory_cache.remove("sca_projects", "id", project_id)
+            directory_cache.put("sca_projects", updated_project)
     return is_successful
 
 
@@ -171,6 +197,7 @@ def delete_project(project_id):
     response = delete_request(relative_url=url)
     if response.status_code == NO_CONTENT:
         is_successful = True
+        directory_cache.remove("sca_projects", "id", project_id)
     return is_successful
 
 
@@ -434,14 +461,15 @@ def get_risk_report_summary(project_id=None, size=10):
     return get_request(relative_url=url)
 
 
-def get_packages_of_a_scan(scan_id):
+def get_packages_of_a_scan(scan_id, as_dto=False):
     """
 
     Args:
         scan_id (str):
+        as_dto (bool, optional): return compact ScaPackage objects instead of dicts
 
     Returns:
-        list of dict
+        list of dict, or list of ScaPackage
 
         sample:
             [
@@ -593,17 +621,22 @@ def get_packages_of_a_scan(scan_id):
 
     """
     url = "/risk-management/risk-reports/{scanId}/packages".format(scanId=scan_id)
-    return get_request(relative_url=url)
+    items = get_request(relative_url=url)
+    if as_dto:
+        pool = {}
+        items = [construct_sca_package(item, pool) for item in items]
+    return items
 
 
-def get_vulnerabilities_of_a_scan(scan_id):
+def get_vulnerabilities_of_a_scan(scan_id, as_dto=False):
     """
 
     Args:
         scan_id (str):
+        as_dto (bool, optional): return compact ScaVulnerability objects instead of dicts
 
     Returns:
-        list of dict
+        list of dict, or list of ScaVulnerability
 
         sample:
             [
@@ -656,17 +689,22 @@ def get_vulnerabilities_of_a_scan(scan_id):
             ]
     """
     url = "/risk-management/risk-reports/{scanId}/vulnerabilities".format(scanId=scan_id)
-    return get_request(relative_url=url)
+    items = get_request(relative_url=url)
+    if as_dto:
+        pool = {}
+        items = [construct_sca_vulnerability(item, pool) for item in items]
+    return items
 
 
-def get_licenses_of_a_scan(scan_id):
+def get_licenses_of_a_scan(scan_id, as_dto=False):
     """
 
     Args:
         scan_id (str):
+        as_dto (bool, optional): return compact ScaLicense objects instead of dicts
 
     Returns:
-        list of dict
+        list of dict, or list of ScaLicense
         sample:
         [
           {
@@ -685,7 +723,11 @@ def get_licenses_of_a_scan(scan_id):
         ]
     """
     url = "/risk-management/risk-reports/{scanId}/licenses".format(scanId=scan_id)
-    return get_request(relative_url=url)
+    items = get_request(relative_url=url)
+    if as_dto:
+        pool = {}
+        items = [construct_sca_license(item, pool) for item in items]
+    return items
 
 
 def ignore_a_vulnerability_for_a_specific_package_and_project(project_id, vulnerability_id, package_id):
@@ -799,26 +841,21 @@ def generate_upload_link_for_scanning(project_id):
     return response.json().get("uploadUrl")
 
 
-def upload_zip_content_for_scanning(upload_link, zip_file_path):
+def upload_zip_content_for_scanning(upload_link, zip_file_path, progress_callback=None, max_retries=3):
     """
 
     Args:
         upload_link (str):
         zip_file_path (str):
+        progress_callback (function, optional): called with (sent bytes, total bytes)
+        max_retries (int, optional): retries on connection errors, timeouts and 429/5xx responses
 
     Returns:
         is_successful (bool)
     """
-    is_successful = False
-
-    url = "{uploadLink}".format(uploadLink=upload_link)
-
-    with open(zip_file_path, 'rb') as data:
-        response = requests.put(url=url, data=data)
-        if response.status_code == OK:
-            is_successful = True
-
-    return is_successful
+    metrics = upload_file_to_upload_link(upload_link, zip_file_path, progress_callback=progress_callback,
+                                         max_retries=max_retries)
+    return metrics.get("is_successful")
 
 
 def scan_previously_uploaded_zip(project_id, uploaded_file_url):
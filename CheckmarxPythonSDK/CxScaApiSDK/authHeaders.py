@@ -33,7 +33,8 @@ def get_new_token(token_url, username, password, account):
         "client_id": "sca_resource_owner",
     }
 
-    response = requests.post(url=token_url, data=req_data, verify=False)
+    response = requests.post(url=token_url, data=req_data, verify=sca_config.get("verify"),
+                             timeout=(sca_config.get("connect_timeout"), sca_config.get("read_timeout")))
 
     if response.status_code != OK:
         raise ValueError(response.text, response.status_code)
@@ -0,0 +1,128 @@
+# encoding: utf-8
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .api import (
+    SCA_PROJECT_INDEXES,
+    get_all_projects,
+    get_vulnerabilities_of_a_scan,
+    ignore_a_vulnerability_for_a_specific_package_and_project,
+    undo_the_ignore_state_of_an_ignored_vulnerability,
+)
+from ..directoryCache import directory_cache
+
+CHANGED = "CHANGED"
+SKIPPED = "SKIPPED"
+FAILED = "FAILED"
+
+
+class RateLimiter(object):
+    """
+    lets at most max_calls_per_second callers through per second, evenly spaced, across threads
+    """
+
+    def __init__(self, max_calls_per_second):
+        self.interval = 1.0 / max_calls_per_second if max_calls_per_second else 0
+        self._next_time = 0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.time()
+            wait_seconds = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+        if wait_seconds > 0:
+            time.sleep(wait_seconds)
+
+
+def get_ignored_vulnerabilities_of_projects(project_ids, max_workers=8):
+    """
+    fetch the vulnerabilities of the last successful scan of every project concurrently
+
+    Args:
+        project_ids (iterable of str):
+        max_workers (int, optional):
+
+    Returns:
+        dict: {project_id: dict {(vulnerability id, package id): isIgnored}}, projects without a successful scan
+            or whose vulnerabilities could not be fetched are missing
+    """
+    projects = directory_cache.get_index("sca_projects", "id", get_all_projects, SCA_PROJECT_INDEXES)
+
+    def fetch(project_id):
+        scan_id = (projects.get(project_id) or {}).get("lastSuccessfulScanId")
+        if not scan_id:
+            return project_id, None
+        try:
+            vulnerabilities = get_vulnerabilities_of_a_scan(scan_id)
+        except Exception:
+            return project_id, None
+        return project_id, {
+            (vulnerability.get("id"), vulnerability.get("packageId")): vulnerability.get("isIgnored")
+            for vulnerability in vulnerabilities
+        }
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return {
+            project_id: states for project_id, states in executor.map(fetch, set(project_ids)) if states is not None
+        }
+
+
+def bulk_set_ignore_state(items, ignore=True, max_workers=8, max_requests_per_second=10, skip_unchanged=True):
+    """
+    ignore, or undo the ignore state of, many vulnerabilities at once.
+
+    Duplicated items are handled once. With skip_unchanged, the vulnerabilities of the last successful scan of
+    every project are fetched once, and items that are already in the wanted isIgnored state are skipped without
+    a request. Items that are not in that scan are sent anyway.
+
+    Args:
+        items (iterable of tuple): (project_id, vulnerability_id, package_id)
+        ignore (bool, optional): True to ignore, False to undo the ignore state
+        max_workers (int, optional): number of requests sent at once
+        max_requests_per_second (int, float, optional): None for no limit
+        skip_unchanged (bool, optional):
+
+    Returns:
+        list of dict: one per distinct item, in the order of items,
+            {"project_id": str, "vulnerability_id": str, "package_id": str,
+             "status": "CHANGED", "SKIPPED" or "FAILED", "error": str or None}
+    """
+    distinct_items = []
+    seen = set()
+    for item in items:
+        item = tuple(item)
+        if item not in seen:
+            seen.add(item)
+            distinct_items.append(item)
+
+    ignore_states = {}
+    if skip_unchanged:
+        ignore_states = get_ignored_vulnerabilities_of_projects(
+            (project_id for project_id, _, _ in distinct_items), max_workers=max_workers
+        )
+
+    set_state = (ignore_a_vulnerability_for_a_specific_package_and_project if ignore
+                 else undo_the_ignore_state_of_an_ignored_vulnerability)
+    rate_limiter = RateLimiter(max_requests_per_second)
+
+    def triage(item):
+        project_id, vulnerability_id, package_id = item
+        result = {"project_id": project_id, "vulnerability_id": vulnerability_id, "package_id": package_id,
+                  "status": FAILED, "error": None}
+        current_state = ignore_states.get(project_id, {}).get((vulnerability_id, package_id))
+        if current_state is not None and bool(current_state) == ignore:
+            result["status"] = SKIPPED
+            return result
+
+        rate_limiter.wait()
+        try:
+            if set_state(project_id=project_id, vulnerability_id=vulnerability_id, package_id=package_id):
+                result["status"] = CHANGED
+        except Exception as error:
+            result["error"] = str(error)
+        return result
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(triage, distinct_items))
@@ -0,0 +1,56 @@
+# encoding: utf-8
+
+
+class ScaLicense(object):
+    """
+    a license of a CxSCA risk report, see get_licenses_of_a_scan
+    """
+    __slots__ = ("id", "name", "reference_type", "reference", "royalty_free", "copyright_risk_score", "risk_level",
+                 "linking", "copy_left", "patent_risk_score", "url")
+
+    def __init__(self, license_id, name, reference_type, reference, royalty_free, copyright_risk_score, risk_level,
+                 linking, copy_left, patent_risk_score, url):
+        """
+
+        Args:
+            license_id (str): e.g. 'Yarn-antlr:antlr-2.7.7-BSD 3'
+            name (str): e.g. 'BSD 3'
+            reference_type (str):
+            reference (str):
+            royalty_free (str):
+            copyright_risk_score (int):
+            risk_level (str):
+            linking (str):
+            copy_left (str):
+            patent_risk_score (int):
+            url (str):
+        """
+        self.id = license_id
+        self.name = name
+        self.reference_type = reference_type
+        self.reference = reference
+        self.royalty_free = royalty_free
+        self.copyright_risk_score = copyright_risk_score
+        self.risk_level = risk_level
+        self.linking = linking
+        self.copy_left = copy_left
+        self.patent_risk_score = patent_risk_score
+        self.url = url
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "referenceType": self.reference_type,
+            "reference": self.reference,
+            "royaltyFree": self.royalty_free,
+            "copyrightRiskScore": self.copyright_risk_score,
+            "riskLevel": self.risk_level,
+            "linking": self.linking,
+            "copyLeft": self.copy_left,
+            "patentRiskScore": self.patent_risk_score,
+            "name": self.name,
+            "url": self.url,
+        }
+
+    def __str__(self):
+        return "ScaLicense(id={}, name={}, risk_level={})".format(self.id, self.name, self.risk_level)
@@ -0,0 +1,110 @@
+# encoding: utf-8
+import json
+
+
+class ScaPackage(object):
+    """
+    a package of a CxSCA risk report, see get_packages_of_a_scan.
+
+    The rarely used nested fields dependencyPaths and packageUsage are kept as one json string,
+    and decoded each time they are accessed.
+    """
+    __slots__ = ("id", "name", "version", "licenses", "match_type", "high_vulnerability_count",
+                 "medium_vulnerability_count", "low_vulnerability_count", "ignored_vulnerability_count",
+                 "number_of_versions_since_last_update", "newest_version_release_date", "newest_version", "outdated",
+                 "release_date", "confidence_level", "risk_score", "severity", "locations", "package_repository",
+                 "is_direct_dependency", "is_development", "_details")
+
+    def __init__(self, package_id, name, version, licenses, match_type, high_vulnerability_count,
+                 medium_vulnerability_count, low_vulnerability_count, ignored_vulnerability_count,
+                 number_of_versions_since_last_update, newest_version_release_date, newest_version, outdated,
+                 release_date, confidence_level, risk_score, severity, locations, package_repository,
+                 is_direct_dependency, is_development, details):
+        """
+
+        Args:
+            package_id (str): e.g. 'Yarn-antlr:antlr-2.7.7'
+            name (str):
+            version (str):
+            licenses (tuple of str): license ids
+            match_type (str):
+            high_vulnerability_count (int):
+            medium_vulnerability_count (int):
+            low_vulnerability_count (int):
+            ignored_vulnerability_count (int):
+            number_of_versions_since_last_update (int):
+            newest_version_release_date (str):
+            newest_version (str):
+            outdated (bool):
+            release_date (str):
+            confidence_level (str):
+            risk_score (float):
+            severity (str):
+            locations (tuple of str):
+            package_repository (str):
+            is_direct_dependency (bool):
+            is_development (bool):
+            details (str): json of {"dependencyPaths": list, "packageUsage": dict}
+        """
+        self.id = package_id
+        self.name = name
+        self.version = version
+        self.licenses = licenses
+        self.match_type = match_type
+        self.high_vulnerability_count = high_vulnerability_count
+        self.medium_vulnerability_count = medium_vulnerability_count
+        self.low_vulnerability_count = low_vulnerability_count
+        self.ignored_vulnerability_count = ignored_vulnerability_count
+        self.number_of_versions_since_last_update = number_of_versions_since_last_update
+        self.newest_version_release_date = newest_version_release_date
+        self.newest_version = newest_version
+        self.outdated = outdated
+        self.release_date = release_date
+        self.confidence_level = confidence_level
+        self.risk_score = risk_score
+        self.severity = severity
+        self.locations = locations
+        self.package_repository = package_repository
+        self.is_direct_dependency = is_direct_dependency
+        self.is_development = is_development
+        self._details = details
+
+    @property
+    def dependency_paths(self):
+        return json.loads(self._details).get("dependencyPaths")
+
+    @property
+    def package_usage(self):
+        return json.loads(self._details).get("packageUsage")
+
+    def to_dict(self):
+        item = {
+            "id": self.id,
+            "name": self.name,
+            "version": self.version,
+            "licenses": list(self.licenses),
+            "matchType": self.match_type,
+            "highVulnerabilityCount": self.high_vulnerability_count,
+            "mediumVulnerabilityCount": self.medium_vulnerability_count,
+            "lowVulnerabilityCount": self.low_vulnerability_count,
+            "ignoredVulnerabilityCount": self.ignored_vulnerability_count,
+            "numberOfVersionsSinceLastUpdate": self.number_of_versions_since_last_update,
+            "newestVersionReleaseDate": self.newest_version_release_date,
+            "newestVersion": self.newest_version,
+            "outdated": self.outdated,
+            "releaseDate": self.release_date,
+            "confidenceLevel": self.confidence_level,
+            "riskScore": self.risk_score,
+            "severity": self.severity,
+            "locations": list(self.locations),
+            "packageRepository": self.package_repository,
+            "isDirectDependency": self.is_direct_dependency,
+            "isDevelopment": self.is_development,
+        }
+        item.update(json.loads(self._details))
+        return item
+
+    def __str__(self):
+        return "ScaPackage(id={}, name={}, version={}, severity={})".format(
+            self.id, self.name, self.version, self.severity
+        )
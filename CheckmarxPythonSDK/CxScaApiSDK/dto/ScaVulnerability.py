@@ -0,0 +1,92 @@
+# encoding: utf-8
+import json
+
+
+class ScaVulnerability(object):
+    """
+    a vulnerability of a CxSCA risk report, see get_vulnerabilities_of_a_scan.
+
+    The large fields description, references, referencesData, cvss, recommendations and exploitableMethods are
+    kept as one json string, shared by every vulnerability with the same content, and decoded each time one of
+    them is accessed.
+    """
+    __slots__ = ("id", "cve_name", "score", "severity", "publish_date", "package_id", "similarity_id",
+                 "fix_resolution_text", "is_ignored", "cwe", "_details")
+
+    def __init__(self, vulnerability_id, cve_name, score, severity, publish_date, package_id, similarity_id,
+                 fix_resolution_text, is_ignored, cwe, details):
+        """
+
+        Args:
+            vulnerability_id (str): e.g. 'CVE-2015-7501'
+            cve_name (str):
+            score (float):
+            severity (str):
+            publish_date (str):
+            package_id (str):
+            similarity_id (str):
+            fix_resolution_text (str):
+            is_ignored (bool):
+            cwe (str):
+            details (str): json of {"description": str, "references": list, "referencesData": list,
+                "cvss": dict, "recommendations": str, "exploitableMethods": list}
+        """
+        self.id = vulnerability_id
+        self.cve_name = cve_name
+        self.score = score
+        self.severity = severity
+        self.publish_date = publish_date
+        self.package_id = package_id
+        self.similarity_id = similarity_id
+        self.fix_resolution_text = fix_resolution_text
+        self.is_ignored = is_ignored
+        self.cwe = cwe
+        self._details = details
+
+    def __get_detail(self, key):
+        return json.loads(self._details).get(key)
+
+    @property
+    def description(self):
+        return self.__get_detail("description")
+
+    @property
+    def references(self):
+        return self.__get_detail("references")
+
+    @property
+    def references_data(self):
+        return self.__get_detail("referencesData")
+
+    @property
+    def cvss(self):
+        return self.__get_detail("cvss")
+
+    @property
+    def recommendations(self):
+        return self.__get_detail("recommendations")
+
+    @property
+    def exploitable_methods(self):
+        return self.__get_detail("exploitableMethods")
+
+    def to_dict(self):
+        item = {
+            "id": self.id,
+            "cveName": self.cve_name,
+            "score": self.score,
+            "severity": self.severity,
+            "publishDate": self.publish_date,
+            "packageId": self.package_id,
+            "similarityId": self.similarity_id,
+            "fixResolutionText": self.fix_resolution_text,
+            "isIgnored": self.is_ignored,
+            "cwe": self.cwe,
+        }
+        item.update(json.loads(self._details))
+        return item
+
+    def __str__(self):
+        return "ScaVulnerability(id={}, package_id={}, severity={}, score={})".format(
+            self.id, self.package_id, self.severity, self.score
+        )
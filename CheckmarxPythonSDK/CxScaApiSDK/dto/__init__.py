@@ -0,0 +1,134 @@
+import json
+from sys import intern
+
+from .ScaLicense import ScaLicense
+from .ScaPackage import ScaPackage
+from .ScaVulnerability import ScaVulnerability
+
+# the large fields of a vulnerability, which are the same in every project depending on the affected package
+VULNERABILITY_DETAIL_KEYS = (
+    "description", "references", "referencesData", "cvss", "recommendations", "exploitableMethods"
+)
+
+
+def intern_value(value):
+    """
+    intern a value of a field with few distinct values, e.g. a severity, a license name or a package id.
+    Interned strings are freed once no DTO uses them. Other values are returned as they are.
+
+    Args:
+        value:
+
+    Returns:
+        the same value, shared with all the other equal interned strings
+    """
+    if not isinstance(value, str):
+        return value
+    return intern(value)
+
+
+def pool_value(value, pool):
+    """
+    share the equal strings of one load, e.g. the details of a CVE that many packages of a scan depend on.
+    The pool lives as long as the load, so that unique values do not pile up for the life of the process.
+
+    Args:
+        value:
+        pool (dict): {value: value}, None to keep the value as it is
+
+    Returns:
+        the same value, shared with all the earlier equal strings of the pool
+    """
+    if pool is None or not isinstance(value, (str, type(u""))):
+        return value
+    return pool.setdefault(value, value)
+
+
+def _pool_details(item, keys, pool):
+    return pool_value(json.dumps({key: item.get(key) for key in keys}, sort_keys=True), pool)
+
+
+def construct_sca_license(item, pool=None):
+    """
+
+    Args:
+        item (dict): a license from get_licenses_of_a_scan
+        pool (dict, optional): shared by the DTOs of one load, see pool_value
+
+    Returns:
+        ScaLicense
+    """
+    return ScaLicense(
+        license_id=intern_value(item.get("id")),
+        name=intern_value(item.get("name")),
+        reference_type=intern_value(item.get("referenceType")),
+        reference=pool_value(item.get("reference"), pool),
+        royalty_free=intern_value(item.get("royaltyFree")),
+        copyright_risk_score=item.get("copyrightRiskScore"),
+        risk_level=intern_value(item.get("riskLevel")),
+        linking=intern_value(item.get("linking")),
+        copy_left=intern_value(item.get("copyLeft")),
+        patent_risk_score=item.get("patentRiskScore"),
+        url=pool_value(item.get("url"), pool),
+    )
+
+
+def construct_sca_package(item, pool=None):
+    """
+
+    Args:
+        item (dict): a package from get_packages_of_a_scan
+        pool (dict, optional): shared by the DTOs of one load, see pool_value
+
+    Returns:
+        ScaPackage
+    """
+    return ScaPackage(
+        package_id=intern_value(item.get("id")),
+        name=intern_value(item.get("name")),
+        version=pool_value(item.get("version"), pool),
+        licenses=tuple(intern_value(license_id) for license_id in item.get("licenses") or []),
+        match_type=intern_value(item.get("matchType")),
+        high_vulnerability_count=item.get("highVulnerabilityCount"),
+        medium_vulnerability_count=item.get("mediumVulnerabilityCount"),
+        low_vulnerability_count=item.get("lowVulnerabilityCount"),
+        ignored_vulnerability_count=item.get("ignoredVulnerabilityCount"),
+        number_of_versions_since_last_update=item.get("numberOfVersionsSinceLastUpdate"),
+        newest_version_release_date=pool_value(item.get("newestVersionReleaseDate"), pool),
+        newest_version=pool_value(item.get("newestVersion"), pool),
+        outdated=item.get("outdated"),
+        release_date=pool_value(item.get("releaseDate"), pool),
+        confidence_level=intern_value(item.get("confidenceLevel")),
+        risk_score=item.get("riskScore"),
+        severity=intern_value(item.get("severity")),
+        locations=tuple(pool_value(location, pool) for location in item.get("locations") or []),
+        package_repository=intern_value(item.get("packageRepository")),
+        is_direct_dependency=item.get("isDirectDependency"),
+        is_development=item.get("isDevelopment"),
+        details=_pool_details(item, ("dependencyPaths", "packageUsage"), pool),
+    )
+
+
+def construct_sca_vulnerability(item, pool=None):
+    """
+
+    Args:
+        item (dict): a vulnerability from get_vulnerabilities_of_a_scan
+        pool (dict, optional): shared by the DTOs of one load, see pool_value
+
+    Returns:
+        ScaVulnerability
+    """
+    return ScaVulnerability(
+        vulnerability_id=intern_value(item.get("id")),
+        cve_name=intern_value(item.get("cveName")),
+        score=item.get("score"),
+        severity=intern_value(item.get("severity")),
+        publish_date=pool_value(item.get("publishDate"), pool),
+        package_id=intern_value(item.get("packageId")),
+        similarity_id=pool_value(item.get("similarityId"), pool),
+        fix_resolution_text=pool_value(item.get("fixResolutionText"), pool),
+        is_ignored=item.get("isIgnored"),
+        cwe=intern_value(item.get("cwe")),
+        details=_pool_details(item, VULNERABILITY_DETAIL_KEYS, pool),
+    )
@@ -1,8 +1,71 @@
+import threading
+
 import requests
+from requests.adapters import HTTPAdapter
+
 from ..config import sca_config
 from . import authHeaders
 from ..compat import (OK, UNAUTHORIZED, NO_CONTENT, CREATED)
 
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """
+    the requests Session shared by every CxSCA call. It keeps up to sca_config "pool_size" connections alive
+    per host, to the CxSCA API server as well as to the host of the upload links.
+    Its "verify" setting is the one of the CxSCA server, the uploads to the upload links override it.
+
+    Returns:
+        :obj:`requests.Session`
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            # one pool for the API server, one for the upload link host, spare ones for redirects
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=sca_config.get("pool_size"))
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.verify = sca_config.get("verify")
+            _session = session
+        return _session
+
+
+def configure_session(pool_size=None, verify=None, connect_timeout=None, read_timeout=None):
+    """
+    change the transport settings at runtime, options that are not given keep their configured value.
+    The current session is closed, the next request opens a new one with the new settings.
+
+    Args:
+        pool_size (int, optional): max connections kept alive per host
+        verify (bool, str, optional): verify TLS certificates, or the path of a CA bundle
+        connect_timeout (int, float, optional): seconds
+        read_timeout (int, float, optional): seconds
+    """
+    global _session
+    settings = {
+        "pool_size": pool_size,
+        "verify": verify,
+        "connect_timeout": connect_timeout,
+        "read_timeout": read_timeout,
+    }
+    with _session_lock:
+        sca_config.update({key: value for key, value in settings.items() if value is not None})
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def get_timeout():
+    """
+
+    Returns:
+        tuple: (connect timeout, read timeout) in seconds
+    """
+    return sca_config.get("connect_timeout"), sca_config.get("read_timeout")
+
 
 def retry_when_unauthorized(func):
     """
@@ -37,10 +100,10 @@ def get_value_from_response(func):
 
 def http_get(relative_url):
     url = sca_config.get("server") + relative_url
-    response = requests.get(
+    response = get_session().get(
         url=url,
         headers=authHeaders.auth_headers,
-        verify=False
+        timeout=get_timeout()
     )
 
     if response.status_code != OK:
@@ -51,11 +114,11 @@ def http_get(relative_url):
 
 def http_post(relative_url, data):
     url = sca_config.get("server") + relative_url
-    response = requests.post(
+    response = get_session().post(
         url=url,
         data=data,
         headers=authHeaders.auth_headers,
-        verify=False
+        timeout=get_timeout()
     )
 
     if response.status_code not in [OK, CREATED]:
@@ -71,11 +134,11 @@ def http_put(relative_url, data, headers=None):
         headers = authHeaders.auth_headers
 
     url = sca_config.get("server") + relative_url
-    response = requests.put(
+    response = get_session().put(
         url=url,
         data=data,
         headers=headers,
-        verify=False
+        timeout=get_timeout()
     )
     if response.status_code != NO_CONTENT:
         raise ValueError("HttpStatusCode: {code}".format(code=response.status_code),
@@ -85,10 +148,10 @@ def http_put(relative_url, data, headers=None):
 
 def http_delete(relative_url):
     url = sca_config.get("server") + relative_url
-    response = requests.delete(
+    response = get_session().delete(
         url=url,
         headers=authHeaders.auth_headers,
-        verify=False
+        timeout=get_timeout()
     )
 
     if response.status_code != NO_CONTENT:
@@ -0,0 +1,190 @@
+# encoding: utf-8
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
+from os.path import exists
+
+from .api import get_all_projects
+from .riskReport import fetch_risk_report, join_risk_report
+
+
+def read_checkpoint(checkpoint_path):
+    """
+
+    Args:
+        checkpoint_path (str): file with one exported project id per line
+
+    Returns:
+        set of str: the ids of the projects that are exported already
+    """
+    if not checkpoint_path or not exists(checkpoint_path):
+        return set()
+    with io.open(checkpoint_path, "r", encoding="utf-8") as checkpoint_file:
+        return set(line.strip() for line in checkpoint_file if line.strip())
+
+
+def export_project_risk_report(project, knowledge_cache=None):
+    """
+    fetch and join the risk report of the last successful scan of a project
+
+    Args:
+        project (dict): a project from get_all_projects
+        knowledge_cache (VulnerabilityKnowledgeCache, optional): store the vulnerability details there,
+            and keep the vulnerabilities of the record slim
+
+    Returns:
+        dict: one record of the portfolio export
+    """
+    project_id = project.get("id")
+    scan_id = project.get("lastSuccessfulScanId")
+    # the portfolio export runs many projects at once, so the resources of one report are fetched one by one
+    report = fetch_risk_report(scan_id, project_id=project_id, max_workers=1)
+    if knowledge_cache is not None:
+        report["vulnerabilities"] = knowledge_cache.store(report.get("vulnerabilities"))
+    packages, orphan_vulnerabilities = join_risk_report(
+        report.get("packages"), report.get("vulnerabilities"), report.get("licenses")
+    )
+    return {
+        "project_id": project_id,
+        "project_name": project.get("name"),
+        "scan_id": scan_id,
+        "risk_report_summary": report.get("risk_report_summary"),
+        "packages": packages,
+        "unmatched_vulnerabilities": orphan_vulnerabilities,
+    }
+
+
+def export_portfolio(output_path, checkpoint_path=None, max_workers=4, project_names=None, knowledge_cache=None):
+    """
+    write the latest risk report of every CxSCA project as one json line per project.
+
+    The scan of each project is the lastSuccessfulScanId from get_all_projects, projects that have never been
+    scanned successfully are skipped. With a checkpoint file, every exported project id is recorded after its
+    line is written, and a new run with the same output and checkpoint files continues with the projects that
+    are not exported yet. A crash between writing a line and recording it may leave a project twice in the output.
+
+    Args:
+        output_path (str): the JSON Lines file, appended to
+        checkpoint_path (str, optional):
+        max_workers (int, optional): number of projects exported at once,
+            see configure_session to keep as many connections alive
+        project_names (list of str, optional): export only these projects
+        knowledge_cache (VulnerabilityKnowledgeCache, optional): write the vulnerability details once to the
+            cache instead of into every record
+
+    Returns:
+        dict: {"exported": int, "skipped": int, "failed": {project_id: error message}}
+    """
+    exported_project_ids = read_checkpoint(checkpoint_path)
+    projects = [
+        project for project in get_all_projects()
+        if project.get("lastSuccessfulScanId") and (not project_names or project.get("name") in project_names)
+    ]
+    projects_to_export = [project for project in projects if project.get("id") not in exported_project_ids]
+
+    statistics = {"exported": 0, "skipped": len(projects) - len(projects_to_export), "failed": {}}
+    projects_to_export = iter(projects_to_export)
+
+    checkpoint_file = io.open(checkpoint_path, "a", encoding="utf-8") if checkpoint_path else None
+    try:
+        with io.open(output_path, "a", encoding="utf-8") as output_file, \
+                ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = {
+                executor.submit(export_project_risk_report, project, knowledge_cache): project
+                for project in islice(projects_to_export, max_workers)
+            }
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    project = pending.pop(future)
+                    try:
+                        record = future.result()
+                    except Exception as error:
+                        statistics["failed"][project.get("id")] = str(error)
+                        continue
+                    output_file.write(u"{}\n".format(json.dumps(record, ensure_ascii=False)))
+                    output_file.flush()
+                    if checkpoint_file:
+                        checkpoint_file.write(u"{}\n".format(project.get("id")))
+                        checkpoint_file.flush()
+                    statistics["exported"] += 1
+                for project in islice(projects_to_export, len(done)):
+                    pending[executor.submit(export_project_risk_report, project, knowledge_cache)] = project
+    finally:
+        if checkpoint_file:
+            checkpoint_file.close()
+
+    return statistics
+
+
+def convert_portfolio_to_parquet(jsonl_path, parquet_path, batch_size=10000):
+    """
+    convert a portfolio export into a Parquet file with one row per package. Needs pyarrow.
+
+    Args:
+        jsonl_path (str): the output of export_portfolio
+        parquet_path (str):
+        batch_size (int, optional): rows per row group
+
+    Returns:
+        int: number of rows
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Parquet output needs pyarrow, install it with: pip install CheckmarxPythonSDK[parquet]")
+
+    schema = pyarrow.schema([
+        ("project_id", pyarrow.string()),
+        ("project_name", pyarrow.string()),
+        ("scan_id", pyarrow.string()),
+        ("package_id", pyarrow.string()),
+        ("package_name", pyarrow.string()),
+        ("package_version", pyarrow.string()),
+        ("severity", pyarrow.string()),
+        ("risk_score", pyarrow.float64()),
+        ("high_vulnerability_count", pyarrow.int64()),
+        ("medium_vulnerability_count", pyarrow.int64()),
+        ("low_vulnerability_count", pyarrow.int64()),
+        ("outdated", pyarrow.bool_()),
+        ("is_direct_dependency", pyarrow.bool_()),
+        ("licenses", pyarrow.list_(pyarrow.string())),
+        ("vulnerability_ids", pyarrow.list_(pyarrow.string())),
+    ])
+
+    def rows():
+        with io.open(jsonl_path, "r", encoding="utf-8") as jsonl_file:
+            for line in jsonl_file:
+                record = json.loads(line)
+                for package in record.get("packages"):
+                    yield {
+                        "project_id": record.get("project_id"),
+                        "project_name": record.get("project_name"),
+                        "scan_id": record.get("scan_id"),
+                        "package_id": package.get("id"),
+                        "package_name": package.get("name"),
+                        "package_version": package.get("version"),
+                        "severity": package.get("severity"),
+                        "risk_score": package.get("riskScore"),
+                        "high_vulnerability_count": package.get("highVulnerabilityCount"),
+                        "medium_vulnerability_count": package.get("mediumVulnerabilityCount"),
+                        "low_vulnerability_count": package.get("lowVulnerabilityCount"),
+                        "outdated": package.get("outdated"),
+                        "is_direct_dependency": package.get("isDirectDependency"),
+                        "licenses": [license_item.get("name") for license_item in package.get("licenseDetails")],
+                        "vulnerability_ids": [vulnerability.get("id") for vulnerability in
+                                              package.get("vulnerabilities")],
+                    }
+
+    number_of_rows = 0
+    row_iterator = rows()
+    with pyarrow.parquet.ParquetWriter(parquet_path, schema) as writer:
+        while True:
+            batch = list(islice(row_iterator, batch_size))
+            if not batch:
+                break
+            writer.write_table(pyarrow.Table.from_pylist(batch, schema=schema))
+            number_of_rows += len(batch)
+    return number_of_rows
@@ -0,0 +1,132 @@
+# encoding: utf-8
+import io
+import json
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from .api import (
+    get_risk_report_summary,
+    get_packages_of_a_scan,
+    get_vulnerabilities_of_a_scan,
+    get_licenses_of_a_scan,
+)
+
+
+def fetch_risk_report(scan_id, project_id=None, max_workers=4):
+    """
+    fetch the risk report summary, packages, vulnerabilities and licenses of a scan concurrently
+
+    Args:
+        scan_id (str):
+        project_id (str, optional): needed for the risk report summary
+        max_workers (int, optional): 1 to fetch one resource after the other
+
+    Returns:
+        dict: {"risk_report_summary": dict or None, "packages": list, "vulnerabilities": list, "licenses": list}
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        summaries = executor.submit(get_risk_report_summary, project_id) if project_id else None
+        packages = executor.submit(get_packages_of_a_scan, scan_id)
+        vulnerabilities = executor.submit(get_vulnerabilities_of_a_scan, scan_id)
+        licenses = executor.submit(get_licenses_of_a_scan, scan_id)
+
+        risk_report_summary = None
+        if summaries is not None:
+            # the risk report of a scan has the scan id as riskReportId
+            risk_report_summary = next(
+                (summary for summary in summaries.result() if summary.get("riskReportId") == scan_id), None
+            )
+        return {
+            "risk_report_summary": risk_report_summary,
+            "packages": packages.result(),
+            "vulnerabilities": vulnerabilities.result(),
+            "licenses": licenses.result(),
+        }
+
+
+def join_risk_report(packages, vulnerabilities, licenses):
+    """
+    attach to every package its vulnerabilities (joined by packageId) and license details (joined by license id)
+
+    Args:
+        packages (list of dict):
+        vulnerabilities (list of dict):
+        licenses (list of dict):
+
+    Returns:
+        tuple: (list of joined packages, list of vulnerabilities whose package is not in packages).
+            A joined package is a copy of the package with two more keys, "vulnerabilities" and "licenseDetails"
+    """
+    vulnerabilities_by_package_id = defaultdict(list)
+    for vulnerability in vulnerabilities:
+        vulnerabilities_by_package_id[vulnerability.get("packageId")].append(vulnerability)
+    licenses_by_id = {license_item.get("id"): license_item for license_item in licenses}
+
+    joined_packages = []
+    for package in packages:
+        joined_package = dict(package)
+        joined_package["vulnerabilities"] = vulnerabilities_by_package_id.pop(package.get("id"), [])
+        joined_package["licenseDetails"] = [
+            licenses_by_id[license_id] for license_id in package.get("licenses") or [] if license_id in licenses_by_id
+        ]
+        joined_packages.append(joined_package)
+
+    orphan_vulnerabilities = [
+        vulnerability for package_vulnerabilities in vulnerabilities_by_package_id.values()
+        for vulnerability in package_vulnerabilities
+    ]
+    return joined_packages, orphan_vulnerabilities
+
+
+def write_risk_report(file_path, scan_id, project_id=None, project_name=None, indent=4):
+    """
+    fetch the risk report of a scan and write it as one json document, package by package,
+    so that the whole document never has to be held in memory as one string
+
+    Args:
+        file_path (str):
+        scan_id (str):
+        project_id (str, optional):
+        project_name (str, optional):
+        indent (int, optional): None for the most compact output
+
+    Returns:
+        dict: {"packages": int, "vulnerabilities": int, "licenses": int}
+    """
+    report = fetch_risk_report(scan_id, project_id=project_id)
+    packages, orphan_vulnerabilities = join_risk_report(
+        report.get("packages"), report.get("vulnerabilities"), report.get("licenses")
+    )
+    header = {
+        "project_name": project_name,
+        "project_id": project_id,
+        "scan_id": scan_id,
+        "risk_report_summary": report.get("risk_report_summary"),
+    }
+
+    with io.open(file_path, "w", encoding="utf-8") as out_file:
+        out_file.write(u"{\n")
+        for key, value in header.items():
+            out_file.write(u"{key}: {value},\n".format(key=json.dumps(key), value=_dumps(value, indent)))
+        _write_list(out_file, "packages", packages, indent)
+        out_file.write(u",\n")
+        _write_list(out_file, "unmatched_vulnerabilities", orphan_vulnerabilities, indent)
+        out_file.write(u"\n}\n")
+
+    return {
+        "packages": len(packages),
+        "vulnerabilities": len(report.get("vulnerabilities")),
+        "licenses": len(report.get("licenses")),
+    }
+
+
+def _dumps(value, indent):
+    return u"{}".format(json.dumps(value, indent=indent, ensure_ascii=False))
+
+
+def _write_list(out_file, name, items, indent):
+    out_file.write(u"{name}: [".format(name=json.dumps(name)))
+    for index, item in enumerate(items):
+        out_file.write(u"," if index else u"")
+        out_file.write(u"\n" + _dumps(item, indent))
+    out_file.write(u"\n]" if items else u"]")
@@ -0,0 +1,113 @@
+# encoding: utf-8
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from .api import get_packages_of_a_scan, get_vulnerabilities_of_a_scan
+
+ADDED = "ADDED"
+REMOVED = "REMOVED"
+VERSION_CHANGED = "VERSION_CHANGED"
+
+
+def diff_packages(baseline_packages, current_packages):
+    """
+    compare the packages of two scans by package id, which contains the version, e.g. 'Yarn-antlr:antlr-2.7.7'.
+    When exactly one version of a package is removed and one is added, they are reported as one VERSION_CHANGED.
+
+    Args:
+        baseline_packages (list of dict): get_packages_of_a_scan of the older scan
+        current_packages (list of dict): get_packages_of_a_scan of the newer scan
+
+    Returns:
+        list of dict: {"change": str, "name": str, "old_version": str, "new_version": str,
+                       "old_package_id": str, "new_package_id": str}, ids and versions are None where not applicable
+    """
+    baseline_by_id = {package.get("id"): package for package in baseline_packages}
+    current_by_id = {package.get("id"): package for package in current_packages}
+
+    removed_by_name = defaultdict(list)
+    for package_id in set(baseline_by_id).difference(current_by_id):
+        removed_by_name[baseline_by_id[package_id].get("name")].append(baseline_by_id[package_id])
+    added_by_name = defaultdict(list)
+    for package_id in set(current_by_id).difference(baseline_by_id):
+        added_by_name[current_by_id[package_id].get("name")].append(current_by_id[package_id])
+
+    changes = []
+    for name in sorted(set(removed_by_name) | set(added_by_name), key=str):
+        removed, added = removed_by_name.get(name, []), added_by_name.get(name, [])
+        if len(removed) == 1 and len(added) == 1:
+            changes.append(_package_change(VERSION_CHANGED, name, removed[0], added[0]))
+            continue
+        changes.extend(_package_change(REMOVED, name, package, None) for package in removed)
+        changes.extend(_package_change(ADDED, name, None, package) for package in added)
+    return changes
+
+
+def _package_change(change, name, old_package, new_package):
+    return {
+        "change": change,
+        "name": name,
+        "old_version": old_package.get("version") if old_package else None,
+        "new_version": new_package.get("version") if new_package else None,
+        "old_package_id": old_package.get("id") if old_package else None,
+        "new_package_id": new_package.get("id") if new_package else None,
+    }
+
+
+def diff_vulnerabilities(baseline_vulnerabilities, current_vulnerabilities):
+    """
+    compare the vulnerabilities of two scans by (vulnerability id, package id)
+
+    Args:
+        baseline_vulnerabilities (list of dict): get_vulnerabilities_of_a_scan of the older scan
+        current_vulnerabilities (list of dict): get_vulnerabilities_of_a_scan of the newer scan
+
+    Returns:
+        list of dict: {"change": str, "vulnerability_id": str, "package_id": str, "severity": str, "score": float}
+    """
+    baseline_by_key = {(item.get("id"), item.get("packageId")): item for item in baseline_vulnerabilities}
+    current_by_key = {(item.get("id"), item.get("packageId")): item for item in current_vulnerabilities}
+
+    changes = [
+        _vulnerability_change(REMOVED, baseline_by_key[key]) for key in set(baseline_by_key).difference(current_by_key)
+    ]
+    changes.extend(
+        _vulnerability_change(ADDED, current_by_key[key]) for key in set(current_by_key).difference(baseline_by_key)
+    )
+    changes.sort(key=lambda record: (record.get("change"), str(record.get("package_id")),
+                                     str(record.get("vulnerability_id"))))
+    return changes
+
+
+def _vulnerability_change(change, vulnerability):
+    return {
+        "change": change,
+        "vulnerability_id": vulnerability.get("id"),
+        "package_id": vulnerability.get("packageId"),
+        "severity": vulnerability.get("severity"),
+        "score": vulnerability.get("score"),
+    }
+
+
+def get_scan_delta(baseline_scan_id, current_scan_id):
+    """
+    fetch the packages and vulnerabilities of two scans concurrently and compare them
+
+    Args:
+        baseline_scan_id (str): the older scan
+        current_scan_id (str): the newer scan
+
+    Returns:
+        dict: {"packages": list of dict, see diff_packages, "vulnerabilities": list of dict, see diff_vulnerabilities}
+    """
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        baseline_packages = executor.submit(get_packages_of_a_scan, baseline_scan_id)
+        current_packages = executor.submit(get_packages_of_a_scan, current_scan_id)
+        baseline_vulnerabilities = executor.submit(get_vulnerabilities_of_a_scan, baseline_scan_id)
+        current_vulnerabilities = executor.submit(get_vulnerabilities_of_a_scan, current_scan_id)
+
+        return {
+            "packages": diff_packages(baseline_packages.result(), current_packages.result()),
+            "vulnerabilities": diff_vulnerabilities(baseline_vulnerabilities.result(),
+                                                    current_vulnerabilities.result()),
+        }
@@ -0,0 +1,211 @@
+# encoding: utf-8
+import re
+from collections import defaultdict
+from concurrent.futures import Future, TimeoutError
+from datetime import datetime, timedelta
+
+from .api import get_all_scans_associated_with_a_project, get_scan_by_id
+from ..poller import Poller, PolledItem
+
+FINISHED_STATUSES = ("Done", "Failed")
+
+_SCA_TIME = re.compile(r"^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})(?:\.(\d+))?(Z|[+-]\d{2}:?\d{2})?$")
+
+
+def parse_sca_time(text):
+    """
+    parse a CxSCA time stamp, e.g. '2021-01-16T15:16:54.90395Z', the fraction has a variable number of digits,
+    and the time zone is 'Z', an offset like '+00:00', or missing for UTC
+
+    Args:
+        text (str):
+
+    Returns:
+        :obj:`datetime` in UTC, or None
+
+    Raises:
+        ValueError: when text is not such a time stamp
+    """
+    if not text:
+        return None
+    match = _SCA_TIME.match(text)
+    if match is None:
+        raise ValueError("unexpected time stamp: {}".format(text))
+    seconds, fraction, offset = match.groups()
+    moment = datetime.strptime(seconds, "%Y-%m-%dT%H:%M:%S")
+    if fraction:
+        moment += timedelta(microseconds=int((fraction + "000000")[:6]))
+    if offset and offset != "Z":
+        sign = -1 if offset[0] == "-" else 1
+        offset = offset[1:].replace(":", "")
+        moment -= sign * timedelta(hours=int(offset[:2]), minutes=int(offset[2:]))
+    return moment
+
+
+def get_stage_durations(scans):
+    """
+    collect how long every scanProgress stage took in finished scans
+
+    Args:
+        scans (list of dict): e.g. the result of get_all_scans_associated_with_a_project
+
+    Returns:
+        dict: {stage name: list of seconds}
+    """
+    durations = defaultdict(list)
+    for scan in scans:
+        if (scan.get("status") or {}).get("name") != "Done":
+            continue
+        for stage in scan.get("scanProgress") or []:
+            start_time = parse_sca_time(stage.get("startTime"))
+            end_time = parse_sca_time(stage.get("endTime"))
+            if start_time and end_time:
+                durations[stage.get("name")].append((end_time - start_time).total_seconds())
+    return durations
+
+
+def estimate_remaining_seconds(scan, stage_durations, now=None):
+    """
+    estimate how long a running scan still needs from the median duration of the stages it has not finished yet
+
+    Args:
+        scan (dict): a scan from get_scan_by_id or get_all_scans_associated_with_a_project
+        stage_durations (dict): {stage name: list of seconds}, see get_stage_durations
+        now (:obj:`datetime`, optional): current UTC time
+
+    Returns:
+        float, or None if there is no history for one of the unfinished stages
+    """
+    now = now or datetime.utcnow()
+    remaining = 0.0
+    for stage in scan.get("scanProgress") or []:
+        if stage.get("status") == "Done":
+            continue
+        durations = sorted(stage_durations.get(stage.get("name")) or [])
+        if not durations:
+            return None
+        expected = durations[len(durations) // 2]
+        start_time = parse_sca_time(stage.get("startTime"))
+        if start_time:
+            expected -= (now - start_time).total_seconds()
+        remaining += max(expected, 0)
+    return remaining
+
+
+class _WatchedScan(PolledItem):
+
+    def __init__(self, scan_id, project_id, future, deadline, interval):
+        super(_WatchedScan, self).__init__(scan_id, future, deadline, interval)
+        self.scan_id = scan_id
+        self.project_id = project_id
+
+
+class ScanWatcher(Poller):
+    """
+    wait for many CxSCA scans at once in one background thread.
+
+    Scans with a known project id are polled together with one get_all_scans_associated_with_a_project call per
+    project, other scans with get_scan_by_id. The next poll of a scan is planned from the stage durations of the
+    finished scans of its project, without such history the poll interval doubles from min_interval up to
+    max_interval.
+    """
+
+    def __init__(self, min_interval=2, max_interval=60, timeout=None, max_errors=3):
+        """
+
+        Args:
+            min_interval (int, float): seconds
+            max_interval (int, float): seconds
+            timeout (int, float, optional): seconds to wait for one scan, None to wait forever
+            max_errors (int): consecutive failed polls of a scan before its future fails
+        """
+        super(ScanWatcher, self).__init__(min_interval, max_interval, timeout=timeout, max_errors=max_errors,
+                                          thread_name="ScaScanWatcher")
+
+    def watch(self, scan_id, project_id=None, callback=None):
+        """
+
+        Args:
+            scan_id (str):
+            project_id (str, optional): lets the watcher poll all scans of the project with one request
+            callback (function, optional): called with the future once the scan is finished
+
+        Returns:
+            :obj:`Future`: the result is the scan dict (see get_scan_by_id) with status "Done" or "Failed",
+                the future fails with TimeoutError after timeout seconds
+        """
+        watched = self._add(scan_id, lambda: _WatchedScan(scan_id, project_id, Future(), self._get_deadline(),
+                                                          self.min_interval))
+        if callback:
+            watched.future.add_done_callback(callback)
+        return watched.future
+
+    def wait(self, scan_id, project_id=None):
+        """
+        block until the scan is finished
+
+        Returns:
+            dict: the finished scan, see get_scan_by_id
+        """
+        return self.watch(scan_id, project_id=project_id).result()
+
+    def _poll(self, due):
+        by_project = defaultdict(list)
+        for watched in due:
+            by_project[watched.project_id].append(watched)
+
+        for project_id, group in by_project.items():
+            scans = {}
+            stage_durations = {}
+            if project_id is not None:
+                try:
+                    project_scans = get_all_scans_associated_with_a_project(project_id)
+                except Exception as error:
+                    self._failed_polls(group, error)
+                    continue
+                scans = {scan.get("scanId"): scan for scan in project_scans}
+                stage_durations = get_stage_durations(project_scans)
+
+            for watched in group:
+                scan = scans.get(watched.scan_id)
+                if scan is None:
+                    try:
+                        scan = get_scan_by_id(watched.scan_id)
+                    except Exception as error:
+                        self._failed_polls([watched], error)
+                        continue
+                self.__update(watched, scan, stage_durations)
+
+    def __update(self, watched, scan, stage_durations):
+        if (scan.get("status") or {}).get("name") in FINISHED_STATUSES:
+            self._finish(watched, result=scan)
+            return
+        if self._is_expired(watched):
+            self._finish(watched, exception=TimeoutError("scan {} is not finished".format(watched.scan_id)))
+            return
+
+        remaining = estimate_remaining_seconds(scan, stage_durations)
+        # poll at half of the expected remaining time, so that a finished scan is seen soon
+        delay = min(max(remaining / 2, self.min_interval), self.max_interval) if remaining is not None else None
+        self._reschedule(watched, delay)
+
+
+def wait_for_scan(scan_id, project_id=None, timeout=None, min_interval=2, max_interval=60):
+    """
+    block until a CxSCA scan is finished, polling with an adaptive interval instead of a fixed one
+
+    Args:
+        scan_id (str):
+        project_id (str, optional):
+        timeout (int, float, optional): seconds
+        min_interval (int, float): seconds
+        max_interval (int, float): seconds
+
+    Returns:
+        dict: the finished scan with status "Done" or "Failed", see get_scan_by_id
+
+    Raises:
+        TimeoutError
+    """
+    with ScanWatcher(min_interval=min_interval, max_interval=max_interval, timeout=timeout) as watcher:
+        return watcher.wait(scan_id, project_id=project_id)
@@ -0,0 +1,93 @@
+# encoding: utf-8
+import os
+import time
+
+from requests.exceptions import ConnectionError, Timeout
+
+from .httpRequests import get_session, get_timeout
+from ..compat import OK
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class _ProgressReader(object):
+    """
+    a file wrapper that reports every block requests reads from it. It has a length,
+    so that requests sends a Content-Length header and streams the file instead of using chunked encoding.
+    """
+
+    def __init__(self, file_object, total_bytes, callback=None):
+        self.file_object = file_object
+        self.total_bytes = total_bytes
+        self.callback = callback
+        self.sent_bytes = 0
+
+    def __len__(self):
+        return self.total_bytes
+
+    def read(self, size=-1):
+        block = self.file_object.read(size)
+        self.sent_bytes += len(block)
+        if self.callback and block:
+            self.callback(self.sent_bytes, self.total_bytes)
+        return block
+
+
+def upload_file_to_upload_link(upload_link, zip_file_path, progress_callback=None, max_retries=3,
+                               backoff_seconds=2):
+    """
+    upload a zip file to an upload link from generate_upload_link_for_scanning with one streaming PUT,
+    retrying on connection errors, timeouts and 429/5xx responses with exponential backoff.
+
+    Args:
+        upload_link (str):
+        zip_file_path (str):
+        progress_callback (function, optional): called with (sent bytes, total bytes) while uploading,
+            sent bytes starts at 0 again when an attempt is retried
+        max_retries (int, optional):
+        backoff_seconds (int, float, optional): wait before the first retry, doubled for every further retry
+
+    Returns:
+        dict: {"is_successful": bool, "status_code": int or None, "attempts": int, "bytes": int,
+               "seconds": float, "bytes_per_second": float}, seconds and bytes_per_second are of the last attempt
+    """
+    total_bytes = os.path.getsize(zip_file_path)
+    metrics = {
+        "is_successful": False,
+        "status_code": None,
+        "attempts": 0,
+        "bytes": total_bytes,
+        "seconds": 0.0,
+        "bytes_per_second": 0.0,
+    }
+
+    while True:
+        metrics["attempts"] += 1
+        error = None
+        start_time = time.time()
+        with open(zip_file_path, "rb") as zip_file:
+            try:
+                response = get_session().put(
+                    url=upload_link,
+                    data=_ProgressReader(zip_file, total_bytes, progress_callback),
+                    # the upload link is a pre-signed url of the object store, its certificate is always verified,
+                    # whatever the "verify" setting of the CxSCA server is
+                    verify=True,
+                    timeout=get_timeout()
+                )
+                metrics["status_code"] = response.status_code
+            except (ConnectionError, Timeout) as e:
+                error = e
+        metrics["seconds"] = time.time() - start_time
+        metrics["bytes_per_second"] = total_bytes / metrics["seconds"] if metrics["seconds"] else 0.0
+
+        if error is None and metrics["status_code"] == OK:
+            metrics["is_successful"] = True
+            return metrics
+        if error is None and metrics["status_code"] not in RETRY_STATUS_CODES:
+            return metrics
+        if metrics["attempts"] > max_retries:
+            if error is not None:
+                raise error
+            return metrics
+        time.sleep(backoff_seconds * 2 ** (metrics["attempts"] - 1))
@@ -0,0 +1,151 @@
+# encoding: utf-8
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from .api import get_vulnerabilities_of_a_scan
+from .dto import VULNERABILITY_DETAIL_KEYS
+
+
+class VulnerabilityKnowledgeCache(object):
+    """
+    a local SQLite store of the heavy vulnerability fields (description, cvss, references ...).
+
+    The details are stored content addressed, by the sha256 of their json, so that identical details are stored
+    once however many vulnerability ids and scans refer to them. Vulnerabilities of scans are then kept slim,
+    with a "detailsHash" instead of the heavy fields, and expanded again from the cache, also offline.
+    """
+
+    def __init__(self, db_path=None):
+        """
+
+        Args:
+            db_path (str, optional): default ~/.Checkmarx/sca_vulnerabilities.sqlite
+        """
+        if db_path is None:
+            db_path = os.path.join(os.path.expanduser("~"), ".Checkmarx", "sca_vulnerabilities.sqlite")
+        directory = os.path.dirname(db_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS details (hash TEXT PRIMARY KEY, content TEXT NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS vulnerabilities "
+                "(id TEXT PRIMARY KEY, details_hash TEXT NOT NULL, updated_on REAL NOT NULL)"
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def store(self, vulnerabilities):
+        """
+        store the details of vulnerabilities and return them slim
+
+        Args:
+            vulnerabilities (list of dict): e.g. from get_vulnerabilities_of_a_scan
+
+        Returns:
+            list of dict: the vulnerabilities without the heavy fields, with "detailsHash" instead
+        """
+        slim_vulnerabilities = []
+        details_rows = {}
+        vulnerability_rows = {}
+        now = time.time()
+        for vulnerability in vulnerabilities:
+            content = json.dumps({key: vulnerability.get(key) for key in VULNERABILITY_DETAIL_KEYS}, sort_keys=True)
+            details_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+            details_rows[details_hash] = content
+            vulnerability_rows[vulnerability.get("id")] = (vulnerability.get("id"), details_hash, now)
+
+            slim_vulnerability = {
+                key: value for key, value in vulnerability.items() if key not in VULNERABILITY_DETAIL_KEYS
+            }
+            slim_vulnerability["detailsHash"] = details_hash
+            slim_vulnerabilities.append(slim_vulnerability)
+
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO details (hash, content) VALUES (?, ?)", details_rows.items()
+            )
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO vulnerabilities (id, details_hash, updated_on) VALUES (?, ?, ?)",
+                vulnerability_rows.values()
+            )
+        return slim_vulnerabilities
+
+    def get_details(self, vulnerability_id=None, details_hash=None):
+        """
+        the heavy fields of a vulnerability, by its id (the latest details stored for it) or by a details hash
+
+        Args:
+            vulnerability_id (str, optional): e.g. 'CVE-2015-7501'
+            details_hash (str, optional):
+
+        Returns:
+            dict, or None if not in the cache
+        """
+        with self._lock:
+            if details_hash is None:
+                row = self._connection.execute(
+                    "SELECT details_hash FROM vulnerabilities WHERE id = ?", (vulnerability_id,)
+                ).fetchone()
+                if row is None:
+                    return None
+                details_hash = row[0]
+            row = self._connection.execute("SELECT content FROM details WHERE hash = ?", (details_hash,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def expand(self, slim_vulnerability):
+        """
+
+        Args:
+            slim_vulnerability (dict): from store
+
+        Returns:
+            dict: the vulnerability with its heavy fields, as returned by get_vulnerabilities_of_a_scan
+        """
+        vulnerability = dict(slim_vulnerability)
+        details = self.get_details(vulnerability_id=vulnerability.get("id"),
+                                   details_hash=vulnerability.pop("detailsHash", None))
+        vulnerability.update(details or {})
+        return vulnerability
+
+    def get_statistics(self):
+        """
+
+        Returns:
+            dict: {"vulnerabilities": int, "details": int}
+        """
+        with self._lock:
+            vulnerabilities = self._connection.execute("SELECT COUNT(*) FROM vulnerabilities").fetchone()[0]
+            details = self._connection.execute("SELECT COUNT(*) FROM details").fetchone()[0]
+        return {"vulnerabilities": vulnerabilities, "details": details}
+
+
+def get_slim_vulnerabilities_of_a_scan(scan_id, knowledge_cache):
+    """
+    get the vulnerabilities of a scan, store their details in the knowledge cache and return them slim
+
+    Args:
+        scan_id (str):
+        knowledge_cache (VulnerabilityKnowledgeCache):
+
+    Returns:
+        list of dict: see VulnerabilityKnowledgeCache.store
+    """
+    return knowledge_cache.store(get_vulnerabilities_of_a_scan(scan_id))
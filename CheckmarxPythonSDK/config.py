@@ -103,6 +103,15 @@ def get_config_info_from_config_file():
             "account": parser_obj.get("CxSCA", "account") if parser_obj.has_option("CxSCA", "account") else None,
             "username": parser_obj.get("CxSCA", "username") if parser_obj.has_option("CxSCA", "username") else None,
             "password": parser_obj.get("CxSCA", "password") if parser_obj.has_option("CxSCA", "password") else None,
+            "verify": parser_obj.getboolean("CxSCA", "verify") if parser_obj.has_option("CxSCA", "verify") else None,
+            "pool_size": parser_obj.getint("CxSCA",
+                                           "pool_size") if parser_obj.has_option("CxSCA", "pool_size") else None,
+            "connect_timeout": parser_obj.getfloat("CxSCA",
+                                                   "connect_timeout") if parser_obj.has_option("CxSCA",
+                                                                                               "connect_timeout") else None,
+            "read_timeout": parser_obj.getfloat("CxSCA",
+                                                "read_timeout") if parser_obj.has_option("CxSCA",
+                                                                                         "read_timeout") else None,
         }
 
     return {
@@ -148,6 +157,12 @@ def get_config_info_from_environment_variables():
         "username": os.getenv("cxsca_username"),
         "password": os.getenv("cxsca_password"),
     }
+    cxsca_config.update(get_sca_transport_config(
+        verify=os.getenv("cxsca_verify"),
+        pool_size=os.getenv("cxsca_pool_size"),
+        connect_timeout=os.getenv("cxsca_connect_timeout"),
+        read_timeout=os.getenv("cxsca_read_timeout"),
+    ))
 
     return {
         "CxSAST": cxsast_config,
@@ -155,6 +170,21 @@ def get_config_info_from_environment_variables():
     }
 
 
+def get_sca_transport_config(verify=None, pool_size=None, connect_timeout=None, read_timeout=None):
+    """
+    convert the CxSCA transport options given as strings, options that are not given stay None
+
+    Returns:
+        dictionary
+    """
+    return {
+        "verify": verify.lower() == 'true' if verify else None,
+        "pool_size": int(pool_size) if pool_size else None,
+        "connect_timeout": float(connect_timeout) if connect_timeout else None,
+        "read_timeout": float(read_timeout) if read_timeout else None,
+    }
+
+
 class PassThroughOptionParser(OptionParser):
     """
     An unknown option pass-through implementation of OptionParser.
@@ -199,6 +229,10 @@ def get_config_info_from_command_line_arguments():
     parser.add_option("--cxsca_account", help=SUPPRESS_HELP)
     parser.add_option("--cxsca_username", help=SUPPRESS_HELP)
     parser.add_option("--cxsca_password", help=SUPPRESS_HELP)
+    parser.add_option("--cxsca_verify", help=SUPPRESS_HELP)
+    parser.add_option("--cxsca_pool_size", help=SUPPRESS_HELP)
+    parser.add_option("--cxsca_connect_timeout", help=SUPPRESS_HELP)
+    parser.add_option("--cxsca_read_timeout", help=SUPPRESS_HELP)
 
     (options, args) = parser.parse_args()
 
@@ -228,6 +262,12 @@ def get_config_info_from_command_line_arguments():
         "username": options.cxsca_username,
         "password": options.cxsca_password,
     }
+    cxsca_config.update(get_sca_transport_config(
+        verify=options.cxsca_verify,
+        pool_size=options.cxsca_pool_size,
+        connect_timeout=options.cxsca_connect_timeout,
+        read_timeout=options.cxsca_read_timeout,
+    ))
 
     return {
         "CxSAST": cxsast_config,
@@ -257,6 +297,10 @@ global_config = {
         "account": None,
         "username": None,
         "password": None,
+        "verify": False,
+        "pool_size": 10,
+        "connect_timeout": 30,
+        "read_timeout": 300,
     },
 }
 
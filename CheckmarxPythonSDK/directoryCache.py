@@ -0,0 +1,226 @@
+# encoding: utf-8
+import threading
+import time
+
+
+def first_wins(key_of):
+    """
+    mark an index whose first item wins for duplicated keys, like a lookup that takes the first match of a list.
+    In the other indexes the last item wins, like a lookup in a dict built from the list.
+
+    Args:
+        key_of (function): item -> key
+
+    Returns:
+        function
+    """
+    def get_key(item):
+        return key_of(item)
+
+    get_key.first_wins = True
+    return get_key
+
+
+def _add_to_index(index, key_of, item):
+    if getattr(key_of, "first_wins", False):
+        index.setdefault(key_of(item), item)
+    else:
+        index[key_of(item)] = item
+
+
+class DirectoryCache(object):
+    """
+    a process wide cache for the collections the SDK looks up by name, e.g. teams, users, roles, presets.
+
+    Each collection is downloaded once, indexed into dicts (by name, full name, id ...) and kept for ttl seconds.
+    The SDK invalidates a collection when it creates, updates or deletes an entity of that collection itself,
+    changes made by others become visible after the ttl expires. A collection that is changed while it is
+    downloaded is not kept, as the download may miss the change.
+    """
+
+    def __init__(self, default_ttl=300):
+        """
+
+        Args:
+            default_ttl (int, float): seconds a loaded collection stays valid, 0 to disable caching
+        """
+        self.default_ttl = default_ttl
+        self._ttls = {}
+        self._entries = {}
+        self._statistics = {}
+        self._lock = threading.RLock()
+        self._load_locks = {}
+        # bumped by every change of a collection, see get_index
+        self._generations = {}
+
+    def set_ttl(self, collection, ttl):
+        """
+
+        Args:
+            collection (str): e.g. "users"
+            ttl (int, float): seconds a loaded collection stays valid, 0 to disable caching
+        """
+        with self._lock:
+            self._ttls[collection] = ttl
+            self.__change(collection)
+            self._entries.pop(collection, None)
+
+    def get_ttl(self, collection):
+        return self._ttls.get(collection, self.default_ttl)
+
+    def lookup(self, collection, index_name, key, load, indexes):
+        """
+        find one item of a collection by an indexed key
+
+        Args:
+            collection (str): e.g. "users"
+            index_name (str): one of the keys of indexes
+            key: the value to look up, e.g. a user name
+            load (function): () -> list, downloads the whole collection
+            indexes (dict): {index_name: function(item) -> key}, see first_wins
+
+        Returns:
+            the item of the collection with that key, or None
+        """
+        return self.get_index(collection, index_name, load, indexes).get(key)
+
+    def get_index(self, collection, index_name, load, indexes):
+        """
+
+        Args:
+            collection (str):
+            index_name (str):
+            load (function): () -> list, downloads the whole collection
+            indexes (dict): {index_name: function(item) -> key}, the last item wins for duplicated keys,
+                unless the function is marked with first_wins
+
+        Returns:
+            dict: {key: item}
+        """
+        with self._lock:
+            statistics = self._statistics.setdefault(collection, {"hits": 0, "misses": 0})
+            entry = self._entries.get(collection)
+            if self.__is_fresh(entry):
+                statistics["hits"] += 1
+                return entry[1][index_name]
+            load_lock = self._load_locks.setdefault(collection, threading.Lock())
+
+        # the collection is downloaded without holding the cache lock, so that a slow download only blocks the
+        # readers of that collection
+        with load_lock:
+            with self._lock:
+                entry = self._entries.get(collection)
+                if self.__is_fresh(entry):
+                    statistics["hits"] += 1
+                    return entry[1][index_name]
+                statistics["misses"] += 1
+                generation = self._generations.get(collection, 0)
+
+            items = load()
+            built_indexes = {}
+            for name, key_of in indexes.items():
+                index = built_indexes[name] = {}
+                for item in items:
+                    _add_to_index(index, key_of, item)
+            ttl = self.get_ttl(collection)
+            if ttl > 0:
+                with self._lock:
+                    if self._generations.get(collection, 0) == generation:
+                        self._entries[collection] = (time.time() + ttl, built_indexes, indexes)
+            return built_indexes[index_name]
+
+    def __change(self, collection):
+        self._generations[collection] = self._generations.get(collection, 0) + 1
+
+    @staticmethod
+    def __is_fresh(entry):
+        return entry is not None and entry[0] > time.time()
+
+    def peek(self, collection, index_name, key):
+        """
+        find one item of a loaded collection, without downloading the collection if it is not loaded
+
+        Args:
+            collection (str):
+            index_name (str):
+            key:
+
+        Returns:
+            the item, or None if there is no such item or the collection is not loaded
+        """
+        with self._lock:
+            entry = self._entries.get(collection)
+            if not self.__is_fresh(entry):
+                return None
+            return entry[1][index_name].get(key)
+
+    def put(self, collection, item):
+        """
+        add or replace an item of a loaded collection, e.g. after the SDK created it,
+        so that the collection does not need to be downloaded again. Does nothing if the collection is not loaded.
+        An index marked with first_wins keeps the item it already has for the key of item.
+
+        Args:
+            collection (str):
+            item:
+        """
+        with self._lock:
+            self.__change(collection)
+            entry = self._entries.get(collection)
+            if not self.__is_fresh(entry):
+                return
+            _, built_indexes, indexes = entry
+            for name, key_of in indexes.items():
+                _add_to_index(built_indexes[name], key_of, item)
+
+    def remove(self, collection, index_name, key):
+        """
+        remove an item of a loaded collection from every index, e.g. after the SDK deleted it
+
+        Args:
+            collection (str):
+            index_name (str):
+            key: the value of the item for that index, e.g. the id
+        """
+        with self._lock:
+            self.__change(collection)
+            entry = self._entries.get(collection)
+            if not self.__is_fresh(entry):
+                return
+            _, built_indexes, indexes = entry
+            item = built_indexes[index_name].get(key)
+            if item is None:
+                return
+            for name, key_of in indexes.items():
+                if built_indexes[name].get(key_of(item)) is item:
+                    del built_indexes[name][key_of(item)]
+
+    def invalidate(self, *collections):
+        """
+        drop the given collections, or every collection when called without arguments
+
+        Args:
+            *collections (str):
+        """
+        with self._lock:
+            if not collections:
+                collections = set(self._entries) | set(self._load_locks)
+            for collection in collections:
+                self.__change(collection)
+                self._entries.pop(collection, None)
+
+    def get_statistics(self):
+        """
+
+        Returns:
+            dict: {collection: {"hits": int, "misses": int}}
+        """
+        with self._lock:
+            return {collection: dict(statistics) for collection, statistics in self._statistics.items()}
+
+    def reset_statistics(self):
+        with self._lock:
+            self._statistics.clear()
+
+
+directory_cache = DirectoryCache()
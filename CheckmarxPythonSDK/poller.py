@@ -0,0 +1,164 @@
+# encoding: utf-8
+import threading
+import time
+
+
+class PolledItem(object):
+    """
+    something a Poller waits for, e.g. a scan or an import, with the future it resolves
+    """
+
+    def __init__(self, key, future, deadline, interval):
+        """
+
+        Args:
+            key: identifies the item in its poller
+            future (:obj:`Future`):
+            deadline (float, optional): time.time() after which the item times out, None to wait forever
+            interval (int, float): seconds until the next poll
+        """
+        self.key = key
+        self.future = future
+        self.deadline = deadline
+        self.interval = interval
+        self.next_poll = 0
+        self.errors = 0
+
+
+class Poller(object):
+    """
+    poll many items in one background thread, every item at its own next_poll time.
+
+    Subclasses implement _poll, which gets the items that are due and resolves or reschedules each of them with
+    _finish, _reschedule and _failed_polls.
+    """
+
+    def __init__(self, min_interval, max_interval, timeout=None, max_errors=3, thread_name="Poller"):
+        """
+
+        Args:
+            min_interval (int, float): seconds
+            max_interval (int, float): seconds
+            timeout (int, float, optional): seconds to wait for one item, None to wait forever
+            max_errors (int): consecutive failed polls of an item before its future fails
+            thread_name (str):
+        """
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.timeout = timeout
+        self.max_errors = max_errors
+        self._thread_name = thread_name
+        self._items = {}
+        self._closed = False
+        self._thread = None
+        self._condition = threading.Condition()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _get_deadline(self):
+        return time.time() + self.timeout if self.timeout is not None else None
+
+    def _add(self, key, create_item):
+        """
+        poll an item, unless an item with that key is already polled
+
+        Args:
+            key:
+            create_item (function): () -> PolledItem, called only if key is not polled yet
+
+        Returns:
+            PolledItem: the polled item of key
+
+        Raises:
+            RuntimeError: when the poller is closed
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("{} is closed".format(type(self).__name__))
+            item = self._items.get(key)
+            if item is None:
+                item = self._items[key] = create_item()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self.__run, name=self._thread_name)
+                self._thread.daemon = True
+                self._thread.start()
+            self._condition.notify()
+        return item
+
+    def close(self):
+        """
+        stop polling and cancel the futures of the items that are not finished
+        """
+        with self._condition:
+            self._closed = True
+            items, self._items = list(self._items.values()), {}
+            self._condition.notify()
+        for item in items:
+            item.future.cancel()
+
+    def __run(self):
+        while True:
+            with self._condition:
+                while not self._closed and not self._items:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                now = time.time()
+                due = [item for item in self._items.values() if item.next_poll <= now]
+                if not due:
+                    self._condition.wait(min(item.next_poll for item in self._items.values()) - now)
+                    continue
+            try:
+                self._poll(due)
+            except Exception as error:
+                # keep polling the other items, an unexpected error counts as a failed poll of the due ones
+                self._failed_polls(due, error)
+
+    def _poll(self, due):
+        """
+
+        Args:
+            due (list of PolledItem): the items whose next poll is due
+        """
+        raise NotImplementedError
+
+    def _reschedule(self, item, delay=None):
+        """
+        plan the next poll of an item, by default the poll interval doubles up to max_interval
+
+        Args:
+            item (PolledItem):
+            delay (int, float, optional): seconds
+        """
+        item.errors = 0
+        if delay is None:
+            delay = item.interval
+            item.interval = min(item.interval * 2, self.max_interval)
+        item.next_poll = time.time() + delay
+
+    def _is_expired(self, item):
+        return item.deadline is not None and time.time() > item.deadline
+
+    def _failed_polls(self, items, error):
+        for item in items:
+            item.errors += 1
+            if item.errors >= self.max_errors:
+                self._finish(item, exception=error)
+            else:
+                item.next_poll = time.time() + item.interval
+
+    def _finish(self, item, result=None, exception=None):
+        with self._condition:
+            if self._items.get(item.key) is item:
+                del self._items[item.key]
+        # once running, the future can no longer be cancelled, e.g. by close(), before its result is set
+        if not item.future.set_running_or_notify_cancel():
+            return
+        if exception is not None:
+            item.future.set_exception(exception)
+        else:
+            item.future.set_result(result)
@@ -2,8 +2,6 @@
 SCA scan example
 
 """
-import json
-import time
 from datetime import datetime
 from os.path import exists
 
@@ -14,11 +12,8 @@ from CheckmarxPythonSDK.CxScaApiSDK import (
     generate_upload_link_for_scanning,
     upload_zip_content_for_scanning,
     scan_previously_uploaded_zip,
-    get_scan_status,
-    get_risk_report_summary,
-    get_packages_of_a_scan,
-    get_vulnerabilities_of_a_scan,
-    get_licenses_of_a_scan,
+    wait_for_scan,
+    write_risk_report,
 )
 
 
@@ -47,45 +42,18 @@ def sca_scan(project_name, zip_file_path):
     scan_id = scan_previously_uploaded_zip(project_id=project_id, uploaded_file_url=upload_link)
     print("scan_id: {}".format(scan_id))
 
-    while True:
-        response = get_scan_status(scan_id=scan_id)
-        scan_status = response.get("name")
-        if scan_status == "Scanning":
-            print("scanning ...")
-            continue
-        elif scan_status == "Done":
-            print("scan finished successfully!")
-            break
-        elif scan_status == "Failed":
-            print("scan_status:{}, message:{}".format(scan_status, response.get("message")))
-            return
-        time.sleep(10)
-
-    risk_report_summary = get_risk_report_summary(project_id=project_id)
-    print("risk_report_summary:{}".format(risk_report_summary))
+    print("scanning ...")
+    scan_status = wait_for_scan(scan_id=scan_id, project_id=project_id).get("status")
+    if scan_status.get("name") == "Failed":
+        print("scan_status:{}, message:{}".format(scan_status.get("name"), scan_status.get("message")))
+        return
+    print("scan finished successfully!")
 
-    packages = get_packages_of_a_scan(scan_id=scan_id)
-    print("get packages of a scan")
-    vulnerabilities = get_vulnerabilities_of_a_scan(scan_id=scan_id)
-    print("get vulnerabilities of a scan")
-    licenses = get_licenses_of_a_scan(scan_id=scan_id)
-    print("get licenses of a scan")
     time_stamp = datetime.now().strftime('_%Y_%m_%d_%H_%M_%S')
     print("create sca json report")
-    with open("sca_report" + time_stamp + ".json", "w") as out_file:
-        out_file.write(
-            json.dumps(
-                {
-                    "project_name": project_name,
-                    "project_id": project_id,
-                    "scan_id": scan_id,
-                    "risk_report_summary": risk_report_summary,
-                    "packages": packages,
-                    "vulnerabilities": vulnerabilities,
-                    "licenses": licenses
-                }, indent=4
-            )
-        )
+    counts = write_risk_report("sca_report" + time_stamp + ".json", scan_id=scan_id, project_id=project_id,
+                               project_name=project_name)
+    print("packages: {packages}, vulnerabilities: {vulnerabilities}, licenses: {licenses}".format(**counts))
 
 
 if __name__ == "__main__":
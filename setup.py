@@ -43,6 +43,7 @@ setup(
     ],
     extras_require={
         "dotenv": ["python-dotenv"],
+        "parquet": ["pyarrow"],
         "dev": [
             "pytest",
             "coverage"
@@ -0,0 +1,43 @@
+# encoding: utf-8
+"""
+    benchmark of the CxSCA scan delta on a synthetic project with 10k packages and 30k vulnerabilities
+
+    run it with: python tests/benchmark_sca_scan_delta.py
+"""
+import random
+import time
+
+from CheckmarxPythonSDK.CxScaApiSDK.scanDelta import diff_packages, diff_vulnerabilities
+
+
+def make_scan(number_of_packages, seed):
+    generator = random.Random(seed)
+    packages = []
+    vulnerabilities = []
+    for index in range(number_of_packages):
+        name = "group{}:artifact{}".format(index % 500, index)
+        version = "1.{}.0".format(generator.randint(0, 3))
+        package_id = "Maven-{}-{}".format(name, version)
+        packages.append({"id": package_id, "name": name, "version": version})
+        for cve in range(3):
+            vulnerabilities.append({
+                "id": "CVE-2021-{}".format(index * 3 + cve), "packageId": package_id, "severity": "High", "score": 7.5
+            })
+    return packages, vulnerabilities
+
+
+def main():
+    baseline_packages, baseline_vulnerabilities = make_scan(10000, seed=1)
+    current_packages, current_vulnerabilities = make_scan(10000, seed=2)
+
+    start_time = time.time()
+    package_changes = diff_packages(baseline_packages, current_packages)
+    vulnerability_changes = diff_vulnerabilities(baseline_vulnerabilities, current_vulnerabilities)
+    seconds = time.time() - start_time
+
+    print("packages: {} changes, vulnerabilities: {} changes, {:.3f} seconds".format(
+        len(package_changes), len(vulnerability_changes), seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# encoding: utf-8
+"""
+    benchmark of the raw xml fast path against the zeep path of get_query_collection
+
+    a synthetic GetQueryCollection response with 20k queries is parsed with iterparse_records. With --live, the
+    same synthetic response is also given to both paths of get_query_collection, as the zeep path needs the WSDL of
+    a server, and then the query collection of the server is fetched once with each path
+
+    run it with: python tests/benchmark_soap_raw_xml.py [--live]
+"""
+import io
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from unittest import mock
+
+from requests import Response
+
+from CheckmarxPythonSDK.CxPortalSoapApiSDK.rawXml import iterparse_records
+
+QUERY_TEMPLATE = (
+    u"<CxWSQuery><Name>Query_{index}</Name><QueryId>{index}</QueryId><Source>result = All.FindByName(\"{index}\");"
+    u"</Source><Cwe>79</Cwe><IsExecutable>true</IsExecutable><IsEncrypted>false</IsEncrypted><Severity>3</Severity>"
+    u"<PackageId>{group}</PackageId><Status>Original</Status><Type>Regular</Type><Categories><CxQueryCategory>"
+    u"<Id>1</Id><CategoryName>A1</CategoryName><CategoryType><Id>1</Id><Name>OWASP</Name><Order>1</Order>"
+    u"</CategoryType></CxQueryCategory></Categories><CxDescriptionID>{index}</CxDescriptionID>"
+    u"<QueryVersionCode>{index}</QueryVersionCode><EngineMetadata /></CxWSQuery>"
+)
+
+
+def make_response(number_of_groups, queries_per_group):
+    parts = [
+        u'<?xml version="1.0" encoding="utf-8"?><soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">'
+        u'<soap:Body><GetQueryCollectionResponse xmlns="http://Checkmarx.com"><GetQueryCollectionResult>'
+        u'<IsSuccesfull>true</IsSuccesfull><QueryGroups>'
+    ]
+    for group in range(number_of_groups):
+        parts.append(u"<CxWSQueryGroup><Name>Group_{0}</Name><PackageId>{0}</PackageId><Language>1</Language>"
+                     u"<LanguageName>Java</LanguageName><PackageTypeName>Cx</PackageTypeName><Queries>".format(group))
+        parts.extend(QUERY_TEMPLATE.format(index=group * queries_per_group + index, group=group)
+                     for index in range(queries_per_group))
+        parts.append(u"</Queries></CxWSQueryGroup>")
+    parts.append(u"</QueryGroups></GetQueryCollectionResult></GetQueryCollectionResponse></soap:Body></soap:Envelope>")
+    return u"".join(parts).encode("utf-8")
+
+
+def measure(function):
+    tracemalloc.start()
+    start_time = time.time()
+    result = function()
+    seconds = time.time() - start_time
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, peak / 1024.0 / 1024.0
+
+
+def get_query_collection_of_body(body, raw_xml, client, factory):
+    """
+    get_query_collection, with body as the response of the server and a client whose WSDL is already loaded
+    """
+    from CheckmarxPythonSDK.CxPortalSoapApiSDK import CxPortalWebService, rawXml, get_query_collection
+
+    response = Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = "text/xml; charset=utf-8"
+    response._content = body
+
+    @contextmanager
+    def post_soap_stream(relative_web_interface_url, operation_name, **kwargs):
+        yield io.BytesIO(body)
+
+    with mock.patch.object(CxPortalWebService, "get_client_and_factory", return_value=(client, factory)), \
+            mock.patch.object(client.transport, "post_xml", return_value=response), \
+            mock.patch.object(rawXml, "post_soap_stream", post_soap_stream):
+        return get_query_collection(raw_xml=raw_xml)
+
+
+def main():
+    from CheckmarxPythonSDK.CxPortalSoapApiSDK.CxPortalWebService import QUERY_GROUP_SPEC
+
+    body = make_response(number_of_groups=200, queries_per_group=100)
+    (records, fields), seconds, peak = measure(
+        lambda: iterparse_records(io.BytesIO(body), "CxWSQueryGroup", QUERY_GROUP_SPEC)
+    )
+    print("synthetic: {} MB, {} groups, {:.3f} seconds, peak {:.1f} MB".format(
+        len(body) // (1024 * 1024), len(records), seconds, peak))
+
+    if "--live" in sys.argv:
+        from CheckmarxPythonSDK.CxPortalSoapApiSDK import get_query_collection
+        from CheckmarxPythonSDK.CxPortalSoapApiSDK.CxPortalWebService import relative_web_interface_url
+        from CheckmarxPythonSDK.CxPortalSoapApiSDK.zeepClient import get_cached_client_and_factory
+
+        client, factory = get_cached_client_and_factory(relative_web_interface_url)
+        for raw_xml in (False, True):
+            response, seconds, peak = measure(lambda: get_query_collection_of_body(body, raw_xml, client, factory))
+            print("synthetic, raw_xml={}: {} groups, {:.3f} seconds, peak {:.1f} MB".format(
+                raw_xml, len(response.get("QueryGroups")), seconds, peak))
+
+        for raw_xml in (False, True):
+            response, seconds, peak = measure(lambda: get_query_collection(raw_xml=raw_xml))
+            print("server, raw_xml={}: {} groups, {:.3f} seconds, peak {:.1f} MB".format(
+                raw_xml, len(response.get("QueryGroups")), seconds, peak))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,15 @@
+# encoding: utf-8
+import io
+from contextlib import contextmanager
+
+import pytest
+
 from CheckmarxPythonSDK.CxPortalSoapApiSDK import (
     get_files_extensions,
     get_source_code_for_scan,
+    download_source_code_for_scan,
 )
+from CheckmarxPythonSDK.CxPortalSoapApiSDK import CxAuditWebService, zeepClient
 
 
 def test_get_files_extensions():
@@ -14,3 +22,67 @@ def test_get_source_code_for_scan():
     scan_id = 1010032
     response = get_source_code_for_scan(scan_id=scan_id)
     assert response is not None
+
+
+def test_download_source_code_for_scan(tmp_path):
+    scan_id = 1010032
+    zip_file_path = str(tmp_path / "source.zip")
+    response = download_source_code_for_scan(scan_id=scan_id, zip_file_path=zip_file_path,
+                                             extract_to=str(tmp_path / "source"), paths=["pom.xml"])
+    assert response.get("IsSuccesfull") is True
+    assert len(response.get("ExtractedFiles")) <= 1
+
+
+def test_download_source_code_for_scan_keeps_file_of_failed_response(tmp_path, monkeypatch):
+    response_body = b'<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/"><soap:Body>' \
+           b'<GetSourceCodeForScanResponse xmlns="http://Checkmarx.com"><GetSourceCodeForScanResult>' \
+           b'<IsSuccesfull>false</IsSuccesfull><ErrorMessage>scan not found</ErrorMessage>' \
+           b'</GetSourceCodeForScanResult></GetSourceCodeForScanResponse></soap:Body></soap:Envelope>'
+
+    @contextmanager
+    def post_soap_stream(relative_web_interface_url, operation_name, body=None, **kwargs):
+        yield io.BytesIO(response_body)
+
+    monkeypatch.setattr(CxAuditWebService, "post_soap_stream", post_soap_stream)
+    zip_file = tmp_path / "source.zip"
+    zip_file.write_bytes(b"previous download")
+    response = download_source_code_for_scan(scan_id=1, zip_file_path=str(zip_file))
+    assert response.get("IsSuccesfull") is False
+    assert response.get("ErrorMessage") == "scan not found"
+    assert zip_file.read_bytes() == b"previous download"
+
+
+def test_post_soap_stream_checks_http_status(monkeypatch):
+    closed = []
+
+    class Response(object):
+        status_code = 502
+        text = "<html>Bad Gateway</html>"
+
+        def close(self):
+            closed.append(True)
+
+    class Session(object):
+        def post(self, **kwargs):
+            return Response()
+
+    class Operation(object):
+        soapaction = "http://Checkmarx.com/GetSourceCodeForScan"
+
+    class Port(object):
+        binding = {"GetSourceCodeForScan": Operation()}
+        binding_options = {"address": "https://localhost/cxwebinterface/Audit/CxAuditWebService.asmx"}
+
+    class Client(object):
+        class wsdl(object):
+            services = {"CxAuditWebService": type("Service", (object,), {"ports": {"Soap": Port()}})}
+
+        class transport(object):
+            session = Session()
+
+    monkeypatch.setattr(zeepClient, "get_cached_client_and_factory", lambda relative_web_interface_url: (Client, None))
+    with pytest.raises(ValueError):
+        with zeepClient.post_soap_stream("/cxwebinterface/Audit/CxAuditWebService.asmx?wsdl", "GetSourceCodeForScan",
+                                         body=b"<envelope />"):
+            pass
+    assert closed == [True]
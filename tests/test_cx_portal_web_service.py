@@ -1,23 +1,40 @@
 # encoding: utf-8
+import base64
+import datetime
+import io
+import os
+import threading
 import time
+from contextlib import contextmanager
 
+from CheckmarxPythonSDK.CxRestAPISDK.sast.scans.dto import CxStatus
+from CheckmarxPythonSDK.CxRestAPISDK.sast.scans.dto.CxScanDetail import CxScanDetail
+
+from CheckmarxPythonSDK.directoryCache import directory_cache
+from CheckmarxPythonSDK.CxRestAPISDK import pooledSession
+from CheckmarxPythonSDK.CxPortalSoapApiSDK import CxPortalWebService, importJobs, rawXml, scanReports, zeepClient
 from CheckmarxPythonSDK.CxPortalSoapApiSDK import (
     add_license_expiration_notification,
     create_new_preset, create_scan_report,
+    create_scan_reports,
     delete_preset,
     export_preset,
     export_queries,
     get_import_queries_status,
     get_query_collection,
+    iterparse_records,
     get_query_id_by_language_group_and_query_name,
     get_preset_list,
     get_server_license_data,
     get_server_license_summary,
     delete_project,
     delete_projects,
+    delete_projects_in_batches,
     get_version_number,
     get_version_number_as_int,
     get_path_comments_history,
+    get_paths_comments_history,
+    parse_comments_history,
     get_user_profile_data,
     get_queries_categories,
     get_name_of_user_who_marked_false_positive_from_comments_history,
@@ -25,6 +42,19 @@ from CheckmarxPythonSDK.CxPortalSoapApiSDK import (
     import_queries,
     lock_scan,
     unlock_scan,
+    get_scan_ids_to_keep_locked,
+    plan_scan_locks,
+    reconcile_scan_locks,
+    QueryCatalog,
+    get_query_catalog,
+    invalidate_query_catalog,
+    ImportJobManager,
+    import_files,
+    stream_import,
+    compute_query_sync_plan,
+    fingerprint_query,
+    save_query_groups,
+    sync_query_groups,
 )
 
 
@@ -50,6 +80,62 @@ def test_create_scan_report():
     assert response["ID"] > 0
 
 
+def test_create_scan_reports(tmp_path):
+    scan_ids = [1000005, 1000006]
+    response = create_scan_reports(scan_ids=scan_ids, report_type="XML", report_folder=str(tmp_path), timeout=600,
+                                   results_per_vulnerability_maximum=500)
+    for scan_id in scan_ids:
+        assert response.get(scan_id).get("ErrorMessage") is None
+        assert (tmp_path / "{}.xml".format(scan_id)).stat().st_size > 0
+
+
+def test_create_scan_reports_timeout(tmp_path, monkeypatch):
+    release = threading.Event()
+
+    class Service(object):
+        @staticmethod
+        def CreateScanReport(SessionID, Report):
+            if Report.get("ScanID") == 2:
+                release.wait(10)
+            return {"IsSuccesfull": True, "ErrorMessage": None, "ID": Report.get("ScanID") * 10}
+
+    class Client(object):
+        service = Service()
+
+    class Factory(object):
+        @staticmethod
+        def CxWSFilteredReportRequest(**kwargs):
+            return kwargs
+
+    class Response(object):
+        def __init__(self, status):
+            self.status = status
+
+        def json(self):
+            return {"status": {"value": self.status}}
+
+    def session_get(session, url, api_version="1.0"):
+        return Response("Created" if "/40/" in url else "InProcess")
+
+    monkeypatch.setattr(scanReports, "get_cached_client_and_factory", lambda **kwargs: (Client(), Factory()))
+    monkeypatch.setattr(scanReports, "_build_report_display_data", lambda *args, **kwargs: None)
+    monkeypatch.setattr(scanReports, "get_version_number_as_int", lambda: 930)
+    monkeypatch.setattr(pooledSession, "session_get", session_get)
+    start_time = time.time()
+    try:
+        # with one worker, the download of report 40 and the request of scan 3 wait behind the blocked scan 2
+        response = create_scan_reports(scan_ids=[1, 4, 2, 3], report_type="XML", report_folder=str(tmp_path),
+                                       max_workers=1, poll_interval=0.05, timeout=0.5)
+    finally:
+        release.set()
+    assert time.time() - start_time < 5
+    assert response.get(1).get("ErrorMessage") == "report 10 is not created before the timeout"
+    assert response.get(4).get("ErrorMessage") == "report 40 is not downloaded before the timeout"
+    assert response.get(2).get("ErrorMessage") == "the report is not requested before the timeout"
+    assert response.get(3).get("ErrorMessage") == "the report is not requested before the timeout"
+    assert all(result.get("FilePath") is None for result in response.values())
+
+
 def test_delete_preset():
     response = delete_preset(preset_id=120006)
     assert response["IsSuccesfull"] is True
@@ -65,6 +151,63 @@ def test_delete_projects():
     assert response["IsSuccesfull"] is True
 
 
+def test_delete_projects_in_batches():
+    progress = []
+    response = delete_projects_in_batches(project_ids=[9, 10, 11], batch_size=2, retry_running_scans=True,
+                                          progress_callback=lambda done, total: progress.append((done, total)))
+    assert response.get("FailedBatches") == []
+    assert progress[-1] == (3, 3)
+    assert response.get("ProjectsPerSecond") >= 0
+
+
+def test_delete_projects_in_batches_with_undeleted_projects(monkeypatch):
+    responses = {
+        (1, 2, 3): {"IsSuccesfull": True, "ErrorMessage": None, "NumOfDeletedProjects": 2,
+                    "UndeletedProjects": {"UndeletedProject": [{"ProjectID": 2, "ProjectName": "b"}]}},
+        (4, 5): {"IsSuccesfull": True, "ErrorMessage": None, "NumOfDeletedProjects": 1,
+                 "UndeletedProjects": {"UndeletedProject": [{"ProjectName": "e"}]}},
+    }
+
+    class Factory(object):
+        CxWSRequestDeleteProjects = staticmethod(dict)
+        ArrayOfLong = staticmethod(tuple)
+        DeleteFlags = staticmethod(list)
+
+    class Service(object):
+        @staticmethod
+        def DeleteProjects(request):
+            return responses[request["ProjectIDs"]]
+
+    class Client(object):
+        service = Service()
+
+    class Project(object):
+        def __init__(self, project_id):
+            self.project_id = project_id
+
+    monkeypatch.setattr(CxPortalWebService, "get_cached_client_and_factory",
+                        lambda relative_web_interface_url: (Client, Factory))
+    directory_cache.invalidate("projects")
+    directory_cache.get_index("projects", "id", lambda: [Project(project_id) for project_id in range(1, 6)],
+                              {"id": lambda project: project.project_id})
+    try:
+        response = delete_projects_in_batches(project_ids=[1, 2, 3, 4, 5], batch_size=3)
+        assert response.get("NumOfDeletedProjects") == 3
+        assert response.get("FailedBatches") == [
+            {"ProjectIDs": [4, 5], "ErrorMessage": "the undeleted projects of the batch can not be identified"}
+        ]
+        assert [project_id for project_id in range(1, 6) if directory_cache.peek("projects", "id", project_id)] == \
+            [2, 4, 5]
+
+        responses[(2,)] = {"IsSuccesfull": True, "ErrorMessage": None, "NumOfDeletedProjects": 1,
+                           "UndeletedProjects": None}
+        response = delete_projects_in_batches(project_ids=[1, 2, 3, 4, 5], batch_size=3, retry_running_scans=True)
+        assert response.get("NumOfDeletedProjects") == 4
+        assert response.get("UndeletedProjects") == [{"ProjectName": "e"}]
+    finally:
+        directory_cache.invalidate("projects")
+
+
 def test_export_preset():
     response = export_preset(preset_id=100000)
     assert response.get("Preset") is not None
@@ -101,6 +244,54 @@ def test_get_query_collection():
     response = get_query_collection()
     assert response is not None
 
+    raw_response = get_query_collection(raw_xml=True)
+    assert raw_response["IsSuccesfull"] is True
+    assert len(raw_response["QueryGroups"]) == len(response["QueryGroups"])
+    assert sum(len(query_group["Queries"] or []) for query_group in raw_response["QueryGroups"]) == \
+        sum(len(query_group["Queries"] or []) for query_group in response["QueryGroups"])
+
+
+def test_iterparse_records():
+    body = b'<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/" ' \
+           b'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"><soap:Body>' \
+           b'<GetPresetListResponse xmlns="http://Checkmarx.com"><GetPresetListResult>' \
+           b'<IsSuccesfull>true</IsSuccesfull><ErrorMessage xsi:nil="true" /><PresetList>' \
+           b'<Preset><PresetName>Default</PresetName><ID>36</ID><owner>admin</owner>' \
+           b'<Queries><long>1</long><long>2</long></Queries></Preset>' \
+           b'<Preset><PresetName>Empty</PresetName><ID>100000</ID><IsPublic>false</IsPublic></Preset>' \
+           b'</PresetList></GetPresetListResult></GetPresetListResponse></soap:Body></soap:Envelope>'
+    spec = {"PresetName": None, "ID": int, "owner": None, "IsPublic": lambda text: text == "true",
+            "Queries": ("long", int)}
+    records, fields = iterparse_records(io.BytesIO(body), "Preset", spec)
+    assert fields == {"IsSuccesfull": "true", "ErrorMessage": None}
+    assert records == [
+        {"PresetName": "Default", "ID": 36, "owner": "admin", "IsPublic": None, "Queries": [1, 2]},
+        {"PresetName": "Empty", "ID": 100000, "owner": None, "IsPublic": False, "Queries": None},
+    ]
+
+
+def test_get_query_collection_raw_xml_retries_invalid_token(monkeypatch):
+    responses = [
+        b'<Envelope><IsSuccesfull>false</IsSuccesfull><ErrorMessage>Invalid_Token</ErrorMessage></Envelope>',
+        b'<Envelope><IsSuccesfull>true</IsSuccesfull><QueryGroups><CxWSQueryGroup><Name>Java_Corp</Name>'
+        b'<LanguageStateDate>2023-01-02T03:04:05</LanguageStateDate><Impacts><int>1</int><int>2</int></Impacts>'
+        b'</CxWSQueryGroup></QueryGroups></Envelope>',
+    ]
+    updates = []
+
+    @contextmanager
+    def post_soap_stream(relative_web_interface_url, operation_name, body=None, **kwargs):
+        yield io.BytesIO(responses.pop(0))
+
+    monkeypatch.setattr(rawXml, "post_soap_stream", post_soap_stream)
+    monkeypatch.setattr(zeepClient.authHeaders, "update_auth_headers", lambda: updates.append(True))
+    response = get_query_collection(raw_xml=True)
+    assert updates == [True]
+    assert response.get("IsSuccesfull") is True
+    query_group = response.get("QueryGroups")[0]
+    assert query_group.get("LanguageStateDate") == datetime.datetime(2023, 1, 2, 3, 4, 5)
+    assert query_group.get("Impacts") == [1, 2]
+
 
 def test_get_query_id_by_language_group_and_query_name():
     response = get_query_id_by_language_group_and_query_name(query_name="Find_URL_Query_String_Creating_URI")
@@ -113,6 +304,99 @@ def test_get_query_id_by_language_group_and_query_name():
     assert isinstance(response, list)
 
 
+def test_query_catalog_indexes():
+    query_groups = [
+        {"LanguageName": "Java", "PackageTypeName": "Cx", "Name": "Java_High_Risk", "PackageId": 1, "Queries": [
+            {"Name": "SQL_Injection", "QueryId": 100, "QueryVersionCode": 1000, "PackageId": 1},
+            {"Name": "Code_Injection", "QueryId": 101, "QueryVersionCode": 1001, "PackageId": 1},
+        ]},
+        {"LanguageName": "CSharp", "PackageTypeName": "Corp", "Name": "CSharp_High_Risk", "PackageId": 2, "Queries": [
+            {"Name": "SQL_Injection", "QueryId": 200, "QueryVersionCode": 2000, "PackageId": 2},
+        ]},
+    ]
+    query_catalog = QueryCatalog(query_groups, db_path=None)
+    assert [query["QueryId"] for query in query_catalog.find(query_name="SQL_Injection")] in ([100, 200], [200, 100])
+    assert [query["QueryId"] for query in query_catalog.find(
+        language="Java", package_type_name="Cx", package_name="Java_High_Risk",
+        query_name=["SQL_Injection", "Code_Injection"])] == [100, 101]
+    assert query_catalog.get_query_by_version_code(2000)["QueryId"] == 200
+    assert query_catalog.get_query_group(query_catalog.get_query_by_id(101))["Name"] == "Java_High_Risk"
+
+
+def test_language_state_key():
+    query_groups = [
+        {"LanguageName": "Java", "PackageTypeName": "Cx", "Name": "Java_High_Risk", "LanguageStateHash": 1},
+        {"LanguageName": "CSharp", "PackageTypeName": "Cx", "Name": "CSharp_High_Risk", "LanguageStateHash": 2},
+    ]
+    language_state_key = QueryCatalog(query_groups, db_path=None).language_state_key
+    assert QueryCatalog(list(reversed(query_groups)), db_path=None).language_state_key == language_state_key
+    query_groups[0]["LanguageStateHash"] = 3
+    assert QueryCatalog(query_groups, db_path=None).language_state_key != language_state_key
+
+
+def test_invalidate_query_catalog(tmp_path):
+    other_server_catalog = tmp_path / "other_server.sqlite"
+    other_server_catalog.write_bytes(b"")
+    query_catalog = get_query_catalog(cache_dir=str(tmp_path))
+    assert os.path.exists(query_catalog.db_path)
+    invalidate_query_catalog()
+    assert not os.path.exists(query_catalog.db_path)
+    assert other_server_catalog.exists()
+
+
+def test_get_query_catalog():
+    query_catalog = get_query_catalog()
+    query = query_catalog.find(query_name="Find_URL_Query_String_Creating_URI")[0]
+    assert query_catalog.get_source(query["QueryId"])
+    assert get_query_catalog() is query_catalog
+
+
+def test_parse_comments_history():
+    comments_history = u"happy yang jvl_local, [2020年11月12日 16:57]: Changed status to Not Exploitable ÿ" \
+                       u"happy yang jvl_local, [2020年11月12日 16:50]: a remark\nover two lines ÿ"
+    records = parse_comments_history(comments_history)
+    assert len(records) == 2
+    assert records[0].get("user") == "happy yang"
+    assert records[0].get("timestamp") == u"2020年11月12日 16:57"
+    assert records[0].get("state_change") == "Not Exploitable"
+    assert records[1].get("text") == "a remark\nover two lines"
+    assert records[1].get("state_change") is None
+    assert parse_comments_history(None) == []
+
+
+def test_get_paths_comments_history():
+    scan_path_ids = [(1000002, 1), (1000002, 2), (1000002, 1)]
+    response = get_paths_comments_history(scan_path_ids=scan_path_ids, memoize=True)
+    assert len(response) == 2
+    assert response.get((1000002, 1)).get("IsSuccesfull") is True
+    assert get_paths_comments_history(scan_path_ids=[(1000002, 1)], memoize=True) == {
+        (1000002, 1): response.get((1000002, 1))
+    }
+
+
+def test_get_paths_comments_history_keeps_other_paths_on_error(monkeypatch):
+    class Response(dict):
+        pass
+
+    class Service(object):
+        @staticmethod
+        def GetPathCommentsHistory(sessionId, scanId, pathId, labelType):
+            if pathId == 2:
+                raise ValueError("connection reset")
+            response = Response(IsSuccesfull=True, ErrorMessage=None)
+            response.Path = {"Comment": u"happy yang jvl_local, [2020年11月12日 16:50]: a remark ÿ"}
+            return response
+
+    class Client(object):
+        service = Service()
+
+    monkeypatch.setattr(CxPortalWebService, "get_cached_client_and_factory",
+                        lambda relative_web_interface_url: (Client, None))
+    response = get_paths_comments_history(scan_path_ids=[(1, 1), (1, 2)])
+    assert response.get((1, 1)).get("Comments")[0].get("text") == "a remark"
+    assert response.get((1, 2)) == {"IsSuccesfull": False, "ErrorMessage": "connection reset", "Comments": []}
+
+
 def test_get_name_of_user_who_marked_false_positive_from_comments_history():
     scan_id = 1010002
     path_id = 1
@@ -124,6 +408,10 @@ def test_get_preset_list():
     response = get_preset_list()
     assert response["IsSuccesfull"] is True
 
+    raw_response = get_preset_list(raw_xml=True)
+    assert raw_response["IsSuccesfull"] is True
+    assert len(raw_response["PresetList"]) == len(response["PresetList"])
+
 
 def test_get_server_license_data():
     lic = get_server_license_data()
@@ -175,6 +463,47 @@ def test_import_queries():
     assert import_query_status == "Succeeded"
 
 
+def test_stream_import(tmp_path, monkeypatch):
+    imported_file = tmp_path / "query.xml"
+    imported_file.write_bytes(b"<Queries>" + b"x" * 100000 + b"</Queries>")
+    sent = []
+
+    def create_soap_envelope(relative_web_interface_url, operation_name, **kwargs):
+        imported_file_text = base64.b64encode(kwargs.get("importedFile"))
+        return b"<Envelope><importedFile>" + imported_file_text + b"</importedFile></Envelope>"
+
+    @contextmanager
+    def post_soap_stream(relative_web_interface_url, operation_name, body=None, **kwargs):
+        sent.append(body.read())
+        yield io.BytesIO(b'<Envelope><ImportQueriesResult><IsSuccesfull>true</IsSuccesfull><requestId>7</requestId>'
+                         b'<importQueryStatus>InProgress</importQueryStatus></ImportQueriesResult></Envelope>')
+
+    monkeypatch.setattr(importJobs, "create_soap_envelope", create_soap_envelope)
+    monkeypatch.setattr(importJobs, "post_soap_stream", post_soap_stream)
+    monkeypatch.setattr(importJobs, "invalidate_query_catalog", lambda: None)
+    response = stream_import(str(imported_file))
+    assert response == {"IsSuccesfull": True, "ErrorMessage": None, "requestId": 7, "importQueryStatus": "InProgress"}
+    assert sent == [b"<Envelope><importedFile>" + base64.b64encode(imported_file.read_bytes()) +
+                    b"</importedFile></Envelope>"]
+
+
+def test_import_files(tmp_path):
+    imported_file_path = str(tmp_path / "query.xml")
+    with open(imported_file_path, "wb") as imported_file:
+        imported_file.write(export_queries(queries_ids=[100000]).get("Queries"))
+    response = import_files(queries_file_paths=[imported_file_path], timeout=600)
+    assert response.get(imported_file_path).get("importQueryStatus") == "Succeeded"
+
+
+def test_import_job_manager(tmp_path):
+    imported_file_path = str(tmp_path / "preset.xml")
+    with open(imported_file_path, "wb") as imported_file:
+        imported_file.write(export_preset(preset_id=100000).get("Preset"))
+    with ImportJobManager(max_workers=2, timeout=600) as manager:
+        future = manager.submit_preset(imported_file_path)
+        assert future.result().get("importQueryStatus") == "Succeeded"
+
+
 def test_lock_scan():
     scan_id = 1040138
     response = lock_scan(scan_id=scan_id)
@@ -185,3 +514,72 @@ def test_unlock_scan():
     scan_id = 1040138
     response = unlock_scan(scan_id=scan_id)
     assert response.get("IsSuccesfull") is True
+
+
+def test_plan_scan_locks():
+    scans = [
+        CxScanDetail(scan_id=scan_id, status=CxStatus(name=status), is_locked=is_locked)
+        for scan_id, status, is_locked in [(1, "Finished", True), (2, "Finished", False), (3, "Failed", True),
+                                           (4, "Finished", False), (5, "Scanning", False)]
+    ]
+    scan_ids_to_lock = get_scan_ids_to_keep_locked(scans, keep_last=2)
+    assert scan_ids_to_lock == {2, 4}
+    assert plan_scan_locks(scans, scan_ids_to_lock) == {"lock": [2, 4], "unlock": []}
+    assert plan_scan_locks(scans, scan_ids_to_lock, unlock_others=True) == {"lock": [2, 4], "unlock": [1]}
+    assert plan_scan_locks(scans, {5}) == {"lock": [], "unlock": []}
+
+
+def test_reconcile_scan_locks():
+    response = reconcile_scan_locks(project_ids=[1, 2], keep_last=3)
+    assert response.get("failed_projects") == {}
+    assert all(result.get("IsSuccesfull") for result in response.get("results").values())
+
+
+def test_compute_query_sync_plan():
+    def query(name, source, query_id):
+        return {"Name": name, "Source": source, "Severity": 2, "Cwe": 79, "Categories": None,
+                "QueryId": query_id, "PackageId": 1, "QueryVersionCode": query_id}
+
+    source = [{"LanguageName": "Java", "PackageTypeName": "Corp", "Name": "Java_Corp", "PackageId": 1,
+               "Queries": [query("A", "result = All;", 1), query("B", "result = 1;", 2), query("C", "x", 3)]}]
+    target = [{"LanguageName": "Java", "PackageTypeName": "Corp", "Name": "Java_Corp", "PackageId": 7,
+               "Queries": [query("A", "result = All;", 70), query("B", "result = 2;", 71), query("D", "y", 72)]}]
+    plan = compute_query_sync_plan(source, target)
+    assert fingerprint_query(source[0]["Queries"][0]) == fingerprint_query(target[0]["Queries"][0])
+    assert plan.get("unchanged") == 1
+    assert plan.get("changed") == [("Java", "Corp", "Java_Corp", "B")]
+    assert plan.get("added") == [("Java", "Corp", "Java_Corp", "C")]
+    assert plan.get("extra") == [("Java", "Corp", "Java_Corp", "D")]
+    queries = {query.get("Name"): query for query in plan.get("query_groups")[0].get("Queries")}
+    assert queries.get("B").get("QueryId") == 71 and queries.get("B").get("Source") == "result = 1;"
+    assert queries.get("C").get("QueryId") == 0 and queries.get("C").get("PackageId") == 7
+    assert compute_query_sync_plan(source, source).get("query_groups") == []
+
+
+def test_compute_query_sync_plan_with_new_groups():
+    def category(category_id, name):
+        return {"Id": category_id, "CategoryName": name, "CategoryType": {"Id": 1, "Name": "OWASP", "Order": 1}}
+
+    source_query = {"Name": "A", "Source": "x", "Severity": 2, "Cwe": 79, "QueryId": 1, "PackageId": 1,
+                    "QueryVersionCode": 1, "Categories": [category(5, "A1"), category(6, "A2")]}
+    source = [
+        {"LanguageName": "Java", "PackageTypeName": "Corp", "Name": "Java_Corp", "PackageId": 1, "OwningTeam": 9,
+         "ProjectId": 8, "Queries": [source_query]},
+        {"LanguageName": "Java", "PackageTypeName": "Team", "Name": "Java_Team", "PackageId": 2, "OwningTeam": 9,
+         "ProjectId": 0, "Queries": [source_query]},
+    ]
+    plan = compute_query_sync_plan(source, [], package_type_names=None, target_categories=[category(50, "A1")])
+    assert plan.get("skipped_groups") == [("Java", "Team", "Java_Team")]
+    assert plan.get("unmapped_categories") == [("OWASP", "A2")]
+    new_group = plan.get("query_groups")[0]
+    assert (new_group.get("PackageId"), new_group.get("OwningTeam"), new_group.get("ProjectId")) == (0, 0, 0)
+    assert new_group.get("Queries")[0].get("Categories") == [category(50, "A1")]
+    assert source_query.get("Categories")[0].get("Id") == 5
+
+
+def test_sync_query_groups(tmp_path):
+    file_path = str(tmp_path / "corp_queries.json")
+    assert save_query_groups(file_path) is not None
+    plan = sync_query_groups(file_path, dry_run=True)
+    assert plan.get("IsSuccesfull") is True
+    assert plan.get("query_groups") == []
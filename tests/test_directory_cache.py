@@ -0,0 +1,127 @@
+# encoding: utf-8
+import threading
+import time
+
+from CheckmarxPythonSDK.directoryCache import DirectoryCache, first_wins
+
+
+class Item(object):
+    def __init__(self, item_id, name):
+        self.id = item_id
+        self.name = name
+
+
+indexes = {"name": lambda item: item.name, "id": lambda item: item.id}
+
+
+def test_lookup_loads_once_within_ttl():
+    loads = []
+
+    def load():
+        loads.append(1)
+        return [Item(1, "a"), Item(2, "b"), Item(3, "a")]
+
+    cache = DirectoryCache(default_ttl=60)
+    assert cache.lookup("items", "name", "a", load, indexes).id == 3
+    assert cache.lookup("items", "id", 2, load, indexes).name == "b"
+    assert cache.lookup("items", "name", "c", load, indexes) is None
+    assert len(loads) == 1
+    assert cache.get_statistics() == {"items": {"hits": 2, "misses": 1}}
+
+
+def test_invalidate_and_zero_ttl():
+    loads = []
+
+    def load():
+        loads.append(1)
+        return [Item(1, "a")]
+
+    cache = DirectoryCache(default_ttl=60)
+    cache.lookup("items", "name", "a", load, indexes)
+    cache.invalidate("items")
+    cache.lookup("items", "name", "a", load, indexes)
+    assert len(loads) == 2
+
+    cache.set_ttl("items", 0)
+    cache.lookup("items", "name", "a", load, indexes)
+    cache.lookup("items", "name", "a", load, indexes)
+    assert len(loads) == 4
+
+
+def test_put_and_remove_update_every_index():
+    loads = []
+
+    def load():
+        loads.append(1)
+        return [Item(1, "a")]
+
+    cache = DirectoryCache(default_ttl=60)
+    cache.lookup("items", "name", "a", load, indexes)
+    cache.put("items", Item(2, "b"))
+    assert cache.lookup("items", "id", 2, load, indexes).name == "b"
+    cache.remove("items", "id", 1)
+    assert cache.lookup("items", "name", "a", load, indexes) is None
+    assert len(loads) == 1
+
+
+def test_peek_does_not_load():
+    cache = DirectoryCache(default_ttl=60)
+    assert cache.peek("items", "id", 1) is None
+    cache.lookup("items", "name", "a", lambda: [Item(1, "a")], indexes)
+    assert cache.peek("items", "id", 1).name == "a"
+
+
+def test_slow_load_does_not_block_other_collections():
+    release = threading.Event()
+
+    def slow_load():
+        release.wait(5)
+        return [Item(1, "a")]
+
+    cache = DirectoryCache(default_ttl=60)
+    thread = threading.Thread(target=cache.lookup, args=("slow", "name", "a", slow_load, indexes))
+    thread.start()
+    time.sleep(0.1)
+    try:
+        assert cache.lookup("items", "name", "b", lambda: [Item(2, "b")], indexes).id == 2
+    finally:
+        release.set()
+        thread.join()
+    assert cache.peek("slow", "id", 1).name == "a"
+
+
+def test_first_wins_index():
+    first_wins_indexes = {"name": first_wins(lambda item: item.name), "id": lambda item: item.id}
+    cache = DirectoryCache(default_ttl=60)
+    items = [Item(1, "a"), Item(2, "b"), Item(3, "a")]
+    assert cache.lookup("items", "name", "a", lambda: items, first_wins_indexes).id == 1
+    cache.put("items", Item(4, "a"))
+    assert cache.lookup("items", "name", "a", lambda: items, first_wins_indexes).id == 1
+    assert cache.lookup("items", "id", 4, lambda: items, first_wins_indexes).name == "a"
+
+
+def test_change_during_load_is_not_lost():
+    loads = []
+    loading = threading.Event()
+    release = threading.Event()
+
+    def slow_load():
+        loads.append(1)
+        if len(loads) == 1:
+            loading.set()
+            release.wait(5)
+            return [Item(1, "a")]
+        return [Item(1, "a"), Item(2, "b")]
+
+    cache = DirectoryCache(default_ttl=60)
+    thread = threading.Thread(target=cache.lookup, args=("items", "name", "a", slow_load, indexes))
+    thread.start()
+    try:
+        assert loading.wait(5)
+        cache.invalidate("items")
+    finally:
+        release.set()
+        thread.join()
+    assert cache.peek("items", "id", 1) is None
+    assert cache.lookup("items", "name", "b", slow_load, indexes).id == 2
+    assert len(loads) == 2
@@ -1,6 +1,8 @@
 from os.path import normpath, join, dirname
 
 from CheckmarxPythonSDK.CxRestAPISDK.sast.scans.dto.CxScanReportXmlContent import CxScanReportXmlContent
+from CheckmarxPythonSDK.CxRestAPISDK.sast.scans.dto.CxScanReportXmlDiff import CxScanReportXmlDiff
+from CheckmarxPythonSDK.CxRestAPISDK.sast.scans.dto.CxScanReportResultDelta import CxScanReportResultDelta
 
 
 xml_path = normpath(join(dirname(__file__), "jvl_local.xml"))
@@ -37,3 +39,42 @@ def test_filter_by_query_names():
     xml_report = CxScanReportXmlContent(xml_path)
     xml_report.filter_by_query_names(query_names=["Stored_XSS"])
     xml_report.write_new_xml("filter_by_query_names.xml")
+
+
+def test_diff_against_itself():
+    report_diff = CxScanReportXmlDiff(xml_path, xml_path)
+    deltas = report_diff.get_deltas()
+    assert all(delta.status == CxScanReportResultDelta.RECURRENT for delta in deltas)
+    assert report_diff.get_deltas(include_recurrent=False) == []
+
+
+def write_report(file_path, similarity_ids):
+    results = "".join(
+        '<Result NodeId="{0}" FileName="src/Main.java" Line="{0}"><Path PathId="{0}" SimilarityId="{1}" /></Result>'
+        .format(index, similarity_id) for index, similarity_id in enumerate(similarity_ids, start=1)
+    )
+    with open(file_path, "w") as report_file:
+        report_file.write('<?xml version="1.0" encoding="utf-8"?><CxXMLResults><Query id="589" name="Stored_XSS" '
+                          'Severity="High">' + results + '</Query></CxXMLResults>')
+
+
+def test_diff_new_and_fixed(tmp_path):
+    baseline_path = str(tmp_path / "baseline.xml")
+    current_path = str(tmp_path / "current.xml")
+    write_report(baseline_path, ["100", "200"])
+    write_report(current_path, ["100", "300"])
+
+    deltas = CxScanReportXmlDiff(baseline_path, current_path).get_deltas()
+    assert sorted((delta.status, delta.query_id, delta.similarity_id) for delta in deltas) == [
+        (CxScanReportResultDelta.FIXED, "589", "200"),
+        (CxScanReportResultDelta.NEW, "589", "300"),
+        (CxScanReportResultDelta.RECURRENT, "589", "100"),
+    ]
+
+    pairs = list(CxScanReportXmlDiff.diff_report_pairs([(baseline_path, current_path)], max_workers=1,
+                                                       include_recurrent=False))
+    assert [pair for pair, _ in pairs] == [(baseline_path, current_path)]
+    assert sorted((delta.status, delta.similarity_id, delta.severity) for delta in pairs[0][1]) == [
+        (CxScanReportResultDelta.FIXED, "200", "High"),
+        (CxScanReportResultDelta.NEW, "300", "High"),
+    ]
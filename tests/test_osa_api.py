@@ -74,6 +74,25 @@ def test_get_osa_scan_vulnerabilities_by_id():
     assert vulnerabilities is not None
 
 
+def test_iter_osa_scan_libraries():
+    project_id = get_project_id()
+    osa_api = OsaAPI()
+    scan_id = osa_api.get_last_osa_scan_id_of_a_project(project_id)
+    libraries = list(osa_api.iter_osa_scan_libraries(scan_id, items_per_page=2, api_version="3.0"))
+    prefetched_libraries = list(osa_api.iter_osa_scan_libraries(scan_id, items_per_page=2, prefetch=4,
+                                                                api_version="3.0"))
+    assert [library.id for library in libraries] == [library.id for library in prefetched_libraries]
+
+
+def test_iter_osa_scan_vulnerabilities_by_id():
+    project_id = get_project_id()
+    osa_api = OsaAPI()
+    scan_id = osa_api.get_last_osa_scan_id_of_a_project(project_id)
+    vulnerabilities = list(osa_api.iter_osa_scan_vulnerabilities_by_id(scan_id, items_per_page=10, prefetch=4))
+    assert len(vulnerabilities) >= len(osa_api.get_osa_scan_vulnerabilities_by_id(scan_id, page=1,
+                                                                                   items_per_page=10))
+
+
 def test_get_first_vulnerability_id():
     project_id = get_project_id()
     osa_api = OsaAPI()
@@ -0,0 +1,71 @@
+# encoding: utf-8
+from concurrent.futures import Future, TimeoutError
+
+import pytest
+
+from CheckmarxPythonSDK.poller import Poller, PolledItem
+
+
+class CountdownPoller(Poller):
+    """
+    finishes an item after it is polled item.key times, fails a poll while item.key is negative, and raises
+    from _poll for key 0
+    """
+
+    def _poll(self, due):
+        for item in due:
+            if item.key == 0:
+                raise KeyError("unexpected")
+            if item.key < 0:
+                self._failed_polls([item], ValueError("poll failed"))
+                continue
+            item.polls = getattr(item, "polls", 0) + 1
+            if item.polls >= item.key:
+                self._finish(item, result=item.polls)
+            elif self._is_expired(item):
+                self._finish(item, exception=TimeoutError())
+            else:
+                self._reschedule(item)
+
+
+def add(poller, key):
+    return poller._add(key, lambda: PolledItem(key, Future(), poller._get_deadline(), poller.min_interval)).future
+
+
+def test_poller_finishes_and_fails_items():
+    with CountdownPoller(min_interval=0.01, max_interval=0.02, max_errors=2) as poller:
+        three_polls = add(poller, 3)
+        assert add(poller, 3) is three_polls
+        failing = add(poller, -1)
+        assert three_polls.result(timeout=5) == 3
+        with pytest.raises(ValueError):
+            failing.result(timeout=5)
+
+
+def test_poller_timeout_and_close():
+    with CountdownPoller(min_interval=0.01, max_interval=0.01, timeout=0.05) as poller:
+        with pytest.raises(TimeoutError):
+            add(poller, 1000).result(timeout=5)
+
+    poller = CountdownPoller(min_interval=10, max_interval=10)
+    future = add(poller, 2)
+    poller.close()
+    assert future.cancelled()
+    with pytest.raises(RuntimeError):
+        add(poller, 2)
+
+
+def test_poller_survives_unexpected_errors():
+    with CountdownPoller(min_interval=0.01, max_interval=0.02, max_errors=2) as poller:
+        raising = add(poller, 0)
+        with pytest.raises(KeyError):
+            raising.result(timeout=5)
+        assert add(poller, 2).result(timeout=5) == 2
+
+
+def test_poller_finish_after_cancel():
+    poller = CountdownPoller(min_interval=10, max_interval=10)
+    item = PolledItem(1, Future(), None, 10)
+    item.future.cancel()
+    poller._finish(item, result=1)
+    assert item.future.cancelled()
@@ -44,6 +44,14 @@ def test_get_project_id_by_name():
     assert project_id is not None
 
 
+def test_resolve_project_ids():
+    projects_api = ProjectsAPI()
+    project_name = "test1"
+    project_id = projects_api.get_project_id_by_project_name_and_team_full_name(project_name)
+    project_ids = projects_api.resolve_project_ids([("/CxServer", project_name), ("/CxServer", "not_exist_project")])
+    assert project_ids == [project_id, None]
+
+
 def test_get_project_details_by_id():
     projects_api = ProjectsAPI()
     project_name = "test1"
@@ -1,5 +1,14 @@
 
+import sys
+
+import pytest
+
 from CheckmarxPythonSDK.CxRestAPISDK import QueriesAPI
+from CheckmarxPythonSDK.CxRestAPISDK.exceptions.CxError import NotFoundError
+from CheckmarxPythonSDK.CxRestAPISDK.queryDescriptionCache import QueryDescriptionCache
+
+# the module, as the package exports the class of the same name
+QueriesAPIModule = sys.modules[QueriesAPI.__module__]
 
 
 def test_get_the_full_description_of_the_query():
@@ -7,3 +16,70 @@ def test_get_the_full_description_of_the_query():
     query_id = 589
     query_description = query_api.get_the_full_description_of_the_query(query_id)
     assert query_description is not None
+
+
+def test_get_cached_full_description_of_the_query():
+    query_api = QueriesAPI()
+    query_id = 589
+    query_description = query_api.get_cached_full_description_of_the_query(query_id)
+    assert query_description == query_api.get_the_full_description_of_the_query(query_id)
+    assert query_api.get_cached_full_description_of_the_query(query_id) == query_description
+
+
+def test_get_full_descriptions_of_queries_of_a_scan():
+    query_api = QueriesAPI()
+    scan_id = 1000000
+    descriptions = query_api.get_full_descriptions_of_queries_of_a_scan(scan_id, max_workers=8)
+    assert all(description is not None for description in descriptions.values())
+
+
+def test_query_description_cache(tmp_path):
+    db_path = str(tmp_path / "query_descriptions.sqlite")
+    cache = QueryDescriptionCache("https://server|9.3", db_path=db_path, max_size=2)
+    cache.put_many({1: "one", 2: None})
+    cache.put(3, "three")
+    # 1 is the least recently used, it is evicted from memory but still on disk
+    assert list(cache._lru) == [2, 3]
+    assert cache.get(1) == "one"
+    assert list(cache._lru) == [3, 1]
+    assert cache.get(2, default="missing") is None
+    assert cache.get(4, default="missing") == "missing"
+
+    other_process = QueryDescriptionCache("https://server|9.3", db_path=db_path)
+    assert other_process.get(3) == "three"
+    other_version = QueryDescriptionCache("https://server|9.4", db_path=db_path)
+    assert other_version.get(3) is None
+    other_version.put(3, "new three")
+    other_version.clear()
+    assert other_process.get(3) == "three"
+    for query_description_cache in (cache, other_process, other_version):
+        query_description_cache.close()
+
+
+def test_get_full_descriptions_of_queries_caches_fetched_descriptions(tmp_path, monkeypatch):
+    cache = QueryDescriptionCache("https://server|9.3", db_path=str(tmp_path / "query_descriptions.sqlite"))
+    requested = []
+
+    class Response(object):
+        def __init__(self, description):
+            self.description = description
+
+        def json(self):
+            return self.description
+
+    def session_get(session, url, api_version="1.0"):
+        query_id = int(url.split("/")[-2])
+        requested.append(query_id)
+        if query_id == 3:
+            raise NotFoundError()
+        return Response(None if query_id == 2 else "description {}".format(query_id))
+
+    monkeypatch.setattr(QueriesAPIModule, "get_query_description_cache", lambda: cache)
+    monkeypatch.setattr(QueriesAPIModule, "session_get", session_get)
+    with pytest.raises(NotFoundError):
+        QueriesAPI.get_full_descriptions_of_queries([1, 2, 3])
+    assert cache.get(1) == "description 1"
+    del requested[:]
+    assert QueriesAPI.get_full_descriptions_of_queries([1, 2]) == {1: "description 1", 2: None}
+    assert requested == []
+    cache.close()
@@ -1,3 +1,7 @@
+import json
+
+from requests.exceptions import ConnectionError
+
 from CheckmarxPythonSDK.CxScaApiSDK import (
     get_all_projects,
     check_if_project_already_exists,
@@ -21,7 +25,22 @@ from CheckmarxPythonSDK.CxScaApiSDK import (
     update_settings_for_a_specific_project,
     generate_upload_link_for_scanning,
     upload_zip_content_for_scanning,
+    upload_file_to_upload_link,
     scan_previously_uploaded_zip,
+    ScanWatcher,
+    join_risk_report,
+    export_portfolio,
+    diff_packages,
+    diff_vulnerabilities,
+    bulk_set_ignore_state,
+    VulnerabilityKnowledgeCache,
+)
+from CheckmarxPythonSDK.CxScaApiSDK import bulkTriage, portfolioExport, uploader
+from CheckmarxPythonSDK.CxScaApiSDK.dto import construct_sca_vulnerability
+from CheckmarxPythonSDK.CxScaApiSDK.scanWatcher import (
+    parse_sca_time,
+    get_stage_durations,
+    estimate_remaining_seconds,
 )
 
 project_name = "happy_test_2021_01_15"
@@ -46,6 +65,7 @@ def test_get_project_by_name():
 def test_create_a_new_project():
     project = create_a_new_project(project_name=project_name)
     assert project.get("id") is not None
+    assert check_if_project_already_exists(project_name) is True
 
 
 def test_get_project_id_by_name():
@@ -190,3 +210,218 @@ def test_generate_upload_link_for_scanning():
     # test_scan_previously_uploaded_zip():
     scan_id = scan_previously_uploaded_zip(project_id=project_id, uploaded_file_url=upload_link)
     assert scan_id is not None
+
+
+def test_estimate_remaining_seconds():
+    finished_scan = {
+        'status': {'name': 'Done', 'message': None},
+        'scanProgress': [
+            {'name': 'Collecting Evidence', 'startTime': '2021-01-16T15:16:54.90395Z',
+             'endTime': '2021-01-16T15:16:57.90395Z', 'status': 'Done'},
+            {'name': 'Generating risk report', 'startTime': '2021-01-16T15:16:58Z',
+             'endTime': '2021-01-16T15:17:08Z', 'status': 'Done'},
+        ]
+    }
+    running_scan = {
+        'status': {'name': 'Scanning', 'message': None},
+        'scanProgress': [
+            {'name': 'Collecting Evidence', 'startTime': '2021-01-17T10:00:00Z',
+             'endTime': '2021-01-17T10:00:03Z', 'status': 'Done'},
+            {'name': 'Generating risk report', 'startTime': '2021-01-17T10:00:04Z',
+             'endTime': None, 'status': 'Running'},
+        ]
+    }
+    stage_durations = get_stage_durations([finished_scan, running_scan])
+    assert stage_durations == {'Collecting Evidence': [3.0], 'Generating risk report': [10.0]}
+    now = parse_sca_time('2021-01-17T10:00:10Z')
+    assert parse_sca_time('2021-01-17T12:00:10.5+02:00') == now.replace(microsecond=500000)
+    assert estimate_remaining_seconds(running_scan, stage_durations, now=now) == 4.0
+    assert estimate_remaining_seconds(running_scan, {}, now=now) is None
+
+
+def test_scan_watcher():
+    project_id = get_project_id_by_name(project_name)
+    scan_id = get_latest_scan_id_of_a_project(project_id=project_id)
+    with ScanWatcher(timeout=600) as watcher:
+        scan = watcher.watch(scan_id, project_id=project_id).result()
+    assert scan.get("status").get("name") in ("Done", "Failed")
+
+
+def test_join_risk_report():
+    packages = [{'id': 'p1', 'licenses': ['p1-MIT']}, {'id': 'p2', 'licenses': []}]
+    vulnerabilities = [{'id': 'CVE-1', 'packageId': 'p1'}, {'id': 'CVE-2', 'packageId': 'p3'}]
+    licenses = [{'id': 'p1-MIT', 'name': 'MIT'}]
+    joined_packages, orphan_vulnerabilities = join_risk_report(packages, vulnerabilities, licenses)
+    assert joined_packages[0].get("vulnerabilities") == [{'id': 'CVE-1', 'packageId': 'p1'}]
+    assert joined_packages[0].get("licenseDetails") == [{'id': 'p1-MIT', 'name': 'MIT'}]
+    assert joined_packages[1].get("vulnerabilities") == []
+    assert orphan_vulnerabilities == [{'id': 'CVE-2', 'packageId': 'p3'}]
+
+
+def test_export_portfolio(tmp_path, monkeypatch):
+    output_path = str(tmp_path / "portfolio.jsonl")
+    checkpoint_path = str(tmp_path / "portfolio.checkpoint")
+    projects = [
+        {"id": "p1", "name": "one", "lastSuccessfulScanId": "s1"},
+        {"id": "p2", "name": "two", "lastSuccessfulScanId": "s2"},
+        {"id": "p3", "name": "never scanned", "lastSuccessfulScanId": None},
+    ]
+    failing_project_ids = {"p2"}
+    exported_project_ids = []
+
+    def export_project_risk_report(project, knowledge_cache=None):
+        if project.get("id") in failing_project_ids:
+            raise ValueError("risk report not ready")
+        exported_project_ids.append(project.get("id"))
+        return {"project_id": project.get("id"), "scan_id": project.get("lastSuccessfulScanId")}
+
+    monkeypatch.setattr(portfolioExport, "get_all_projects", lambda: projects)
+    monkeypatch.setattr(portfolioExport, "export_project_risk_report", export_project_risk_report)
+    statistics = export_portfolio(output_path, checkpoint_path=checkpoint_path)
+    assert statistics == {"exported": 1, "skipped": 0, "failed": {"p2": "risk report not ready"}}
+
+    failing_project_ids.clear()
+    statistics = export_portfolio(output_path, checkpoint_path=checkpoint_path)
+    assert statistics == {"exported": 1, "skipped": 1, "failed": {}}
+    assert exported_project_ids == ["p1", "p2"]
+    with open(output_path) as output_file:
+        assert [json.loads(line).get("project_id") for line in output_file] == ["p1", "p2"]
+    with open(checkpoint_path) as checkpoint_file:
+        assert checkpoint_file.read().split() == ["p1", "p2"]
+
+    statistics = export_portfolio(output_path, checkpoint_path=checkpoint_path)
+    assert statistics == {"exported": 0, "skipped": 2, "failed": {}}
+
+
+def test_diff_packages_and_vulnerabilities():
+    baseline_packages = [
+        {'id': 'Maven-a-1.0', 'name': 'a', 'version': '1.0'},
+        {'id': 'Maven-b-1.0', 'name': 'b', 'version': '1.0'},
+    ]
+    current_packages = [
+        {'id': 'Maven-a-1.1', 'name': 'a', 'version': '1.1'},
+        {'id': 'Maven-c-2.0', 'name': 'c', 'version': '2.0'},
+    ]
+    changes = diff_packages(baseline_packages, current_packages)
+    assert [(change.get("change"), change.get("name")) for change in changes] == [
+        ("VERSION_CHANGED", "a"), ("REMOVED", "b"), ("ADDED", "c")
+    ]
+    assert changes[0].get("old_version") == "1.0" and changes[0].get("new_version") == "1.1"
+
+    baseline_vulnerabilities = [
+        {'id': 'CVE-1', 'packageId': 'Maven-a-1.0'}, {'id': 'CVE-2', 'packageId': 'Maven-b-1.0'}
+    ]
+    current_vulnerabilities = [
+        {'id': 'CVE-2', 'packageId': 'Maven-b-1.0'}, {'id': 'CVE-1', 'packageId': 'Maven-a-1.1'}
+    ]
+    changes = diff_vulnerabilities(baseline_vulnerabilities, current_vulnerabilities)
+    assert [(change.get("change"), change.get("package_id")) for change in changes] == [
+        ("ADDED", "Maven-a-1.1"), ("REMOVED", "Maven-a-1.0")
+    ]
+
+
+def test_upload_to_upload_link_verifies_tls(monkeypatch, tmp_path):
+    zip_file_path = tmp_path / "source.zip"
+    zip_file_path.write_bytes(b"PK" + b"0" * 100)
+    calls = []
+
+    class Response(object):
+        status_code = 200
+
+    class Session(object):
+        verify = False
+
+        def put(self, url, data, **kwargs):
+            calls.append(kwargs)
+            data.read()
+            return Response()
+
+    monkeypatch.setattr(uploader, "get_session", Session)
+    assert upload_zip_content_for_scanning("https://upload.example.com/link", str(zip_file_path)) is True
+    assert calls[0].get("verify") is True
+
+
+def test_upload_file_to_upload_link_retries(monkeypatch, tmp_path):
+    zip_file_path = tmp_path / "source.zip"
+    zip_file_path.write_bytes(b"PK" + b"0" * 100)
+    attempts = []
+    progress = []
+
+    class Response(object):
+        status_code = 200
+
+    class Session(object):
+        def put(self, url, data, **kwargs):
+            attempts.append(url)
+            data.read(50)
+            if len(attempts) == 1:
+                raise ConnectionError("connection reset")
+            data.read()
+            return Response()
+
+    monkeypatch.setattr(uploader, "get_session", Session)
+    metrics = upload_file_to_upload_link("https://upload.example.com/link", str(zip_file_path),
+                                         progress_callback=lambda sent, total: progress.append((sent, total)),
+                                         backoff_seconds=0)
+    assert metrics.get("is_successful") is True
+    assert metrics.get("attempts") == 2 and len(attempts) == 2
+    assert metrics.get("bytes") == 102 and metrics.get("bytes_per_second") >= 0
+    # the progress starts again with the retried attempt
+    assert progress == [(50, 102), (50, 102), (102, 102)]
+
+
+def test_bulk_set_ignore_state(monkeypatch):
+    monkeypatch.setattr(bulkTriage, "get_ignored_vulnerabilities_of_projects",
+                        lambda project_ids, max_workers: {"p1": {("CVE-1", "a"): True, ("CVE-2", "a"): False}})
+    calls = []
+
+    def ignore(project_id, vulnerability_id, package_id):
+        calls.append((project_id, vulnerability_id, package_id))
+        if package_id == "broken":
+            raise ValueError("HttpStatusCode: 400")
+        return True
+
+    monkeypatch.setattr(bulkTriage, "ignore_a_vulnerability_for_a_specific_package_and_project", ignore)
+    results = bulk_set_ignore_state(
+        [("p1", "CVE-1", "a"), ("p1", "CVE-2", "a"), ("p1", "CVE-2", "a"), ("p2", "CVE-3", "broken")],
+        ignore=True, max_requests_per_second=None
+    )
+    assert [result.get("status") for result in results] == ["SKIPPED", "CHANGED", "FAILED"]
+    assert sorted(calls) == [("p1", "CVE-2", "a"), ("p2", "CVE-3", "broken")]
+
+
+def test_construct_sca_vulnerability():
+    item = {
+        'id': 'CVE-2015-7501', 'cveName': 'CVE-2015-7501', 'score': 9.8, 'severity': 'High',
+        'publishDate': '2017-11-09T17:29:00', 'references': [], 'referencesData': [], 'description': 'text',
+        'cvss': {'version': 3.0, 'attackVector': 'NETWORK'}, 'recommendations': None,
+        'packageId': 'Yarn-commons-collections:commons-collections-3.2.1', 'similarityId': None,
+        'fixResolutionText': '3.2.2', 'isIgnored': False, 'exploitableMethods': [], 'cwe': 'CWE-502'
+    }
+    pool = {}
+    vulnerability = construct_sca_vulnerability(item, pool)
+    same_vulnerability_of_another_package = construct_sca_vulnerability(dict(item), pool)
+    assert not hasattr(vulnerability, "__dict__")
+    assert vulnerability.cvss == {'version': 3.0, 'attackVector': 'NETWORK'}
+    assert vulnerability.to_dict() == item
+    assert vulnerability._details is same_vulnerability_of_another_package._details
+    # the details are only shared within one load, the ids and severities are interned
+    vulnerability_of_another_load = construct_sca_vulnerability(dict(item, severity="".join(["Hi", "gh"])))
+    assert vulnerability._details is not vulnerability_of_another_load._details
+    assert vulnerability.severity is vulnerability_of_another_load.severity
+
+
+def test_vulnerability_knowledge_cache(tmp_path):
+    details = {'description': 'text', 'references': [], 'referencesData': [], 'cvss': {'version': 3.0},
+               'recommendations': None, 'exploitableMethods': []}
+    vulnerabilities = [
+        dict(details, id='CVE-1', packageId='Maven-a-1.0', isIgnored=False),
+        dict(details, id='CVE-1', packageId='Maven-a-1.1', isIgnored=False),
+        dict(details, id='CVE-2', packageId='Maven-b-1.0', isIgnored=True),
+    ]
+    with VulnerabilityKnowledgeCache(str(tmp_path / "knowledge.sqlite")) as knowledge_cache:
+        slim_vulnerabilities = knowledge_cache.store(vulnerabilities)
+        assert "description" not in slim_vulnerabilities[0]
+        assert knowledge_cache.get_statistics() == {"vulnerabilities": 2, "details": 1}
+        assert knowledge_cache.expand(slim_vulnerabilities[2]) == vulnerabilities[2]
+        assert knowledge_cache.get_details(vulnerability_id='CVE-2') == details
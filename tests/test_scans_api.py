@@ -229,6 +229,15 @@ def test_get_scan_results_of_a_specific_query():
     pass
 
 
+def test_get_scan_results_of_queries():
+    project_id = get_project_id()
+    scan_api = ScansAPI()
+    scan_id = scan_api.get_last_scan_id_of_a_project(project_id, only_finished_scans=True)
+    query_version_codes = [56089346, 56110529]
+    results = list(scan_api.get_scan_results_of_queries(scan_id, query_version_codes, deduplicate_nodes=True))
+    assert all(query_version_code in query_version_codes for query_version_code, _ in results)
+
+
 def test_get_scan_results_for_a_specific_query_group_by_best_fix_location():
     project_id = get_project_id()
     scan_api = ScansAPI()